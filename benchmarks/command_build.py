@@ -0,0 +1,46 @@
+'''Time building command instances, as entering a scope does.
+
+    python benchmarks/command_build.py [iterations]
+'''
+import sys
+import timeit
+
+from sevco_shell.commands.schedule import ScheduleCmd
+
+
+class Credentials:
+    api_host = "https://api.example.com"
+    auth_token = "Token redacted"
+
+    def __init__(self):
+        self._permissions = [f"perm:{i}" for i in range(200)] + ['source:schedule:get', 'source:schedule:create']
+
+    def permissions(self):
+        return self._permissions
+
+
+class Org:
+    id = "9b3c7a64-2f4e-4d8e-9a53-6c1f0e7b2d11"
+
+
+class Config:
+    credentials = Credentials()
+    org = Org()
+
+
+class Source:
+    id = "okta"
+    display_name = "Okta"
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    first = min(timeit.repeat(lambda: ScheduleCmd(Config(), Source()), number=1, repeat=1))
+    cached = min(timeit.repeat(lambda: ScheduleCmd(Config(), Source()), number=n, repeat=5)) / n
+
+    print(f"ScheduleCmd first build {first * 1e6:>8,.0f}us  cached build {cached * 1e6:>8,.0f}us")
+
+
+if __name__ == "__main__":
+    main()
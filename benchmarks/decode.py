@@ -0,0 +1,65 @@
+'''Compare the compiled model decoders with the dacite from_dict path.
+
+    python benchmarks/decode.py [records]
+'''
+import sys
+import timeit
+
+from sevco_shell.clients.models import dacite_from_dict
+from sevco_shell.clients.source_audit.model import SourceExecutionV2
+from sevco_shell.clients.source_config.model import SourceConfig
+
+
+def execution(i: int) -> dict:
+    return {
+        "org_id": "9b3c7a64-2f4e-4d8e-9a53-6c1f0e7b2d11",
+        "runner": {"id": "4f1d2c3b-5a6e-4b7c-8d9e-0f1a2b3c4d5e", "version": "1.4.2"},
+        "execution": {
+            "id": f"exec-{i}",
+            "source_config_id": "7e6d5c4b-3a2f-4e1d-9c8b-7a6f5e4d3c2b",
+            "plugin_id": "0a1b2c3d-4e5f-4a6b-8c7d-9e0f1a2b3c4d",
+            "queued_timestamp": "2021-06-01T12:00:00.000000+00:00",
+            "received_timestamp": "2021-06-01T12:00:01.500000+00:00",
+            "completed_timestamp": "2021-06-01T12:03:20.250000+00:00",
+            "exit_code": i % 3,
+            "stderr": "",
+        },
+        "result": {"status_code": "OK", "message": "completed", "count": i},
+    }
+
+
+def source_config(i: int) -> dict:
+    return {
+        "source_id": "okta",
+        "enabled": True,
+        "org_id": "9b3c7a64-2f4e-4d8e-9a53-6c1f0e7b2d11",
+        "id": f"config-{i}",
+        "plugin_id": "0a1b2c3d-4e5f-4a6b-8c7d-9e0f1a2b3c4d",
+        "connect": {"schema": "url", "instance": {"url": "https://example.okta.com"}},
+        "auth": {"schema": "api_key", "instance": {"api_key": "redacted"}},
+        "settings": None,
+        "last_updated_timestamp": "2021-06-01T12:00:00+00:00",
+        "created_timestamp": "2021-05-01T12:00:00+00:00",
+    }
+
+
+def bench(label: str, cls, records) -> None:
+    assert [cls.from_dict(r) for r in records] == [dacite_from_dict(cls, r) for r in records]
+
+    dacite_time = min(timeit.repeat(lambda: [dacite_from_dict(cls, r) for r in records], number=1, repeat=5))
+    compiled_time = min(timeit.repeat(lambda: [cls.from_dict(r) for r in records], number=1, repeat=5))
+
+    print(f"{label:<20} dacite {len(records) / dacite_time:>10,.0f}/s  "
+          f"compiled {len(records) / compiled_time:>10,.0f}/s  "
+          f"x{dacite_time / compiled_time:.1f}")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    bench("SourceExecutionV2", SourceExecutionV2, [execution(i) for i in range(n)])
+    bench("SourceConfig", SourceConfig, [source_config(i) for i in range(n)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+'''Compare compiled encoders and the codec with dataclasses.asdict + json.dumps.
+
+    python benchmarks/encode.py [records]
+'''
+import json
+import sys
+import timeit
+
+from sevco_shell.clients import codec
+from sevco_shell.clients.models import dataclass_as_dict
+from sevco_shell.clients.runner.models import Runner
+from sevco_shell.clients.source_config.model import SourceConfig
+
+from decode import source_config
+
+
+def bench(label: str, records) -> None:
+    assert [r.as_dict() for r in records] == [dataclass_as_dict(r) for r in records]
+
+    asdict_time = min(timeit.repeat(lambda: [json.dumps(dataclass_as_dict(r)) for r in records],
+                                    number=1, repeat=5))
+    codec_time = min(timeit.repeat(lambda: [r.to_json() for r in records], number=1, repeat=5))
+
+    print(f"{label:<14} asdict+json {len(records) / asdict_time:>10,.0f}/s  "
+          f"{codec.backend:>7} {len(records) / codec_time:>10,.0f}/s  "
+          f"x{asdict_time / codec_time:.1f}")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    bench("SourceConfig", [SourceConfig.from_dict(source_config(i)) for i in range(n)])
+    bench("Runner", [Runner.from_dict({"org_id": "o", "os": "LINUX_AMD64", "hostname": f"host-{i}",
+                                       "last_checkin_time": "2021-06-01T12:00:00+00:00"}) for i in range(n)])
+
+
+if __name__ == "__main__":
+    main()
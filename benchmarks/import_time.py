@@ -0,0 +1,74 @@
+'''Check svsh cold start import cost against a budget.
+
+Each target is imported in a fresh interpreter under `python -X importtime`.
+The check fails (exit status 1) when the cumulative import time of a target
+is over budget, or when it pulls in a module that should only load on first
+use.
+
+    python benchmarks/import_time.py [--budget-ms 50] [--runs 5]
+'''
+import argparse
+import re
+import subprocess
+import sys
+from typing import Dict, List
+
+# Modules imported before the first prompt, and by the svsh --connect client
+TARGETS = ["sevco_shell.shell", "sevco_shell.scopes.sv", "sevco_shell.daemon"]
+
+# Modules, or package prefixes ending in '.', that must not load at startup
+FORBIDDEN = [
+    "jwt", "toml", "dacite", "dateutil", "asyncio", "argparse", "requests",
+    "sevco_shell.clients.", "sevco_shell.commands.orgs", "sevco_shell.commands.fanout",
+    "sevco_shell.commands.cache", "sevco_shell.scopes.org",
+]
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)$")
+
+
+def import_times(module: str) -> Dict[str, int]:
+    '''Cumulative import time in microseconds of every module loaded by importing module'''
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            stderr=subprocess.PIPE, universal_newlines=True, check=True)
+
+    times = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            times[match.group(4)] = int(match.group(2))
+
+    return times
+
+
+def forbidden(loaded: List[str]) -> List[str]:
+    '''The FORBIDDEN entries matched by any loaded module'''
+    def matches(module: str, entry: str) -> bool:
+        return module.startswith(entry) if entry.endswith('.') else module == entry or module.startswith(f"{entry}.")
+
+    return [f for f in FORBIDDEN if any(matches(m, f) for m in loaded)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--budget-ms', type=float, default=50.0)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    for module in TARGETS:
+        runs = [import_times(module) for _ in range(args.runs)]
+        best = min(run[module] for run in runs) / 1000
+        status = "ok" if best <= args.budget_ms else "OVER BUDGET"
+        print(f"{module:<28} {best:>7.1f}ms  budget {args.budget_ms:>5.1f}ms  {status}")
+        failed = failed or best > args.budget_ms
+
+        unexpected = forbidden(list(runs[0]))
+        if unexpected:
+            failed = True
+            print(f"  loaded at startup: {', '.join(unexpected)}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+'''Bytes per decoded record for the regular and slotted (compact) models.
+
+    python benchmarks/memory.py [records]
+'''
+import gc
+import sys
+import tracemalloc
+
+from sevco_shell.clients.source_audit.model import SourceExecutionV2
+
+from decode import execution
+
+
+def payloads(n: int):
+    # Copy the identifiers so every record owns its own strings, as it would
+    #  coming straight out of the JSON decoder
+    for i in range(n):
+        p = execution(i)
+        p["org_id"] = "".join(p["org_id"])
+        p["runner"]["id"] = "".join(p["runner"]["id"])
+        p["execution"]["source_config_id"] = "".join(p["execution"]["source_config_id"])
+        p["execution"]["plugin_id"] = "".join(p["execution"]["plugin_id"])
+        yield p
+
+
+def measure(cls, n: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+
+    # Payloads are dropped as they are decoded, so only what the records keep alive is counted
+    records = [cls.from_dict(p) for p in payloads(n)]
+    gc.collect()
+
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(records) == n
+    return (after - before) / n
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    regular = measure(SourceExecutionV2, n)
+    compact = measure(SourceExecutionV2.slotted(), n)
+
+    print(f"SourceExecutionV2 x{n}")
+    print(f"  regular  {regular:>8,.0f} bytes/record")
+    print(f"  slotted  {compact:>8,.0f} bytes/record  ({100 * (1 - compact / regular):.0f}% smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+'''Non-interactive batch mode.
+
+    svsh -c "orgs; 3; configs list"
+    svsh -f script.svsh
+
+Commands run one after another in the same scopes, clients and caches an
+interactive session would use, and the run stops with exit status 1 at the
+first command that fails. Builder prompts are answered from --answer and
+--answers-file instead of stdin, and a prompt with no answer left is an error
+rather than a wait for input.
+'''
+import logging
+import sys
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+from sevco_shell.builders.builder import Answers, Builder
+
+if TYPE_CHECKING:
+    from sevco_shell.clients.tenant.models import Organization
+    from sevco_shell.config.credentials import ApiCredentials
+    from sevco_shell.scopes.scope import Scope
+
+LOG = logging.getLogger(__name__)
+
+
+def split_commands(text: str) -> List[str]:
+    '''Commands separated by ';' or newlines, without blanks and '#' comments'''
+    commands = []
+    for line in text.splitlines():
+        if line.lstrip().startswith('#'):
+            continue
+        commands.extend(c.strip() for c in line.split(';') if c.strip())
+
+    return commands
+
+
+def read_script(path: str) -> List[str]:
+    '''Commands in a script file, '-' reads the script from stdin'''
+    if path == '-':
+        return split_commands(sys.stdin.read())
+
+    with open(path) as f:
+        return split_commands(f.read())
+
+
+def read_answers(path: str) -> List[str]:
+    '''One answer per line, a blank line takes the prompt's default'''
+    with open(path) as f:
+        return f.read().splitlines()
+
+
+def commands_from_args(args) -> List[str]:
+    commands = split_commands(args.commands) if args.commands is not None else []
+    if args.script is not None:
+        commands += read_script(args.script)
+
+    return commands
+
+
+def answers_from_args(args) -> List[str]:
+    answers = list(args.answer)
+    if args.answers_file is not None:
+        answers += read_answers(args.answers_file)
+
+    return answers
+
+
+def find_org(sv_scope: 'Scope', org: str) -> 'Organization':
+    '''The org with id or name org, refetching the org list once if it is not there'''
+    orgs = sv_scope.get_cmd('orgs')
+    for attempt in range(2):
+        for o in orgs.things:
+            if org in (o.id, o.org_name):
+                return o
+        if attempt == 0:
+            orgs._clear_list()
+
+    raise Exception(f"Unknown org: {org}")
+
+
+def run_commands(commands: Iterable[str], credentials: 'ApiCredentials', org: Optional[str] = None) -> int:
+    '''Run commands from the top level scope, or from org's scope, returns the process exit status'''
+    from sevco_shell.config import Config
+    from sevco_shell.scopes.org import OrgScope
+    from sevco_shell.scopes.sv import SvScope
+
+    stack: List['Scope'] = [SvScope(credentials)]
+    if org is not None:
+        try:
+            stack.append(OrgScope(Config(credentials=credentials, org=find_org(stack[0], org))))
+        except Exception as e:
+            print(f"Error: {str(e)}", file=sys.stderr)
+            return 1
+
+    return run_in_stack(commands, stack)
+
+
+def run_in_stack(commands: Iterable[str], stack: List['Scope']) -> int:
+    '''Run commands with stack as the scope stack, stopping at the first that fails'''
+    import requests
+
+    from sevco_shell.scopes.scope import Scope
+
+    # Scope responses push and pop Scope.cmd_stack, point it at this run's stack
+    previous, Scope.cmd_stack = Scope.cmd_stack, stack
+    try:
+        for line in commands:
+            if not Scope.cmd_stack:
+                # The script ran exit
+                break
+
+            scope = Scope.cmd_stack[-1]
+            LOG.debug("batch: %s", line)
+
+            name, _, _ = scope.parseline(line)
+            known = hasattr(scope, f'do_{name}') or (name.isdigit() and getattr(scope, 'last_listed', None))
+            if name and not known:
+                # A typo must not let the rest of the script run in the wrong scope
+                print(f"Error: unknown command: {line}", file=sys.stderr)
+                return 1
+
+            try:
+                line = scope.precmd(line)
+                scope.postcmd(scope.onecmd(line), line)
+            except requests.exceptions.HTTPError as e:
+                print(f"Error: {line}: {str(e)}: {e.response.text}", file=sys.stderr)
+                return 1
+            except Exception as e:
+                print(f"Error: {line}: {str(e)}", file=sys.stderr)
+                return 1
+            finally:
+                sys.stdout.flush()
+
+        return 0
+    finally:
+        Scope.cmd_stack = previous
+
+
+def main(commands: List[str], credentials: 'ApiCredentials', answers: Answers,
+         org: Optional[str] = None) -> int:
+    Builder.answers = answers
+    try:
+        return run_commands(commands, credentials, org=org)
+    finally:
+        credentials.tokens.close()
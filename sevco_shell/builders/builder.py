@@ -1,27 +1,81 @@
+from collections import deque
 from getpass import getpass
-from typing import List
+from typing import Iterable, List, Optional
+
+
+class NoAnswerError(Exception):
+    def __init__(self, prompt: str, answer: Optional[str] = None):
+        if answer is None:
+            super().__init__(f"No answer given for prompt: {prompt}")
+        else:
+            super().__init__(f"Invalid answer {answer!r} for prompt: {prompt}")
+        self.prompt = prompt
+        self.answer = answer
+
+
+class Answers:
+    '''Scripted answers to Builder prompts, used in place of input() in batch mode.
+
+    Answers are consumed in order. With yes set every yes/no prompt is answered
+    yes without consuming one. Running out of answers, or giving one a prompt
+    does not accept, raises NoAnswerError rather than asking.
+    '''
+
+    def __init__(self, answers: Iterable[str] = (), yes: bool = False):
+        self.answers = deque(answers)
+        self.yes = yes
+
+    def next(self, prompt: str) -> str:
+        if not self.answers:
+            raise NoAnswerError(prompt)
+
+        return self.answers.popleft()
 
 
 class Builder:
+    # Set in batch mode, prompts then never wait for input
+    answers: Optional[Answers] = None
+
+    @staticmethod
+    def interactive() -> bool:
+        return Builder.answers is None
+
+    @staticmethod
+    def _input(prompt: str) -> str:
+        if Builder.answers is not None:
+            return Builder.answers.next(prompt)
+
+        return input(prompt)
+
+    @staticmethod
+    def _retry(prompt: str, val: str) -> str:
+        if Builder.answers is not None:
+            raise NoAnswerError(prompt, val)
+
+        return input(prompt)
+
     @staticmethod
     def get_input(prompt: str, required: bool = True) -> str:
         if required:
             prompt = f"{prompt} (required)"
 
-        val = input(f"{prompt}: ")
+        val = Builder._input(f"{prompt}: ")
         while val == "" and required:
-            val = input(f"{prompt}: ")
+            val = Builder._retry(f"{prompt}: ", val)
 
         return val
 
     @staticmethod
     def get_yes_no(prompt: str, default_yes: bool = True) -> bool:
+        if Builder.answers is not None and Builder.answers.yes:
+            return True
+
         p = f"{prompt} (Yes/[N]o): "
         if default_yes:
             p = f"{prompt} ([Y]es/No): "
-        val = input(p)
+        val = Builder._input(p)
         while val.lower() not in ['y', 'yes', 'n', 'no', '']:
-            val = input(p)
+            val = Builder._retry(p, val)
 
         if val == '':
             return default_yes
@@ -31,14 +85,17 @@ class Builder:
     @staticmethod
     def get_one_of(prompt: str, values=List[str], default=None) -> str:
         choices = ', '.join([v if v != default else f"[{v}]" for v in values])
-        val = input(f"{prompt} ({choices}): ") or default
+        val = Builder._input(f"{prompt} ({choices}): ") or default
         while val not in values:
-            val = input(f"{prompt} ({choices}): ") or default
+            val = Builder._retry(f"{prompt} ({choices}): ", val) or default
 
         return val
 
     @staticmethod
     def get_password(prompt: str) -> str:
+        if Builder.answers is not None:
+            return Builder.answers.next(f"{prompt} (required): ")
+
         while True:
             v = getpass(f"{prompt} (required): ")
             p = getpass(f"{prompt} (re-enter): ")
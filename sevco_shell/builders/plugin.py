@@ -1,10 +1,12 @@
+import os
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List
 
 from sevco_shell.builders.builder import Builder
 from sevco_shell.clients.models import OperatingSystem
 from sevco_shell.clients.plugin_repository.client import PluginClient
 from sevco_shell.clients.plugin_repository.models import Plugin, PluginInput
+from sevco_shell.clients.plugin_repository.upload import upload_builds
 from sevco_shell.config import Config
 
 
@@ -18,12 +20,17 @@ class OperatingSystemFiendlyName(Enum):
         return list(cls.__dict__.get('_value2member_map_').keys())
 
 
+def upload_mmap() -> bool:
+    return os.environ.get("SVSH_UPLOAD_MMAP", "").lower() in ("1", "true", "yes", "on")
+
+
 class PluginBuilder(Builder):
     def __init__(self, config: Config, source_id=str):
         self.client = PluginClient(
             api_host=config.credentials.api_host, auth_token=config.credentials.auth_token, target_org=config.org.id)
         self.source_id = source_id
         self.plugin_input = None
+        self.builds: Dict[OperatingSystem, str] = {}
 
     def from_user(self) -> 'PluginBuilder':
         try:
@@ -35,23 +42,59 @@ class PluginBuilder(Builder):
 
     def _from_user(self) -> PluginInput:
         display_version = self.get_input("Display Version", required=False)
-        os = OperatingSystem(OperatingSystemFiendlyName(self.get_one_of(
-            "OS", OperatingSystemFiendlyName.keys())).name)
+        upload_from = self.get_one_of("Upload from", ["url", "files"], default="url")
+
+        if upload_from == "files":
+            self.builds = self._builds_from_user()
+            plugin_os = next(iter(self.builds))
+            binary_url = None
+        else:
+            plugin_os = OperatingSystem(OperatingSystemFiendlyName(self.get_one_of(
+                "OS", OperatingSystemFiendlyName.keys())).name)
+            binary_url = self.get_input("Binary URL")
+
         enabled = self.get_yes_no("Enabled")
         default = self.get_yes_no("Make default")
-        binary_url = self.get_input("Binary URL")
 
         return PluginInput(source_id=self.source_id,
                            display_version=display_version,
-                           os=os,
+                           os=plugin_os,
                            enabled=enabled,
                            default=default,
                            binary_url=binary_url)
 
-    def build(self) -> Optional[Plugin]:
-        if self.plugin_input:
+    def _builds_from_user(self) -> Dict[OperatingSystem, str]:
+        builds: Dict[OperatingSystem, str] = {}
+        while not builds:
+            for name in OperatingSystemFiendlyName:
+                path = self.get_input(f"{name.value} binary path (blank to skip)", required=False)
+                while path and not os.path.isfile(os.path.expanduser(path)):
+                    print(f"{path} not found")
+                    path = self.get_input(f"{name.value} binary path (blank to skip)", required=False)
+
+                if path:
+                    builds[OperatingSystem(name.name)] = os.path.expanduser(path)
+
+        return builds
+
+    def build(self) -> List[Plugin]:
+        if not self.plugin_input:
+            return []
+
+        if not self.builds:
             plugin = self.client.create(plugin_input=self.plugin_input)
             print(f"Plugin created: {plugin.id}")
-            return plugin
+            return [plugin]
+
+        plugins = []
+        for result in upload_builds(self.client, self.plugin_input, self.builds, use_mmap=upload_mmap()):
+            name = OperatingSystemFiendlyName[result.os.name].value
+            if not result.ok:
+                print(f"{name.rjust(8)} upload failed: {result.error}")
+            elif result.skipped:
+                print(f"{name.rjust(8)} unchanged, matches plugin {result.plugin.id}")
+            else:
+                print(f"{name.rjust(8)} plugin created: {result.plugin.id} ({result.elapsed:.1f}s)")
+                plugins.append(result.plugin)
 
-        return None
+        return plugins
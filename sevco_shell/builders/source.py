@@ -3,6 +3,8 @@ from typing import Optional
 from sevco_shell.builders.builder import Builder
 from sevco_shell.clients.scheduler.client import SchedulerServiceClient
 from sevco_shell.clients.scheduler.models import DataSourceSchedule
+from sevco_shell.clients.cache import bypass
+from sevco_shell.clients.schema.cache import load_categories
 from sevco_shell.clients.schema.client import SchemaClient, SourceSchemaClient
 from sevco_shell.clients.schema.models import (SourceSchemaByName,
                                                SourceSchemaByNameArray,
@@ -55,12 +57,10 @@ class SourceSchemaBuilder(Builder):
             api_host=config.credentials.api_host, auth_token=config.credentials.auth_token, target_org=config.org.id)
         self.source_id = source_id
 
-        self.auth_schemas = [s['title']
-                             for s in self.schemas_client.list("auth")]
-        self.connect_schemas = [s['title']
-                                for s in self.schemas_client.list("connect")]
-        self.settings_schemas = [s['title']
-                                 for s in self.schemas_client.list("settings")]
+        categories = load_categories(self.schemas_client)
+        self.auth_schemas = [s['title'] for s in categories["auth"]]
+        self.connect_schemas = [s['title'] for s in categories["connect"]]
+        self.settings_schemas = [s['title'] for s in categories["settings"]]
 
         self.schemas = None
 
@@ -95,7 +95,9 @@ class SourceSchemaBuilder(Builder):
 
     def build(self) -> Optional[SourceSchemaByName]:
         if self.schemas:
-            all_schemas = self.client.get(self.source_id)
+            # The whole list is rewritten, read it from the server rather than the schema cache
+            with bypass():
+                all_schemas = self.client.get(self.source_id)
             by_name = [SourceSchemaByName(info=schema.info,
                                           auth=schema.auth['title'],
                                           connect=schema.connect['title'],
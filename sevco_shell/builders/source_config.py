@@ -1,6 +1,7 @@
 from typing import Any, Dict, Optional
 
 from sevco_shell.builders.builder import Builder
+from sevco_shell.clients.schema.cache import load_source_schemas
 from sevco_shell.clients.schema.client import SourceSchemaClient
 from sevco_shell.clients.source_config.client import SourceConfigClient
 from sevco_shell.clients.source_config.model import (SchemaInstance,
@@ -31,7 +32,7 @@ class SourceConfigBuilder(Builder):
         if not self.source_id:
             self.source_id = self.get_input("Source ID:", required=True)
 
-        schemas = self.schema_client.get(self.source_id)
+        schemas = load_source_schemas(self.schema_client, self.source_id)
         schema_desc = schemas[0].info.description
 
         if len(schemas) > 1:
@@ -50,13 +51,9 @@ class SourceConfigBuilder(Builder):
         runner_id = None
         if self.schema.info.runner_requirements.configurable:
             if self.schema.info.runner_requirements.required:
-                runner_id = input("Runner ID (required): ")
-                while runner_id == "":
-                    runner_id = input("Runner ID (required): ")
+                runner_id = self.get_input("Runner ID")
             else:
-                runner_id = input("Runner ID (<RETURN> to skip): ")
-                if not runner_id:
-                    runner_id = None
+                runner_id = self.get_input("Runner ID (<RETURN> to skip)", required=False) or None
 
         enabled = self.get_yes_no("Enabled")
 
@@ -0,0 +1,296 @@
+'''Content addressed local store for runner and plugin binaries.
+
+Binaries are stored once under blobs/<sha256>, and named by refs such as
+plugin/<os>/<version>/<signature> or runner/<os>/latest. A ref that is already
+present is served from disk without any network I/O. Refs can carry a max age
+for artifacts like the latest runner build whose content changes under the same
+name. Once the store grows past max_bytes the least recently used blobs are
+evicted, never the one just stored. A binary larger than max_bytes is handed
+back without being stored.
+
+The store directory can be shared by concurrent svsh processes: every file is
+written to a temp file and renamed into place, adding blobs, ref updates and
+eviction hold an exclusive lock on the store's lock file, and reading refs and
+copying blobs out hold a shared one.
+'''
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows, fall back to rename atomicity only
+    fcntl = None  # type: ignore
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class Artifact:
+    key: str
+    sha256: str
+    size: int
+    path: str
+    hit: bool = False
+    # False when the artifact was too large to keep, path is then outside the store
+    stored: bool = True
+
+
+@dataclass
+class StoreStats:
+    refs: int = 0
+    blobs: int = 0
+    bytes: int = 0
+
+
+def plugin_key(os_name: str, version: str, signature: str) -> str:
+    return f"plugin/{os_name}/{version}/{signature}"
+
+
+def runner_key(os_name: str, version: str = "latest") -> str:
+    return f"runner/{os_name}/{version}"
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def from_env(cls) -> 'ArtifactStore':
+        root = os.environ.get("SVSH_ARTIFACTS_DIR", f"{Path.home()}/.sevco/artifacts")
+        max_bytes = int(os.environ.get("SVSH_ARTIFACTS_MAX_BYTES", DEFAULT_MAX_BYTES))
+        return cls(root, max_bytes=max_bytes)
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[Artifact]:
+        with self._locked(shared=True):
+            ref = self._read_ref(key)
+            if ref is None:
+                return None
+
+            if max_age is not None and time.time() - ref['stored'] > max_age:
+                return None
+
+            blob = self._blob_path(ref['sha256'])
+            try:
+                # Touch for LRU eviction
+                os.utime(blob)
+            except OSError:
+                return None
+
+        return Artifact(key=key, sha256=ref['sha256'], size=ref['size'], path=str(blob), hit=True)
+
+    def fetch(self, key: str, download: Callable[[str], Any], max_age: Optional[float] = None,
+              meta: Optional[Dict[str, Any]] = None) -> Artifact:
+        '''Return the stored artifact, calling download(path) to fetch it on a miss.
+
+        download writes the artifact to the path it is given. The path is stable
+        per key so downloaders that resume partial files can pick up where an
+        interrupted fetch stopped. Concurrent fetches of the same key wait for
+        the first one rather than downloading it twice.
+        '''
+        artifact = self.get(key, max_age)
+        if artifact is not None:
+            return artifact
+
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        path = self.root / "incoming" / name
+
+        with self._locked(f"incoming/{name}.lock"):
+            artifact = self.get(key, max_age)
+            if artifact is not None:
+                return artifact
+
+            download(str(path))
+
+            return self.put(key, str(path), meta=meta, move=True)
+
+    def put(self, key: str, path: str, meta: Optional[Dict[str, Any]] = None, move: bool = False) -> Artifact:
+        '''Add the file at path under key.
+
+        A file larger than max_bytes is not stored, the returned artifact then
+        points at path itself, which is left in place even with move.
+        '''
+        sha256 = file_sha256(path)
+        size = os.path.getsize(path)
+        blob = self._blob_path(sha256)
+
+        if size > self.max_bytes:
+            LOG.debug("not storing %s, %d bytes is over the %d byte limit", key, size, self.max_bytes)
+            return Artifact(key=key, sha256=sha256, size=size, path=path, stored=False)
+
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp = None
+        ref = {'key': key, 'sha256': sha256, 'size': size, 'stored': time.time(), 'meta': meta or {}}
+        try:
+            with self._locked():
+                # Checked under the lock, another process may evict the blob at any time outside it
+                if not blob.exists():
+                    if not move:
+                        fd, tmp = tempfile.mkstemp(dir=blob.parent, prefix=".tmp-")
+                        os.close(fd)
+                        shutil.copyfile(path, tmp)
+                    os.replace(path if move else tmp, blob)  # type: ignore
+                    tmp = None
+                elif move:
+                    os.remove(path)
+                # A re-referenced blob is the most recently used one
+                os.utime(blob)
+
+                self._write_atomic(self._ref_path(key), json.dumps(ref).encode('utf-8'))
+                self._evict(keep=sha256)
+        finally:
+            if tmp is not None:
+                with contextlib.suppress(OSError):
+                    os.remove(tmp)
+
+        return Artifact(key=key, sha256=sha256, size=size, path=str(blob))
+
+    def export(self, artifact: Artifact, target: str) -> None:
+        '''Copy an artifact out of the store, atomically replacing target'''
+        target_dir = os.path.dirname(target) or "."
+        os.makedirs(target_dir, exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=target_dir, prefix=".svsh-")
+        os.close(fd)
+        try:
+            # Eviction by another process waits until the copy is done
+            with self._locked(shared=True):
+                if not os.path.exists(artifact.path):
+                    raise FileNotFoundError(f"{artifact.key} was evicted from the artifact store, fetch it again")
+                shutil.copyfile(artifact.path, tmp)
+            os.replace(tmp, target)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+            raise
+
+    def stats(self) -> StoreStats:
+        blobs = self._blobs()
+        return StoreStats(refs=len(list(self._refs())), blobs=len(blobs), bytes=sum(size for _, _, size in blobs))
+
+    def clear(self) -> None:
+        with self._locked():
+            for ref_path, _ in self._refs():
+                with contextlib.suppress(OSError):
+                    ref_path.unlink()
+            for _, blob, _ in self._blobs():
+                with contextlib.suppress(OSError):
+                    blob.unlink()
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        # Caller holds the lock. keep is the sha256 of a blob that must stay
+        blobs = self._blobs()
+        total = sum(size for _, _, size in blobs)
+        if total <= self.max_bytes:
+            return
+
+        evicted = set()
+        for _, blob, size in sorted(blobs):
+            if total <= self.max_bytes:
+                break
+            if blob.name == keep:
+                continue
+            with contextlib.suppress(OSError):
+                blob.unlink()
+            evicted.add(blob.name)
+            total -= size
+
+        for ref_path, ref in self._refs():
+            if ref.get('sha256') in evicted:
+                with contextlib.suppress(OSError):
+                    ref_path.unlink()
+
+        LOG.debug("evicted %d artifacts", len(evicted))
+
+    def _blobs(self) -> List[Tuple[float, Path, int]]:
+        blobs = []
+        for blob in (self.root / "blobs").glob("*/*"):
+            if blob.name.startswith(".tmp-"):
+                continue
+            with contextlib.suppress(OSError):
+                st = blob.stat()
+                blobs.append((st.st_mtime, blob, st.st_size))
+        return blobs
+
+    def _refs(self) -> Iterator[Tuple[Path, Dict[str, Any]]]:
+        for ref_path in (self.root / "refs").glob("*.json"):
+            ref = self._load_json(ref_path)
+            if ref is not None:
+                yield ref_path, ref
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self.root / "blobs" / sha256[:2] / sha256
+
+    def _ref_path(self, key: str) -> Path:
+        return self.root / "refs" / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+    def _read_ref(self, key: str) -> Optional[Dict[str, Any]]:
+        ref = self._load_json(self._ref_path(key))
+        return ref if ref is not None and ref.get('key') == key else None
+
+    @staticmethod
+    def _load_json(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, 'rb') as f:
+                return json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    @contextlib.contextmanager
+    def _locked(self, name: str = ".lock", shared: bool = False) -> Iterator[None]:
+        lock_path = self.root / name
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(lock_path, "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+
+def download_url(url: str, target: str, session, chunk_size: int = CHUNK_SIZE,
+                 progress: Optional[Callable[[int, Optional[int]], None]] = None) -> None:
+    '''Stream a pre-signed artifact URL to target'''
+    with session.get(url, stream=True) as resp:
+        resp.raise_for_status()
+        length = resp.headers.get("Content-Length")
+        total = int(length) if length is not None else None
+
+        done = 0
+        if progress:
+            progress(done, total)
+        with open(target, "wb") as f:
+            for chunk in resp.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+                done += len(chunk)
+                if progress:
+                    progress(done, total)
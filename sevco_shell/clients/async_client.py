@@ -0,0 +1,63 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, Type
+
+from sevco_shell.clients.client import SevcoClient
+from sevco_shell.clients.session import SessionPool, default_pool
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def request_executor() -> ThreadPoolExecutor:
+    '''Worker threads that carry out blocking requests for the async clients.
+
+    Sized to the per-host connection pool so concurrent requests reuse pooled
+    connections rather than opening and discarding extra ones.
+    '''
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=default_pool().config.pool_maxsize,
+                                               thread_name_prefix="svsh-request")
+
+    return _executor
+
+
+class AsyncSevcoClient:
+    client_class: Type[SevcoClient] = SevcoClient
+
+    def __init__(self, api_host: str, auth_token: Optional[str] = None, target_org: Optional[str] = None,
+                 pool: Optional[SessionPool] = None, max_concurrency: Optional[int] = None):
+        self.client = self.client_class(api_host, auth_token, target_org, pool=pool)
+        self.max_concurrency = max_concurrency or self.client.pool.config.pool_maxsize
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop = None
+
+    @property
+    def api_host(self) -> str:
+        return self.client.api_host
+
+    @property
+    def target_org(self) -> Optional[str]:
+        return self.client.target_org
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Semaphores are bound to the loop they are first used on, so make a new
+        #  one if the client is reused from another asyncio.run()
+        loop = asyncio.get_event_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+
+        return self._semaphore
+
+    async def _run(self, func: Callable, *args, **kwargs) -> Any:
+        async with self._get_semaphore():
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(request_executor(), partial(func, *args, **kwargs))
@@ -0,0 +1,317 @@
+'''Persistent HTTP response cache shared across shell sessions.
+
+Responses to slow changing GET endpoints (org list, source catalog, schema
+categories, plugins) are stored under ~/.sevco/cache/<profile>/, keyed by the
+request, its target org and a hash of its auth token. Entries are served
+without a request while fresh. Once stale they are revalidated with
+If-None-Match / If-Modified-Since when the server sent an ETag or
+Last-Modified header. Any successful PUT, POST or DELETE drops cached entries
+for the changed path, the paths under it and its direct collection, and the
+oldest entries are evicted once the cache grows past its size limit.
+'''
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+# (path pattern, ttl seconds)
+DEFAULT_TTLS: List[Tuple[str, int]] = [
+    (r"^/v1/admin/org$", 5 * 60),
+    (r"^/v1/integration/source$", 10 * 60),
+    (r"^/v1/integration/source/plugin$", 5 * 60),
+    (r"^/v1/schema/[^/]+$", 60 * 60),
+    # A source's own schemas are not cached here: they are read back before
+    #  being rewritten whole, see clients/schema/cache.py for the read cache
+]
+
+_STORED_HEADERS = ['Content-Type', 'ETag', 'Last-Modified']
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+    stored: int = 0
+    invalidated: int = 0
+    evicted: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+class ResponseCache:
+    def __init__(self, root: str, ttls: Optional[List[Tuple[str, int]]] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.ttls: List[Tuple[Pattern, int]] = [(re.compile(p), ttl) for p, ttl in (ttls or DEFAULT_TTLS)]
+        # Every cached path starts with one of these
+        self._prefixes = [_literal_prefix(p.pattern) for p, _ in self.ttls]
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'ResponseCache':
+        profile = os.environ.get("SEVCO_PROFILE", "default")
+        max_bytes = int(os.environ.get("SVSH_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        return cls(f"{Path.home()}/.sevco/cache/{profile}", max_bytes=max_bytes)
+
+    def ttl(self, path: str) -> Optional[int]:
+        for pattern, ttl in self.ttls:
+            if pattern.match(path):
+                return ttl
+        return None
+
+    @staticmethod
+    def key(method: str, url: str, params: Optional[Dict], target_org: Optional[str],
+            auth_token: Optional[str]) -> str:
+        # Responses are only shared between requests made with the same token
+        identity = hashlib.sha256(auth_token.encode('utf-8')).hexdigest() if auth_token else None
+        request = [method, url, sorted((params or {}).items()), target_org, identity]
+        return hashlib.sha256(json.dumps(request, default=str).encode('utf-8')).hexdigest()
+
+    def lookup(self, key: str, ttl: int) -> Tuple[Optional[requests.Response], Dict[str, str]]:
+        '''Returns (fresh response, conditional request headers)'''
+        meta = self._read_meta(key)
+        if meta is None:
+            self._count(misses=1)
+            return None, {}
+
+        if time.time() - meta['stored'] < ttl:
+            body = self._read_body(key)
+            if body is not None:
+                self._touch(key)
+                self._count(hits=1)
+                return self._response(meta, body), {}
+
+        self._count(misses=1)
+
+        conditional = {}
+        if meta['headers'].get('ETag'):
+            conditional['If-None-Match'] = meta['headers']['ETag']
+        if meta['headers'].get('Last-Modified'):
+            conditional['If-Modified-Since'] = meta['headers']['Last-Modified']
+
+        return None, conditional
+
+    def revalidated(self, key: str) -> Optional[requests.Response]:
+        '''Server answered 304 Not Modified: mark the entry fresh again and return it'''
+        meta = self._read_meta(key)
+        body = self._read_body(key)
+        if meta is None or body is None:
+            return None
+
+        meta['stored'] = time.time()
+        self._write(self._meta_path(key), json.dumps(meta).encode('utf-8'))
+        self._count(revalidated=1)
+
+        return self._response(meta, body)
+
+    def store(self, key: str, path: str, resp: requests.Response) -> None:
+        meta = {
+            'path': path,
+            'url': resp.url,
+            'status': resp.status_code,
+            'stored': time.time(),
+            'headers': {h: resp.headers[h] for h in _STORED_HEADERS if h in resp.headers},
+        }
+
+        # Body first so a reader never finds metadata without a body
+        self._write(self._body_path(key), resp.content)
+        self._write(self._meta_path(key), json.dumps(meta).encode('utf-8'))
+        self._count(stored=1)
+
+        self._evict()
+
+    def invalidate(self, path: str, parent: bool = True) -> int:
+        '''Drop entries for the changed path, the paths under it and, with parent, its direct collection.
+
+        parent is for a changed resource such as /v1/runner/<id>, whose listing
+        /v1/runner changes with it. A POST to a collection passes parent=False.
+        Other ancestors are left alone, so updating a source config does not
+        drop the source catalog.
+        '''
+        collection = path.rsplit('/', 1)[0] if parent else None
+        if not any(path.startswith(p) or p.startswith(path) for p in self._prefixes):
+            # No cacheable path is related to this one, skip reading every entry
+            return 0
+
+        removed = 0
+        for meta_path in self._meta_paths():
+            meta = self._load_json(meta_path)
+            cached = meta.get('path', '') if meta else ''
+            if meta is None or cached in (path, collection) or cached.startswith(f"{path}/"):
+                self._remove(meta_path.stem)
+                removed += 1
+
+        self._count(invalidated=removed)
+        return removed
+
+    def clear(self) -> int:
+        removed = 0
+        for meta_path in self._meta_paths():
+            self._remove(meta_path.stem)
+            removed += 1
+        return removed
+
+    def stats(self) -> CacheStats:
+        entries, size = 0, 0
+        for meta_path in self._meta_paths():
+            entries += 1
+            size += self._size(meta_path) + self._size(self._body_path(meta_path.stem))
+
+        with self._lock:
+            stats = CacheStats(**self._stats.__dict__)
+        stats.entries = entries
+        stats.bytes = size
+
+        return stats
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for meta_path in self._meta_paths():
+            body_path = self._body_path(meta_path.stem)
+            size = self._size(meta_path) + self._size(body_path)
+            try:
+                used = body_path.stat().st_mtime
+            except OSError:
+                used = 0
+            entries.append((used, meta_path.stem, size))
+            total += size
+
+        evicted = 0
+        for _, key, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(key)
+            total -= size
+            evicted += 1
+
+        self._count(evicted=evicted)
+
+    def _count(self, **kwargs) -> None:
+        with self._lock:
+            for name, n in kwargs.items():
+                setattr(self._stats, name, getattr(self._stats, name) + n)
+
+    @staticmethod
+    def _response(meta: Dict, body: bytes) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = meta['status']
+        resp.url = meta['url']
+        resp.headers = CaseInsensitiveDict(meta['headers'])
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp._content = body
+        return resp
+
+    def _meta_path(self, key: str) -> Path:
+        return self.root / f"{key}.meta"
+
+    def _body_path(self, key: str) -> Path:
+        return self.root / f"{key}.body"
+
+    def _meta_paths(self) -> List[Path]:
+        try:
+            return list(self.root.glob("*.meta"))
+        except OSError:
+            return []
+
+    def _read_meta(self, key: str) -> Optional[Dict]:
+        return self._load_json(self._meta_path(key))
+
+    @staticmethod
+    def _load_json(path: Path) -> Optional[Dict]:
+        try:
+            with open(path, 'rb') as f:
+                return json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _read_body(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._body_path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _touch(self, key: str) -> None:
+        try:
+            os.utime(self._body_path(key))
+        except OSError:
+            pass
+
+    def _write(self, path: Path, data: bytes) -> None:
+        # Write to a temp file and rename so other svsh processes never see partial entries
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _remove(self, key: str) -> None:
+        for path in (self._meta_path(key), self._body_path(key)):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
+
+
+def _literal_prefix(pattern: str) -> str:
+    '''The text every match of an anchored path pattern starts with'''
+    prefix = re.match(r"[^.^$*+?{}\[\]\\|()]*", pattern.lstrip('^')).group(0)
+    return prefix if pattern.startswith('^') else ''
+
+
+_response_cache: Optional[ResponseCache] = None
+_local = threading.local()
+
+
+def response_cache() -> Optional[ResponseCache]:
+    return _response_cache
+
+
+def set_response_cache(cache: Optional[ResponseCache]) -> None:
+    global _response_cache
+    _response_cache = cache
+
+
+@contextmanager
+def bypass() -> Iterator[None]:
+    '''Revalidate cached entries with the server instead of serving them, for requests made in this thread'''
+    previous = bypassed()
+    _local.bypass = True
+    try:
+        yield
+    finally:
+        _local.bypass = previous
+
+
+def bypassed() -> bool:
+    return getattr(_local, 'bypass', False)
@@ -1,18 +1,43 @@
-from typing import Callable, Dict, Optional
+from typing import Dict, Optional
+from urllib.parse import urlsplit
 
 import requests
 
+from sevco_shell.clients.cache import ResponseCache, bypassed, response_cache
+from sevco_shell.clients.session import SessionPool, default_pool
+
+# Tokens that were refreshed after clients were created with them
+_replaced_tokens: Dict[str, str] = {}
+
+
+def replace_token(old: str, new: str) -> None:
+    _replaced_tokens[old] = new
+    for previous, replacement in list(_replaced_tokens.items()):
+        if replacement == old:
+            _replaced_tokens[previous] = new
+
+
+def current_token(token: Optional[str]) -> Optional[str]:
+    return _replaced_tokens.get(token, token) if token else token
+
 
 class SevcoClient:
-    def __init__(self, api_host: str, auth_token: Optional[str] = None, target_org: Optional[str] = None):
+    def __init__(self, api_host: str, auth_token: Optional[str] = None, target_org: Optional[str] = None,
+                 pool: Optional[SessionPool] = None, cache: Optional[ResponseCache] = None):
         self.auth_token = auth_token
         self.api_host = api_host
         self.target_org = target_org
+        self.pool = pool or default_pool()
+        self._cache = cache
+
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        return self._cache or response_cache()
 
     @property
     def static_headers(self) -> Dict[str, str]:
         headers = {
-            "Authorization": self.auth_token,
+            "Authorization": current_token(self.auth_token),
             "Accept": "application/json",
             "Content-Type": "application/json"
         }
@@ -23,32 +48,74 @@ class SevcoClient:
         return headers
 
     def api_get(self, path: str, **kwargs) -> requests.Response:
-        return self._make_request(requests.get, url=f"{self.api_host}{path}", **kwargs)
+        return self._make_request("GET", url=f"{self.api_host}{path}", **kwargs)
 
     def api_put(self, path: str, **kwargs) -> requests.Response:
-        return self._make_request(requests.put, url=f"{self.api_host}{path}", **kwargs)
+        return self._make_request("PUT", url=f"{self.api_host}{path}", **kwargs)
 
     def api_post(self, path: str, **kwargs) -> requests.Response:
-        return self._make_request(requests.post, url=f"{self.api_host}{path}", **kwargs)
+        return self._make_request("POST", url=f"{self.api_host}{path}", **kwargs)
 
     def api_delete(self, path: str, **kwargs) -> requests.Response:
-        return self._make_request(requests.delete, url=f"{self.api_host}{path}", **kwargs)
+        return self._make_request("DELETE", url=f"{self.api_host}{path}", **kwargs)
 
     def _make_request(self,
-                      method: Callable,
+                      method: str,
                       url: str,
                       headers: Dict = None,
                       data: Dict = None,
                       json_data: Dict = None,
                       params: Dict = None,
-                      files: Dict = None) -> requests.Response:
+                      files: Dict = None,
+                      timeout: Optional[float] = None,
+                      stream: bool = False) -> requests.Response:
         request_headers = {**self.static_headers}
 
         if headers:
             request_headers.update(headers)
 
-        resp = method(url, headers=request_headers, params=params,
-                      data=data, json=json_data, files=files)
+        cache = self.cache
+        if cache is None:
+            return self._send(method, url, request_headers, data, json_data, params, files, timeout, stream)
+
+        path = urlsplit(url).path
+
+        if method != "GET":
+            resp = self._send(method, url, request_headers, data, json_data, params, files, timeout, stream)
+            cache.invalidate(path, parent=method != "POST")
+            return resp
+
+        ttl = cache.ttl(path)
+        if ttl is None or stream:
+            return self._send(method, url, request_headers, data, json_data, params, files, timeout, stream)
+
+        key = cache.key(method, url, params, request_headers.get('X-Sevco-Target-Org'),
+                        request_headers.get('Authorization'))
+        # A bypassed lookup is never fresh but still yields the conditional headers
+        cached, conditional = cache.lookup(key, 0 if bypassed() else ttl)
+        if cached is not None:
+            return cached
+
+        resp = self.pool.session.request(method, url, headers={**request_headers, **conditional},
+                                         params=params, timeout=timeout)
+
+        if resp.status_code == 304:
+            revalidated = cache.revalidated(key)
+            if revalidated is not None:
+                return revalidated
+            # Entry vanished underneath us (cleared by another svsh), refetch unconditionally
+            resp = self.pool.session.request(method, url, headers=request_headers, params=params, timeout=timeout)
+
+        resp.raise_for_status()
+        cache.store(key, path, resp)
+
+        return resp
+
+    def _send(self, method: str, url: str, headers: Dict, data: Optional[Dict], json_data: Optional[Dict],
+              params: Optional[Dict], files: Optional[Dict], timeout: Optional[float] = None,
+              stream: bool = False) -> requests.Response:
+        resp = self.pool.session.request(method, url, headers=headers, params=params,
+                                         data=data, json=json_data, files=files, timeout=timeout, stream=stream)
 
         resp.raise_for_status()
 
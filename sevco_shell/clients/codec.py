@@ -0,0 +1,66 @@
+'''JSON codec used by all clients.
+
+Picks the fastest available backend (orjson, then msgspec, then the standard
+library). Bodies are always encoded to and decoded from UTF-8 bytes so
+responses can be parsed straight from resp.content. Set SVSH_JSON_BACKEND to
+force a backend.
+'''
+import json
+import os
+from typing import Any, Callable, Dict, Tuple, Union
+
+Dumps = Callable[[Any], bytes]
+Loads = Callable[[Union[bytes, str]], Any]
+
+
+def _stdlib() -> Tuple[Dumps, Loads]:
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+    return dumps, json.loads
+
+
+def _orjson() -> Tuple[Dumps, Loads]:
+    import orjson
+
+    return orjson.dumps, orjson.loads
+
+
+def _msgspec() -> Tuple[Dumps, Loads]:
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+
+    return encoder.encode, decoder.decode
+
+
+BACKENDS: Dict[str, Callable[[], Tuple[Dumps, Loads]]] = {
+    "orjson": _orjson,
+    "msgspec": _msgspec,
+    "json": _stdlib,
+}
+
+backend = ""
+dumps: Dumps
+loads: Loads
+
+
+def use_backend(name: str) -> None:
+    global backend, dumps, loads
+
+    dumps, loads = BACKENDS[name]()
+    backend = name
+
+
+def _select_backend() -> None:
+    preferred = os.environ.get("SVSH_JSON_BACKEND")
+    for name in ([preferred] if preferred in BACKENDS else []) + list(BACKENDS):
+        try:
+            use_backend(name)
+            return
+        except ImportError:
+            pass
+
+
+_select_backend()
@@ -0,0 +1,187 @@
+'''Specialised from_dict decoders, generated once per model class.
+
+dacite inspects the type hints of every field on every call. The decoders built
+here do that work once per (class, convert_datetime) pair and generate a plain
+function that reads each key, applies the converter for its type and calls the
+dataclass constructor. Types that cannot be compiled fall back to dacite.
+'''
+import dataclasses
+import sys
+import threading
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union, get_type_hints
+
+from sevco_shell.clients.models import (MissingRequiredFieldsError,
+                                        UnexpectedFieldError,
+                                        dacite_from_dict, parse_datetime)
+
+Decoder = Callable[[Dict[str, Any]], Any]
+Converter = Optional[Callable[[Any], Any]]
+
+_decoders: Dict[Tuple[type, bool, bool], Decoder] = {}
+_lock = threading.RLock()
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def decoder_for(cls: type, convert_datetime: bool = True, strict: bool = False) -> Decoder:
+    key = (cls, convert_datetime, strict)
+    try:
+        return _decoders[key]
+    except KeyError:
+        pass
+
+    with _lock:
+        if key not in _decoders:
+            try:
+                _decoders[key] = _compile(cls, convert_datetime, strict)
+            except _Unsupported:
+                _decoders[key] = _fallback(cls, convert_datetime)
+
+        return _decoders[key]
+
+
+def _fallback(cls: type, convert_datetime: bool) -> Decoder:
+    def decode(obj: Dict[str, Any]) -> Any:
+        return dacite_from_dict(cls, obj, convert_datetime)
+
+    return decode
+
+
+def _is_optional(tp) -> bool:
+    return getattr(tp, '__origin__', None) is Union and type(None) in tp.__args__
+
+
+def _converter(tp, convert_datetime: bool) -> Tuple[Converter, bool]:
+    '''Returns (converter, nested) for a type annotation.
+
+    converter is None when the value can be used as is. nested is True when the
+    converter decodes a dataclass, so missing field paths need prefixing.
+    '''
+    if tp is Any or isinstance(tp, TypeVar):
+        return None, False
+
+    if _is_optional(tp):
+        args = [a for a in tp.__args__ if a is not type(None)]
+        if len(args) != 1:
+            raise _Unsupported(tp)
+        conv, nested = _converter(args[0], convert_datetime)
+        if conv is None:
+            return None, False
+
+        def optional(v, conv=conv):
+            return None if v is None else conv(v)
+        return optional, nested
+
+    origin = getattr(tp, '__origin__', None)
+    if origin is not None:
+        args = [a for a in getattr(tp, '__args__', ()) if not isinstance(a, TypeVar)]
+
+        if origin in (list, List):
+            if not args:
+                return None, False
+            conv, nested = _converter(args[0], convert_datetime)
+            if conv is None:
+                return None, False
+
+            def list_of(v, conv=conv):
+                return [conv(x) for x in v]
+            return list_of, nested
+
+        if origin in (dict, Dict):
+            if len(args) < 2:
+                return None, False
+            conv, nested = _converter(args[1], convert_datetime)
+            if conv is None:
+                return None, False
+
+            def dict_of(v, conv=conv):
+                return {k: conv(x) for k, x in v.items()}
+            return dict_of, nested
+
+        raise _Unsupported(tp)
+
+    if isinstance(tp, type):
+        if dataclasses.is_dataclass(tp):
+            return decoder_for(tp, convert_datetime), True
+        if issubclass(tp, Enum):
+            return tp, False
+        if issubclass(tp, datetime):
+            return (parse_datetime if convert_datetime else None), False
+        if tp in (str, int, float, bool, dict, list):
+            return None, False
+
+    raise _Unsupported(tp)
+
+
+def _compile(cls: type, convert_datetime: bool, strict: bool) -> Decoder:
+    if not dataclasses.is_dataclass(cls):
+        raise _Unsupported(cls)
+
+    try:
+        hints = get_type_hints(cls)
+    except NameError:
+        raise _Unsupported(cls)
+
+    namespace: Dict[str, Any] = {
+        'cls': cls,
+        'MissingRequiredFieldsError': MissingRequiredFieldsError,
+        'UnexpectedFieldError': UnexpectedFieldError,
+        'intern': sys.intern,
+    }
+
+    # Slotted variants ask for their identifier strings to be interned
+    intern_fields = cls.__dict__.get('__intern_fields__', frozenset())
+
+    lines = ["def decode(d):"]
+    fields = [f for f in dataclasses.fields(cls) if f.init]
+
+    if strict:
+        namespace['names'] = frozenset(f.name for f in fields)
+        lines += ["    extra = d.keys() - names",
+                  "    if extra:",
+                  "        raise UnexpectedFieldError(extra)"]
+
+    lines.append("    kw = {}")
+
+    for idx, field in enumerate(fields):
+        tp = hints[field.name]
+        conv, nested = _converter(tp, convert_datetime)
+        name = repr(field.name)
+
+        lines.append(f"    if {name} in d:")
+        if field.name in intern_fields:
+            lines += [f"        v = d[{name}]",
+                      f"        kw[{name}] = intern(v) if v.__class__ is str else v"]
+        elif conv is None:
+            lines.append(f"        kw[{name}] = d[{name}]")
+        else:
+            conv_name = f"c{idx}"
+            namespace[conv_name] = conv
+            if nested:
+                lines += ["        try:",
+                          f"            kw[{name}] = {conv_name}(d[{name}])",
+                          "        except MissingRequiredFieldsError as e:",
+                          f"            raise MissingRequiredFieldsError({field.name!r} + '.' + e.field) from None"]
+            else:
+                lines.append(f"        kw[{name}] = {conv_name}(d[{name}])")
+
+        has_default = field.default is not dataclasses.MISSING or field.default_factory is not dataclasses.MISSING  # type: ignore
+        if not has_default:
+            lines.append("    else:")
+            if _is_optional(tp):
+                lines.append(f"        kw[{name}] = None")
+            else:
+                lines.append(f"        raise MissingRequiredFieldsError({name})")
+
+    lines.append("    return cls(**kw)")
+
+    exec("\n".join(lines), namespace)
+
+    decode = namespace['decode']
+    decode.__qualname__ = f"decode_{cls.__name__}"
+
+    return decode
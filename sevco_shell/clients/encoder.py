@@ -0,0 +1,155 @@
+'''Specialised as_dict encoders, generated once per model class.
+
+dataclasses.asdict walks every value through a dict factory that type checks
+each field at run time. The encoders built here pick the conversion for each
+field from its annotation once and generate a function that builds the dict
+directly. Values of opaque fields (Any, plain dict or list) are passed through
+rather than deep copied.
+'''
+import dataclasses
+import threading
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union, get_type_hints
+
+from sevco_shell.clients.models import HideValue
+
+Encoder = Callable[[Any], Dict[str, Any]]
+Converter = Optional[Callable[[Any], Any]]
+
+_encoders: Dict[Tuple[type, bool], Encoder] = {}
+_lock = threading.RLock()
+
+
+def encoder_for(cls: type, convert_datetime: bool = True) -> Encoder:
+    key = (cls, convert_datetime)
+    try:
+        return _encoders[key]
+    except KeyError:
+        pass
+
+    with _lock:
+        if key not in _encoders:
+            _encoders[key] = _compile(cls, convert_datetime)
+
+        return _encoders[key]
+
+
+def encode_value(v: Any, convert_datetime: bool = True) -> Any:
+    '''Encode a value whose type is only known at run time'''
+    if dataclasses.is_dataclass(v) and not isinstance(v, type):
+        return encoder_for(type(v), convert_datetime)(v)
+    if isinstance(v, datetime):
+        return _datetime_to_str(v) if convert_datetime else v
+    if isinstance(v, HideValue):
+        return v.value
+    if isinstance(v, (list, tuple)):
+        return type(v)(encode_value(x, convert_datetime) for x in v)
+    if isinstance(v, dict):
+        return {k: encode_value(x, convert_datetime) for k, x in v.items()}
+
+    return v
+
+
+def _datetime_to_str(v):
+    if isinstance(v, datetime):
+        return v.astimezone(timezone.utc).isoformat()
+    return v
+
+
+def _hidden_value(v):
+    if isinstance(v, HideValue):
+        return v.value
+    return v
+
+
+def _converter(tp, convert_datetime: bool) -> Converter:
+    if tp is Any or isinstance(tp, TypeVar):
+        return None
+
+    if getattr(tp, '__origin__', None) is Union:
+        args = [a for a in tp.__args__ if a is not type(None)]
+        if len(args) != 1:
+            return _runtime_encoder(convert_datetime)
+        return _converter(args[0], convert_datetime)
+
+    origin = getattr(tp, '__origin__', None)
+    if origin is not None:
+        args = [a for a in getattr(tp, '__args__', ()) if not isinstance(a, TypeVar)]
+
+        if origin in (list, List):
+            conv = _converter(args[0], convert_datetime) if args else None
+            if conv is None:
+                return None
+
+            def list_of(v, conv=conv):
+                return [conv(x) for x in v]
+            return list_of
+
+        if origin in (dict, Dict):
+            conv = _converter(args[1], convert_datetime) if len(args) > 1 else None
+            if conv is None:
+                return None
+
+            def dict_of(v, conv=conv):
+                return {k: conv(x) for k, x in v.items()}
+            return dict_of
+
+        return _runtime_encoder(convert_datetime)
+
+    if isinstance(tp, type):
+        if dataclasses.is_dataclass(tp):
+            nested = encoder_for(tp, convert_datetime)
+
+            def dataclass_of(v, nested=nested, tp=tp):
+                # Fall back if a subclass or another model ended up in the field
+                if type(v) is tp:
+                    return nested(v)
+                return encode_value(v, convert_datetime)
+            return dataclass_of
+        if issubclass(tp, HideValue):
+            return _hidden_value
+        if issubclass(tp, Enum):
+            return None
+        if issubclass(tp, datetime):
+            return _datetime_to_str if convert_datetime else None
+        if tp in (str, int, float, bool):
+            return None
+
+    return _runtime_encoder(convert_datetime)
+
+
+def _runtime_encoder(convert_datetime: bool) -> Callable[[Any], Any]:
+    def encode(v):
+        return encode_value(v, convert_datetime)
+    return encode
+
+
+def _compile(cls: type, convert_datetime: bool) -> Encoder:
+    try:
+        hints = get_type_hints(cls)
+    except NameError:
+        hints = {}
+
+    namespace: Dict[str, Any] = {}
+    items = []
+
+    for idx, field in enumerate(dataclasses.fields(cls)):
+        tp = hints.get(field.name, Any)
+        conv = _converter(tp, convert_datetime) if field.name in hints else _runtime_encoder(convert_datetime)
+        name = repr(field.name)
+
+        if conv is None:
+            items.append(f"{name}: o.{field.name}")
+        else:
+            conv_name = f"c{idx}"
+            namespace[conv_name] = conv
+            items.append(f"{name}: None if o.{field.name} is None else {conv_name}(o.{field.name})")
+
+    source = "def encode(o):\n    return {" + ", ".join(items) + "}"
+    exec(source, namespace)
+
+    encode = namespace['encode']
+    encode.__qualname__ = f"encode_{cls.__name__}"
+
+    return encode
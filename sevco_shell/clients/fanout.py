@@ -0,0 +1,43 @@
+'''Run one read query in many orgs concurrently.
+
+Each query is given the org and builds its own clients targeted at it
+(X-Sevco-Target-Org). Results are yielded per org as soon as they arrive. At
+most `concurrency` orgs are queried at once, and an org whose query fails
+yields an OrgResult carrying the error rather than failing the whole run.
+'''
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, List, Optional
+
+from sevco_shell.clients.tenant.models import Organization
+
+Query = Callable[[Organization], Awaitable[List[Any]]]
+
+
+@dataclass
+class OrgResult:
+    org: Organization
+    items: List[Any] = field(default_factory=list)
+    error: Optional[Exception] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def fan_out(orgs: Iterable[Organization], query: Query, concurrency: int = 8) -> AsyncIterator[OrgResult]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(org: Organization) -> OrgResult:
+        async with semaphore:
+            start = time.monotonic()
+            try:
+                items = await query(org)
+                return OrgResult(org=org, items=items, elapsed=time.monotonic() - start)
+            except Exception as e:
+                return OrgResult(org=org, error=e, elapsed=time.monotonic() - start)
+
+    for next_result in asyncio.as_completed([run(org) for org in orgs]):
+        yield await next_result
@@ -1,13 +1,13 @@
 from enum import Enum
 from functools import partial
-import dacite
 
 from dataclasses import asdict 
 from datetime import datetime, timezone
-from dacite.exceptions import MissingValueError, UnexpectedDataError
 
-import dateutil.parser
-from typing import Any, Dict, List, Tuple, Type, TypeVar, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Type, TypeVar, Union
+
+if TYPE_CHECKING:
+    from dacite.exceptions import MissingValueError, UnexpectedDataError
 
 from enum import Enum
 
@@ -30,18 +30,20 @@ class ModelError(Exception):
 class MissingRequiredFieldsError(ModelError):
     def __init__(self, field):
         super().__init__(f"Missing required field: {field}")
+        self.field = field
 
     @classmethod
-    def from_dacite_error(cls, err: MissingValueError) -> 'MissingRequiredFieldsError':
+    def from_dacite_error(cls, err: 'MissingValueError') -> 'MissingRequiredFieldsError':
         return cls(err.field_path)
 
 
 class UnexpectedFieldError(ModelError):
     def __init__(self, field):
         super().__init__(f"Unexpected field: {field}")
+        self.field = field
 
     @classmethod
-    def from_dacite_error(cls, err: UnexpectedDataError) -> 'UnexpectedFieldError':
+    def from_dacite_error(cls, err: 'UnexpectedDataError') -> 'UnexpectedFieldError':
         return cls(err.keys)
 
 
@@ -58,6 +60,10 @@ def _custom_dict_factory(convert_datetime: bool, tuples: List[Tuple[Any, Any]])
     return result
 
 
+def dataclass_as_dict(obj: Any, convert_datetime: bool = True) -> Dict[str, Any]:
+    return asdict(obj, dict_factory=partial(_custom_dict_factory, convert_datetime))
+
+
 def dissolve_type(type_anno):
     if getattr(type_anno, '__origin__', None) is Union and type(None) in type_anno.__args__:
         # This is an Optional type
@@ -69,26 +75,62 @@ def dissolve_type(type_anno):
 def parse_datetime(d):
     if isinstance(d, datetime):
         return d
-    return dateutil.parser.isoparse(d)
+
+    # dateutil and dacite are imported on first use to keep svsh startup fast
+    from dateutil.parser import isoparse
+
+    return isoparse(d)
 
 
 T = TypeVar('T')
 
+
+def dacite_from_dict(cls: Type[T], obj: Dict[str, Any], convert_datetime: bool = True) -> T:
+    import dacite
+    from dacite.exceptions import MissingValueError, UnexpectedDataError
+
+    type_hooks = {}
+    if convert_datetime:
+        type_hooks[datetime] = parse_datetime
+
+    try:
+        return dacite.from_dict(data_class=cls, data=obj, config=dacite.config.Config(strict=False,  # type: ignore
+                                                                                      cast=[Enum],
+                                                                                      type_hooks=type_hooks))
+    except MissingValueError as e:
+        raise MissingRequiredFieldsError.from_dacite_error(e)
+    except UnexpectedDataError as e:
+        raise UnexpectedFieldError.from_dacite_error(e)
+
+
 class with_dict:
+    __slots__ = ()
+
+    @classmethod
+    def slotted(cls: Type[T]) -> Type[T]:
+        '''Memory compact __slots__ variant of this model'''
+        from sevco_shell.clients.slots import slotted
+
+        return slotted(cls)
+
     @classmethod
     def from_dict(cls: Type[T], obj: Dict[str, Any], convert_datetime: bool=True) -> T:
-        type_hooks = {}
-        if convert_datetime:
-            type_hooks[datetime] = parse_datetime
-
-        try:
-            return dacite.from_dict(data_class=cls, data=obj, config=dacite.config.Config(strict=False,  # type: ignore
-                                                                                          cast=[Enum],
-                                                                                          type_hooks=type_hooks))
-        except MissingValueError as e:
-            raise MissingRequiredFieldsError.from_dacite_error(e)
-        except UnexpectedDataError as e:
-            raise UnexpectedFieldError.from_dacite_error(e)
+        from sevco_shell.clients.decoder import decoder_for
+
+        return decoder_for(cls, convert_datetime)(obj)
+
+    @classmethod
+    def from_json(cls: Type[T], data: Union[bytes, str], convert_datetime: bool=True) -> T:
+        from sevco_shell.clients.codec import loads
+
+        return cls.from_dict(loads(data), convert_datetime)  # type: ignore
 
     def as_dict(self, convert_datetime=True) -> Dict[str, Any]:
-        return asdict(self, dict_factory=partial(_custom_dict_factory, convert_datetime))
\ No newline at end of file
+        from sevco_shell.clients.encoder import encoder_for
+
+        return encoder_for(type(self), convert_datetime)(self)
+
+    def to_json(self) -> bytes:
+        from sevco_shell.clients.codec import dumps
+
+        return dumps(self.as_dict())
@@ -0,0 +1,104 @@
+'''Streamed multipart/form-data bodies for file uploads.
+
+requests builds multipart bodies from `files=` entirely in memory. A
+MultipartFile instead reads the file part lazily, optionally through mmap, and
+knows its total length up front so the request is sent with a Content-Length
+rather than chunked.
+'''
+import mmap
+import os
+import uuid
+from typing import List, Optional, Tuple
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class MultipartFile:
+    def __init__(self, field: str, path: str, fields: Optional[List[Tuple[str, bytes, str]]] = None,
+                 filename: Optional[str] = None, content_type: str = "application/octet-stream",
+                 use_mmap: bool = False):
+        '''Body with the (name, value, content type) fields followed by the file at path'''
+        self.boundary = uuid.uuid4().hex
+        self.path = path
+        self.use_mmap = use_mmap
+
+        head = b"".join(self._part_header(name, value_type) + value + b"\r\n"
+                        for name, value, value_type in fields or [])
+        head += self._part_header(field, content_type, filename or os.path.basename(path))
+        tail = f"\r\n--{self.boundary}--\r\n".encode('utf-8')
+
+        self._file_size = os.path.getsize(path)
+        self._parts = [head, None, tail]
+        self._length = len(head) + self._file_size + len(tail)
+        self._part = 0
+        self._offset = 0
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return self._length
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self._length
+
+        chunks = []
+        while size > 0 and self._part < len(self._parts):
+            chunk = self._read_part(size)
+            if not chunk:
+                self._part += 1
+                self._offset = 0
+                continue
+
+            chunks.append(chunk)
+            size -= len(chunk)
+
+        return b"".join(chunks)
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> 'MultipartFile':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _read_part(self, size: int) -> bytes:
+        part = self._parts[self._part]
+        if part is not None:
+            chunk = part[self._offset:self._offset + size]
+        else:
+            chunk = self._read_file(min(size, CHUNK_SIZE))
+
+        self._offset += len(chunk)
+        return chunk
+
+    def _read_file(self, size: int) -> bytes:
+        if self._file is None:
+            self._file = open(self.path, "rb")
+            if self.use_mmap and self._file_size:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._map is not None:
+            return self._map[self._offset:self._offset + size]
+
+        return self._file.read(size)
+
+    def _part_header(self, name: str, content_type: str, filename: Optional[str] = None) -> bytes:
+        disposition = f'form-data; name="{name}"'
+        if filename is not None:
+            disposition += f'; filename="{filename}"'
+
+        return (f"--{self.boundary}\r\n"
+                f"Content-Disposition: {disposition}\r\n"
+                f"Content-Type: {content_type}\r\n\r\n").encode('utf-8')
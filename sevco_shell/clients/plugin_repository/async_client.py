@@ -0,0 +1,31 @@
+from typing import List, Optional
+
+from sevco_shell.clients.async_client import AsyncSevcoClient
+from sevco_shell.clients.plugin_repository.client import PluginClient
+from sevco_shell.clients.plugin_repository.models import Plugin, PluginInput
+
+
+class AsyncPluginClient(AsyncSevcoClient):
+    client_class = PluginClient
+    client: PluginClient
+
+    async def create(self, plugin_input: PluginInput) -> Plugin:
+        return await self._run(self.client.create, plugin_input)
+
+    async def list(self, source_id: Optional[str] = None, default_only: bool = False, os: Optional[str] = None) -> List[Plugin]:
+        return await self._run(self.client.list, source_id=source_id, default_only=default_only, os=os)
+
+    async def get(self, plugin_id: str) -> Plugin:
+        return await self._run(self.client.get, plugin_id)
+
+    async def update(self, plugin_id: str, plugin_input: PluginInput) -> Plugin:
+        return await self._run(self.client.update, plugin_id, plugin_input)
+
+    async def delete(self, plugin_id: str) -> None:
+        await self._run(self.client.delete, plugin_id)
+
+    async def set_default(self, plugin_id: str) -> None:
+        await self._run(self.client.set_default, plugin_id)
+
+    async def download(self, plugin_id: str) -> str:
+        return await self._run(self.client.download, plugin_id)
@@ -1,7 +1,8 @@
-import json
 from typing import List, Optional
 
+from sevco_shell.clients import codec
 from sevco_shell.clients.client import SevcoClient
+from sevco_shell.clients.multipart import MultipartFile
 from sevco_shell.clients.plugin_repository.models import Plugin, PluginInput
 
 PLUGIN_URL_ROOT = "/v1/integration/source/plugin"
@@ -14,11 +15,23 @@ class PluginClient(SevcoClient):
 
         resp = self.api_post(
             PLUGIN_URL_ROOT,
-            data=json.dumps(plugin_input.as_dict()),
+            data=plugin_input.to_json(),
             files=plugin_input.binary
         )
 
-        return Plugin.from_dict(json.loads(resp.text))
+        return Plugin.from_dict(codec.loads(resp.content))
+
+    def upload(self, plugin_input: PluginInput, path: str, use_mmap: bool = False) -> Plugin:
+        '''Create a plugin, streaming its binary from path rather than buffering it'''
+        fields = [("data", plugin_input.to_json(), "application/json")]
+        with MultipartFile("binary", path, fields=fields, use_mmap=use_mmap) as body:
+            resp = self.api_post(
+                PLUGIN_URL_ROOT,
+                headers={"Content-Type": body.content_type},
+                data=body
+            )
+
+        return Plugin.from_dict(codec.loads(resp.content))
 
     def list(self, source_id: Optional[str]=None, default_only: bool=False, os: Optional[str]=None) -> List[Plugin]:
         query_params = {}
@@ -34,22 +47,22 @@ class PluginClient(SevcoClient):
             params=query_params
         )
 
-        return [Plugin.from_dict(d) for d in json.loads(resp.text)]
+        return [Plugin.from_dict(d) for d in codec.loads(resp.content)]
 
     def get(self, plugin_id: str) -> Plugin:
         resp = self.api_get(
             f"{PLUGIN_URL_ROOT}/{plugin_id}"
         )
 
-        return Plugin.from_dict(json.loads(resp.text))
+        return Plugin.from_dict(codec.loads(resp.content))
 
     def update(self, plugin_id: str, plugin_input: PluginInput) -> Plugin:
         resp = self.api_put(
             f"{PLUGIN_URL_ROOT}/{plugin_id}",
-            data=json.dumps(plugin_input.as_dict())
+            data=plugin_input.to_json()
         )
 
-        return Plugin.from_dict(json.loads(resp.text))
+        return Plugin.from_dict(codec.loads(resp.content))
 
     def delete(self, plugin_id: str) -> None:
         resp = self.api_delete(
@@ -61,9 +74,13 @@ class PluginClient(SevcoClient):
             f"{PLUGIN_URL_ROOT}/{plugin_id}/default"
         )
 
+        # The plugin list shows which plugin is the default
+        if self.cache is not None:
+            self.cache.invalidate(PLUGIN_URL_ROOT, parent=False)
+
     def download(self, plugin_id: str) -> str:
         resp = self.api_get(
             f"{PLUGIN_URL_ROOT}/{plugin_id}/download"
         )
 
-        return resp.json()['url']
\ No newline at end of file
+        return codec.loads(resp.content)['url']
\ No newline at end of file
@@ -0,0 +1,72 @@
+'''Upload per-OS plugin builds from local files.
+
+Each build is hashed locally first and compared against the signature of the
+source's existing plugins for that OS, so an unchanged build is not uploaded
+again. The remaining builds are uploaded concurrently, each streamed from disk.
+'''
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional
+
+from sevco_shell.clients.artifacts import file_sha256
+from sevco_shell.clients.cache import bypass
+from sevco_shell.clients.models import OperatingSystem
+from sevco_shell.clients.plugin_repository.client import PluginClient
+from sevco_shell.clients.plugin_repository.models import Plugin, PluginInput
+
+LOG = logging.getLogger(__name__)
+
+
+@dataclass
+class UploadResult:
+    os: OperatingSystem
+    path: str
+    sha256: str = ""
+    plugin: Optional[Plugin] = None
+    skipped: bool = False
+    error: Optional[Exception] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def same_signature(plugin: Plugin, sha256: str) -> bool:
+    signature = (plugin.signature or "").lower()
+    return signature.split(":", 1)[-1] == sha256
+
+
+def upload_builds(client: PluginClient,
+                  plugin_input: PluginInput,
+                  builds: Dict[OperatingSystem, str],
+                  workers: int = 3,
+                  use_mmap: bool = False) -> List[UploadResult]:
+    '''Upload each OS build in builds, using plugin_input for everything but the OS'''
+    # Past the response cache, a build uploaded since it was filled must not be uploaded again
+    with bypass():
+        existing = client.list(source_id=plugin_input.source_id)
+
+    def upload(os: OperatingSystem, path: str) -> UploadResult:
+        result = UploadResult(os=os, path=path)
+        start = time.monotonic()
+        try:
+            result.sha256 = file_sha256(path)
+            unchanged = [p for p in existing if p.os == os and same_signature(p, result.sha256)]
+            if unchanged:
+                result.plugin = unchanged[0]
+                result.skipped = True
+            else:
+                result.plugin = client.upload(replace(plugin_input, os=os), path, use_mmap=use_mmap)
+        except Exception as e:
+            LOG.debug("upload of %s failed: %s", path, e)
+            result.error = e
+        result.elapsed = time.monotonic() - start
+
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(builds))),
+                            thread_name_prefix="svsh-upload") as executor:
+        return list(executor.map(lambda build: upload(*build), builds.items()))
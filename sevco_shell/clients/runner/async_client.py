@@ -0,0 +1,48 @@
+import time
+from typing import List, Optional, Tuple
+
+from sevco_shell.clients.async_client import AsyncSevcoClient
+from sevco_shell.clients.runner.client import RunnerServiceClient
+from sevco_shell.clients.runner.models import (Runner, RunnerConfig,
+                                               SchedulingWrapper)
+
+
+class AsyncRunnerServiceClient(AsyncSevcoClient):
+    client_class = RunnerServiceClient
+    client: RunnerServiceClient
+
+    async def get(self, runner_id: str) -> Runner:
+        return await self._run(self.client.get, runner_id)
+
+    async def list(self) -> List[Runner]:
+        return await self._run(self.client.list)
+
+    async def add(self, runner: Runner) -> Runner:
+        return await self._run(self.client.add, runner)
+
+    async def delete(self, runner_id: str) -> None:
+        await self._run(self.client.delete, runner_id)
+
+    async def update(self, runner: Runner) -> Runner:
+        return await self._run(self.client.update, runner)
+
+    async def execute(self, wrapper: SchedulingWrapper) -> SchedulingWrapper:
+        return await self._run(self.client.execute, wrapper)
+
+    async def ping(self, runner_id: str, timeout: Optional[float] = None) -> Runner:
+        return await self._run(self.client.ping, runner_id, timeout=timeout)
+
+    async def timed_ping(self, runner_id: str, timeout: Optional[float] = None) -> Tuple[Runner, float]:
+        '''ping, also returning the round trip time of the request itself, excluding time spent queued'''
+        def ping() -> Tuple[Runner, float]:
+            start = time.monotonic()
+            runner = self.client.ping(runner_id, timeout=timeout)
+            return runner, time.monotonic() - start
+
+        return await self._run(ping)
+
+    async def get_config(self, runner_id: str) -> RunnerConfig:
+        return await self._run(self.client.get_config, runner_id)
+
+    async def download(self, runner_os: str) -> bytes:
+        return await self._run(self.client.download, runner_os)
@@ -1,52 +1,198 @@
-import json
-from typing import List
+import hashlib
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
 
+import requests
+
+from sevco_shell.clients import codec
 from sevco_shell.clients.client import SevcoClient
 from sevco_shell.clients.runner.models import (Runner, RunnerConfig,
                                                SchedulingWrapper)
 
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# (bytes written so far including any resumed part, total size if known),
+# called once before any new bytes arrive with the resumed size
+Progress = Callable[[int, Optional[int]], None]
+
+
+@dataclass
+class DownloadResult:
+    path: str
+    size: int
+    sha256: str
+    resumed_from: int
+    elapsed: float
+
+    @property
+    def rate(self) -> float:
+        '''Bytes per second transferred in this run'''
+        return (self.size - self.resumed_from) / self.elapsed if self.elapsed else 0.0
+
 
 class RunnerServiceClient(SevcoClient):
     def get(self, runner_id: str) -> Runner:
         resp = self.api_get(f"/v1/runner/{runner_id}")
-        return Runner.from_dict(json.loads(resp.text))
+        return Runner.from_dict(codec.loads(resp.content))
 
     def list(self) -> List[Runner]:
         resp = self.api_get("/v1/runner")
 
-        return [Runner.from_dict(d) for d in json.loads(resp.text)]
+        return [Runner.from_dict(d) for d in codec.loads(resp.content)]
 
     def add(self, runner: Runner) -> Runner:
-        resp = self.api_post("/v1/runner", data=json.dumps(runner.as_dict()))
+        resp = self.api_post("/v1/runner", data=runner.to_json())
 
-        return Runner.from_dict(json.loads(resp.text))
+        return Runner.from_dict(codec.loads(resp.content))
 
     def delete(self, runner_id: str) -> None:
         self.api_delete(f"/v1/runner/{runner_id}")
 
     def update(self, runner: Runner) -> Runner:
         resp = self.api_put(
-            f"/v1/runner/{runner.runner_id}", data=json.dumps(runner.as_dict()))
+            f"/v1/runner/{runner.runner_id}", data=runner.to_json())
 
-        return Runner.from_dict(json.loads(resp.text))
+        return Runner.from_dict(codec.loads(resp.content))
 
     def execute(self, wrapper: SchedulingWrapper) -> SchedulingWrapper:
         resp = self.api_post(f"/v1/runner/execute",
-                             data=json.dumps(wrapper.as_dict()))
+                             data=wrapper.to_json())
 
-        return SchedulingWrapper.from_dict(json.loads(resp.text))
+        return SchedulingWrapper.from_dict(codec.loads(resp.content))
 
-    def ping(self, runner_id: str) -> Runner:
-        resp = self.api_post(f"/v1/runner/{runner_id}/ping")
+    def ping(self, runner_id: str, timeout: Optional[float] = None) -> Runner:
+        resp = self.api_post(f"/v1/runner/{runner_id}/ping", timeout=timeout)
 
-        return Runner.from_dict(json.loads(resp.text))
+        return Runner.from_dict(codec.loads(resp.content))
 
     def get_config(self, runner_id: str) -> RunnerConfig:
         resp = self.api_get(f"/v1/runner/{runner_id}/config")
 
-        return RunnerConfig.from_dict(json.loads(resp.text))
+        return RunnerConfig.from_dict(codec.loads(resp.content))
 
     def download(self, runner_os: str) -> bytes:
         resp = self.api_get(f"/v1/runner/download?os={runner_os}")
 
         return resp.content
+
+    def download_to(self, runner_os: str, target: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+                    progress: Optional[Progress] = None) -> DownloadResult:
+        '''Stream the runner binary to target.
+
+        Data goes to target.part first, which is renamed over target once
+        complete. The ETag or Last-Modified of the response is kept in
+        target.part.validator, and if a previous download left a .part file
+        behind it is resumed with a Range request conditional on that validator
+        (If-Range). A .part file without a validator, or one the server answers
+        with the full binary, is discarded so a newer build is never spliced
+        onto an older one. The sha256 covers the whole file, resumed bytes
+        included.
+        '''
+        part = f"{target}.part"
+        validator_path = f"{part}.validator"
+        digest = hashlib.sha256()
+        offset = 0
+
+        validator = _read_validator(validator_path)
+        if os.path.exists(part) and validator is None:
+            os.remove(part)
+
+        if os.path.exists(part):
+            with open(part, "rb") as f:
+                for chunk in iter(lambda: f.read(chunk_size), b""):
+                    digest.update(chunk)
+                    offset += len(chunk)
+
+        start = time.monotonic()
+        # identity keeps Range offsets and Content-Length in terms of file bytes
+        headers = {"Accept": "application/octet-stream", "Accept-Encoding": "identity"}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator
+
+        try:
+            resp = self.api_get("/v1/runner/download", params={"os": runner_os}, headers=headers, stream=True)
+        except requests.exceptions.HTTPError as e:
+            if offset and e.response is not None and e.response.status_code == 416:
+                # The partial file no longer matches what the server has, start over
+                _discard(part, validator_path)
+                return self.download_to(runner_os, target, chunk_size, progress)
+            raise
+
+        with resp:
+            resumed_from = offset
+            if offset and (resp.status_code != 206 or _validator(resp) not in (None, validator)
+                           or not resp.headers.get("Content-Range", "").startswith(f"bytes {offset}-")):
+                # Range ignored or the binary changed, the full binary is coming back
+                if resp.status_code == 206:
+                    resp.close()
+                    _discard(part, validator_path)
+                    return self.download_to(runner_os, target, chunk_size, progress)
+                digest = hashlib.sha256()
+                offset = resumed_from = 0
+
+            if not offset:
+                _write_validator(validator_path, _validator(resp))
+
+            length = resp.headers.get("Content-Length")
+            total = offset + int(length) if length is not None else None
+
+            if progress:
+                progress(offset, total)
+
+            with open(part, "ab" if offset else "wb") as f:
+                for chunk in resp.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+                    digest.update(chunk)
+                    offset += len(chunk)
+                    if progress:
+                        progress(offset, total)
+
+                f.flush()
+                os.fsync(f.fileno())
+
+        if total is not None and offset != total:
+            raise IOError(f"Download incomplete: received {offset} of {total} bytes, run again to resume")
+
+        os.replace(part, target)
+        _discard(validator_path)
+
+        return DownloadResult(path=target, size=offset, sha256=digest.hexdigest(),
+                              resumed_from=resumed_from, elapsed=time.monotonic() - start)
+
+
+def _validator(resp: requests.Response) -> Optional[str]:
+    '''The response's strong ETag, or its Last-Modified date, usable in If-Range'''
+    etag = resp.headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+
+    return resp.headers.get("Last-Modified")
+
+
+def _read_validator(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _write_validator(path: str, validator: Optional[str]) -> None:
+    if validator is None:
+        # Without one the .part file can't be safely resumed
+        _discard(path)
+        return
+
+    with open(path, "w") as f:
+        f.write(validator)
+
+
+def _discard(*paths: str) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,92 @@
+'''Concurrent runner health probe.
+
+Every runner is pinged in parallel with a per-call timeout. The round trip
+latency of each ping is recorded, and runners that did not answer or whose
+last check-in is older than stale_after are reported.
+'''
+import asyncio
+import datetime
+import math
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+from sevco_shell.clients.runner.async_client import AsyncRunnerServiceClient
+from sevco_shell.clients.runner.models import Runner
+
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_STALE_AFTER = datetime.timedelta(minutes=10)
+
+
+@dataclass
+class RunnerProbe:
+    runner: Runner
+    org_name: Optional[str] = None
+    latency: Optional[float] = None
+    error: Optional[str] = None
+    stale: bool = False
+
+    @property
+    def reachable(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class HealthReport:
+    probes: List[RunnerProbe] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def latencies(self) -> List[float]:
+        return sorted(p.latency for p in self.probes if p.latency is not None)
+
+    @property
+    def unreachable(self) -> List[RunnerProbe]:
+        return [p for p in self.probes if not p.reachable]
+
+    @property
+    def stale(self) -> List[RunnerProbe]:
+        return [p for p in self.probes if p.stale]
+
+    def percentile(self, p: float) -> Optional[float]:
+        return percentile(self.latencies, p)
+
+
+def percentile(values: Sequence[float], p: float) -> Optional[float]:
+    '''Nearest rank percentile of already sorted values'''
+    if not values:
+        return None
+
+    rank = max(1, math.ceil(p / 100 * len(values)))
+    return values[rank - 1]
+
+
+def is_stale(runner: Runner, stale_after: datetime.timedelta, now: Optional[datetime.datetime] = None) -> bool:
+    if runner.last_checkin_time is None:
+        return True
+
+    last = runner.last_checkin_time
+    if last.tzinfo is None:
+        last = last.replace(tzinfo=datetime.timezone.utc)
+
+    return (now or datetime.datetime.now(datetime.timezone.utc)) - last > stale_after
+
+
+async def probe_runners(client: AsyncRunnerServiceClient,
+                        runners: Optional[List[Runner]] = None,
+                        timeout: float = DEFAULT_TIMEOUT,
+                        stale_after: datetime.timedelta = DEFAULT_STALE_AFTER,
+                        org_name: Optional[str] = None) -> List[RunnerProbe]:
+    '''Ping every runner (all of the client's org when runners is None) concurrently'''
+    if runners is None:
+        runners = await client.list()
+
+    async def probe(runner: Runner) -> RunnerProbe:
+        result = RunnerProbe(runner=runner, org_name=org_name, stale=is_stale(runner, stale_after))
+        try:
+            _, result.latency = await client.timed_ping(runner.runner_id, timeout=timeout)
+        except Exception as e:
+            result.error = str(e) or type(e).__name__
+
+        return result
+
+    return list(await asyncio.gather(*[probe(r) for r in runners]))
@@ -0,0 +1,24 @@
+from sevco_shell.clients.async_client import AsyncSevcoClient
+from sevco_shell.clients.runner.models import SchedulingWrapper
+from sevco_shell.clients.scheduler.client import SchedulerServiceClient
+from sevco_shell.clients.scheduler.models import DataSourceSchedule
+
+
+class AsyncSchedulerServiceClient(AsyncSevcoClient):
+    client_class = SchedulerServiceClient
+    client: SchedulerServiceClient
+
+    async def get(self, source_id: str) -> DataSourceSchedule:
+        return await self._run(self.client.get, source_id)
+
+    async def add(self, schedule: DataSourceSchedule) -> DataSourceSchedule:
+        return await self._run(self.client.add, schedule)
+
+    async def delete(self, source_id: str) -> None:
+        await self._run(self.client.delete, source_id)
+
+    async def update(self, schedule: DataSourceSchedule) -> DataSourceSchedule:
+        return await self._run(self.client.update, schedule)
+
+    async def execute(self, source_config_id: str) -> SchedulingWrapper:
+        return await self._run(self.client.execute, source_config_id)
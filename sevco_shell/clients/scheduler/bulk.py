@@ -0,0 +1,137 @@
+'''Bounded concurrency bulk execution of source configs.
+
+Configs are submitted through SchedulerServiceClient.execute by a fixed size
+worker pool. Submissions can be staggered so that item i is not sent before
+i * stagger seconds have passed, spreading executions out over time rather
+than queueing them all at once.
+'''
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional, Set
+
+from sevco_shell.clients.runner.models import SchedulingWrapper
+from sevco_shell.clients.scheduler.client import SchedulerServiceClient
+from sevco_shell.clients.source_audit.client import SourceAuditClient
+from sevco_shell.clients.source_config.model import SourceConfig
+
+LOG = logging.getLogger(__name__)
+
+
+@dataclass
+class BulkResult:
+    config: SourceConfig
+    wrapper: Optional[SchedulingWrapper] = None
+    error: Optional[Exception] = None
+    submitted: float = 0.0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BulkReport:
+    results: List[BulkResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for r in self.results if r.ok)
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.succeeded
+
+    @property
+    def throughput(self) -> float:
+        return len(self.results) / self.elapsed if self.elapsed else 0.0
+
+
+class BulkExecutor:
+    def __init__(self, client: SchedulerServiceClient, workers: int = 4, stagger: float = 0.0):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
+        self.client = client
+        self.workers = workers
+        self.stagger = stagger
+
+    def run(self, configs: List[SourceConfig],
+            on_result: Optional[Callable[[BulkResult], None]] = None) -> BulkReport:
+        '''Execute every config, calling on_result as each one finishes'''
+        report = BulkReport()
+        start = time.monotonic()
+
+        def submit(i: int, config: SourceConfig) -> BulkResult:
+            delay = start + i * self.stagger - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            result = BulkResult(config=config, submitted=time.monotonic() - start)
+            t = time.monotonic()
+            try:
+                assert config.id
+                result.wrapper = self.client.execute(source_config_id=config.id)
+            except Exception as e:
+                LOG.debug("execute %s failed: %s", config.id, e)
+                result.error = e
+            result.elapsed = time.monotonic() - t
+
+            return result
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="svsh-bulkexec") as executor:
+            futures = [executor.submit(submit, i, config) for i, config in enumerate(configs)]
+            for future in as_completed(futures):
+                result = future.result()
+                report.results.append(result)
+                if on_result:
+                    on_result(result)
+
+        report.elapsed = time.monotonic() - start
+
+        return report
+
+
+def parse_indexes(spec: str, count: int) -> List[int]:
+    '''1 based index ranges such as "1-10,15,20-" to 0 based indexes, in order'''
+    indexes: List[int] = []
+    seen: Set[int] = set()
+
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+
+        try:
+            if '-' in part:
+                lo, _, hi = part.partition('-')
+                first, last = int(lo) if lo else 1, int(hi) if hi else count
+            else:
+                first = last = int(part)
+        except ValueError:
+            raise ValueError(f"Invalid index range: {part}")
+
+        if first < 1 or last > count or first > last:
+            raise IndexError(f"Index range {part} must be between 1 and {count}")
+
+        for i in range(first - 1, last):
+            if i not in seen:
+                seen.add(i)
+                indexes.append(i)
+
+    return indexes
+
+
+def last_failed(client: SourceAuditClient, configs: Iterable[SourceConfig], workers: int = 4) -> Set[str]:
+    '''Ids of the configs whose most recent execution exited non-zero'''
+    def failed(config: SourceConfig) -> bool:
+        for execution in client.iter_list("execution", source_config_id=config.id, limit=1, prefetch=False):
+            return execution.execution.exit_code != 0
+        return False
+
+    configs = list(configs)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return {c.id for c, f in zip(configs, executor.map(failed, configs)) if f and c.id}
@@ -1,5 +1,5 @@
-import json
 
+from sevco_shell.clients import codec
 from sevco_shell.clients.client import SevcoClient
 from sevco_shell.clients.runner.models import SchedulingWrapper
 from sevco_shell.clients.scheduler.models import DataSourceSchedule
@@ -8,28 +8,28 @@ from sevco_shell.clients.scheduler.models import DataSourceSchedule
 class SchedulerServiceClient(SevcoClient):
     def get(self, source_id: str) -> DataSourceSchedule:
         resp = self.api_get(self._get_path(source_id))
-        return DataSourceSchedule.from_dict(json.loads(resp.text))
+        return DataSourceSchedule.from_dict(codec.loads(resp.content))
 
     def add(self, schedule: DataSourceSchedule) -> DataSourceSchedule:
         resp = self.api_post(self._get_path(schedule.source_id),
-                             data=json.dumps(schedule.as_dict()))
+                             data=schedule.to_json())
 
-        return DataSourceSchedule.from_dict(json.loads(resp.text))
+        return DataSourceSchedule.from_dict(codec.loads(resp.content))
 
     def delete(self, source_id: str) -> None:
         self.api_delete(self._get_path(source_id))
 
     def update(self, schedule: DataSourceSchedule) -> DataSourceSchedule:
         resp = self.api_put(self._get_path(schedule.source_id),
-                            data=json.dumps(schedule.as_dict()))
+                            data=schedule.to_json())
 
-        return DataSourceSchedule.from_dict(json.loads(resp.text))
+        return DataSourceSchedule.from_dict(codec.loads(resp.content))
 
     def execute(self, source_config_id: str) -> SchedulingWrapper:
         resp = self.api_post(
             f"/v1/integration/source/config/{source_config_id}/execution")
 
-        return SchedulingWrapper.from_dict(json.loads(resp.text))
+        return SchedulingWrapper.from_dict(codec.loads(resp.content))
 
     @staticmethod
     def _get_path(source_id):
@@ -0,0 +1,34 @@
+from typing import Any, Dict, List
+
+from sevco_shell.clients.async_client import AsyncSevcoClient
+from sevco_shell.clients.schema.client import SchemaClient, SourceSchemaClient
+from sevco_shell.clients.schema.models import (SourceSchemaByNameArray,
+                                               SourceSchemas)
+
+
+class AsyncSchemaClient(AsyncSevcoClient):
+    client_class = SchemaClient
+    client: SchemaClient
+
+    async def list(self, category: str) -> List[Dict[str, Any]]:
+        return await self._run(self.client.list, category)
+
+    async def get(self, category: str, schema_type: str) -> Dict[str, Any]:
+        return await self._run(self.client.get, category, schema_type)
+
+
+class AsyncSourceSchemaClient(AsyncSevcoClient):
+    client_class = SourceSchemaClient
+    client: SourceSchemaClient
+
+    async def get(self, source_id: str) -> List[SourceSchemas]:
+        return await self._run(self.client.get, source_id)
+
+    async def delete(self, source_id: str) -> None:
+        await self._run(self.client.delete, source_id)
+
+    async def add(self, source_id: str, source_schemas: SourceSchemaByNameArray) -> SourceSchemaByNameArray:
+        return await self._run(self.client.add, source_id, source_schemas)
+
+    async def update(self, source_id: str, source_schemas: SourceSchemaByNameArray) -> SourceSchemaByNameArray:
+        return await self._run(self.client.update, source_id, source_schemas)
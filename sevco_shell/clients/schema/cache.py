@@ -0,0 +1,163 @@
+'''Disk backed cache of decoded schemas.
+
+The auth, connect and settings schema lists and each source's schemas are kept
+in ~/.sevco/schemas/<profile>.json, keyed by API host and target org, so that
+configuring a source after the first time makes no schema requests at all.
+Entries expire after SVSH_SCHEMA_TTL seconds, and SourceSchemaClient drops a
+source's entry whenever it adds, updates or deletes its schemas. The file
+carries a format version and is discarded when it does not match.
+'''
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from sevco_shell.clients.schema.models import SourceSchemas
+
+LOG = logging.getLogger(__name__)
+
+SCHEMA_CACHE_VERSION = 1
+DEFAULT_TTL = 24 * 60 * 60
+CATEGORIES = ["auth", "connect", "settings"]
+
+
+class SchemaCache:
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'SchemaCache':
+        profile = os.environ.get("SEVCO_PROFILE", "default")
+        ttl = float(os.environ.get("SVSH_SCHEMA_TTL", DEFAULT_TTL))
+        return cls(f"{Path.home()}/.sevco/schemas/{profile}.json", ttl=ttl)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._load().get(key)
+        if entry is None or time.time() - entry['stored'] > self.ttl:
+            return None
+
+        return entry['data']
+
+    def put(self, key: str, data: Any) -> None:
+        self._update(lambda entries: entries.__setitem__(key, {'stored': time.time(), 'data': data}))
+
+    def invalidate(self, key: str) -> None:
+        self._update(lambda entries: entries.pop(key, None))
+
+    def clear(self) -> int:
+        count = len(self._load())
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+        return count
+
+    def entries(self) -> int:
+        return len(self._load())
+
+    def _update(self, change) -> None:
+        # Re-read before writing so entries stored by other svsh processes are kept
+        with self._lock:
+            entries = self._load()
+            change(entries)
+            self._write(entries)
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'rb') as f:
+                cached = json.loads(f.read())
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(cached, dict) or cached.get('version') != SCHEMA_CACHE_VERSION:
+            return {}
+
+        return cached.get('entries', {})
+
+    def _write(self, entries: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'version': SCHEMA_CACHE_VERSION, 'entries': entries}, f)
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+
+_schema_cache: Optional[SchemaCache] = None
+
+
+def schema_cache() -> Optional[SchemaCache]:
+    return _schema_cache
+
+
+def set_schema_cache(cache: Optional[SchemaCache]) -> None:
+    global _schema_cache
+    _schema_cache = cache
+
+
+def _key(client, kind: str, name: str) -> str:
+    return f"{client.api_host} {client.target_org or ''} {kind} {name}"
+
+
+def load_categories(client, categories: List[str] = CATEGORIES) -> Dict[str, List[Dict[str, Any]]]:
+    '''Schemas of each category, fetching the ones not cached concurrently'''
+    from sevco_shell.clients.cache import bypassed
+
+    cache = schema_cache()
+    loaded: Dict[str, List[Dict[str, Any]]] = {}
+    if cache is not None and not bypassed():
+        for category in categories:
+            schemas = cache.get(_key(client, "category", category))
+            if schemas is not None:
+                loaded[category] = schemas
+
+    from sevco_shell.clients.async_client import request_executor
+
+    missing = [c for c in categories if c not in loaded]
+    futures = {c: request_executor().submit(client.list, c) for c in missing}
+    for category, future in futures.items():
+        loaded[category] = future.result()
+        if cache is not None:
+            cache.put(_key(client, "category", category), loaded[category])
+
+    LOG.debug("schema categories: %d cached, %d fetched", len(categories) - len(missing), len(missing))
+
+    return {c: loaded[c] for c in categories}
+
+
+def load_source_schemas(client, source_id: str) -> List['SourceSchemas']:
+    from sevco_shell.clients.cache import bypassed
+    from sevco_shell.clients.schema.models import SourceSchemas
+
+    cache = schema_cache()
+    if cache is None:
+        return client.get(source_id)
+
+    key = _key(client, "source", source_id)
+    cached = None if bypassed() else cache.get(key)
+    if cached is not None:
+        return [SourceSchemas.from_dict(d) for d in cached]
+
+    schemas = client.get(source_id)
+    cache.put(key, [s.as_dict() for s in schemas])
+
+    return schemas
+
+
+def invalidate_source_schemas(client, source_id: str) -> None:
+    cache = schema_cache()
+    if cache is not None:
+        cache.invalidate(_key(client, "source", source_id))
@@ -1,7 +1,8 @@
-import json
 from typing import Any, Dict, List
 
+from sevco_shell.clients import codec
 from sevco_shell.clients.client import SevcoClient
+from sevco_shell.clients.schema.cache import invalidate_source_schemas
 from sevco_shell.clients.schema.models import (SourceSchemaByNameArray,
                                                SourceSchemas)
 
@@ -10,31 +11,34 @@ class SchemaClient(SevcoClient):
     def list(self, category: str) -> List[Dict[str, Any]]:
         resp = self.api_get(f"/v1/schema/{category}")
 
-        return json.loads(resp.text)  # type: ignore
+        return codec.loads(resp.content)  # type: ignore
 
     def get(self, category: str, schema_type: str) -> Dict[str, Any]:
         resp = self.api_get("/v1/schema/{category}/{schema_type}")
 
-        return json.loads(resp.text)
+        return codec.loads(resp.content)
 
 
 class SourceSchemaClient(SevcoClient):
     def get(self, source_id: str) -> List[SourceSchemas]:
         resp = self.api_get(f"/v1/integration/source/{source_id}/schema")
 
-        return [SourceSchemas.from_dict(d) for d in json.loads(resp.text)]
+        return [SourceSchemas.from_dict(d) for d in codec.loads(resp.content)]
 
     def delete(self, source_id: str) -> None:
         self.api_delete(f"/v1/integration/source/{source_id}/schema")
+        invalidate_source_schemas(self, source_id)
 
     def add(self, source_id: str, source_schemas: SourceSchemaByNameArray) -> SourceSchemaByNameArray:
         resp = self.api_post(f"/v1/integration/source/{source_id}/schema",
-                             data=json.dumps(source_schemas.as_dict()))
+                             data=source_schemas.to_json())
+        invalidate_source_schemas(self, source_id)
 
-        return SourceSchemaByNameArray.from_dict(json.loads(resp.text))
+        return SourceSchemaByNameArray.from_dict(codec.loads(resp.content))
 
     def update(self, source_id: str, source_schemas: SourceSchemaByNameArray) -> SourceSchemaByNameArray:
         resp = self.api_put(f"/v1/integration/source/{source_id}/schema",
-                            data=json.dumps(source_schemas.as_dict()))
+                            data=source_schemas.to_json())
+        invalidate_source_schemas(self, source_id)
 
-        return SourceSchemaByNameArray.from_dict(json.loads(resp.text))
+        return SourceSchemaByNameArray.from_dict(codec.loads(resp.content))
@@ -0,0 +1,136 @@
+import os
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    val = os.environ.get(name)
+    if val is None:
+        return default
+    return val.lower() in ['1', 'true', 'yes', 'y']
+
+
+@dataclass
+class PoolConfig:
+    # Number of per-host connection pools to keep around
+    pool_connections: int = 10
+    # Maximum number of idle connections kept open per host
+    pool_maxsize: int = 10
+    # Block when all connections to a host are busy instead of opening extra ones
+    pool_block: bool = False
+    keep_alive: bool = True
+
+    @classmethod
+    def from_env(cls) -> 'PoolConfig':
+        return cls(pool_connections=_env_int("SVSH_POOL_CONNECTIONS", cls.pool_connections),
+                   pool_maxsize=_env_int("SVSH_POOL_MAXSIZE", cls.pool_maxsize),
+                   pool_block=_env_bool("SVSH_POOL_BLOCK", cls.pool_block),
+                   keep_alive=_env_bool("SVSH_KEEP_ALIVE", cls.keep_alive))
+
+
+@dataclass
+class PoolStats:
+    requests: int
+    hits: int
+    misses: int
+    hosts: int
+
+
+class SessionPool:
+    '''Keep-alive HTTP session shared by every client in the process'''
+
+    def __init__(self, config: Optional[PoolConfig] = None):
+        self.config = config or PoolConfig.from_env()
+        self._session: Optional[requests.Session] = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._new_session()
+
+        return self._session
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.config.pool_connections,
+                              pool_maxsize=self.config.pool_maxsize,
+                              pool_block=self.config.pool_block)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        if not self.config.keep_alive:
+            session.headers["Connection"] = "close"
+
+        return session
+
+    def stats(self) -> PoolStats:
+        # A request that did not need a new connection was served from the pool.
+        #  urllib3 only tracks this per host pool, so hosts evicted from the
+        #  pool manager drop out of the totals.
+        num_requests = 0
+        num_connections = 0
+        hosts = 0
+
+        if self._session is not None:
+            adapters = {id(a): a for a in self._session.adapters.values()}
+            for adapter in adapters.values():
+                pools = adapter.poolmanager.pools
+                for key in list(pools.keys()):
+                    pool = pools.get(key)
+                    if pool is None:
+                        continue
+                    hosts += 1
+                    num_requests += pool.num_requests
+                    num_connections += pool.num_connections
+
+        return PoolStats(requests=num_requests,
+                         hits=max(num_requests - num_connections, 0),
+                         misses=num_connections,
+                         hosts=hosts)
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+_default_pool: Optional[SessionPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def default_pool() -> SessionPool:
+    global _default_pool
+
+    if _default_pool is None:
+        with _default_pool_lock:
+            if _default_pool is None:
+                _default_pool = SessionPool()
+
+    return _default_pool
+
+
+def configure_pool(config: PoolConfig) -> SessionPool:
+    '''Replace the process wide pool, closing any open connections'''
+    global _default_pool
+
+    with _default_pool_lock:
+        if _default_pool is not None:
+            _default_pool.close()
+        _default_pool = SessionPool(config)
+
+    return _default_pool
@@ -0,0 +1,111 @@
+'''Memory compact __slots__ variants of the with_dict models.
+
+slotted(Model) returns a copy of the dataclass that stores its fields in slots
+instead of a per-instance __dict__. Nested models are swapped for their slotted
+variants, and identifier strings (id, *_id, version) are interned while
+decoding so records from the same org share one copy of each id.
+
+The variants carry the same fields and methods as the original models, but they
+are separate classes: isinstance(Runner.slotted()(...), Runner) is False.
+'''
+import dataclasses
+import threading
+from typing import Any, Dict, FrozenSet, List, Optional, Union, get_type_hints
+
+_slotted: Dict[type, type] = {}
+_lock = threading.RLock()
+
+_DATACLASS_ATTRS = {'__dict__', '__weakref__', '__dataclass_fields__', '__dataclass_params__',
+                    '__init__', '__repr__', '__eq__', '__hash__', '__annotations__',
+                    '__match_args__', '__doc__', '__module__', '__qualname__', '__slots__'}
+
+
+def slotted(cls: type) -> type:
+    if getattr(cls, '__slotted_from__', None) is not None:
+        return cls
+
+    try:
+        return _slotted[cls]
+    except KeyError:
+        pass
+
+    with _lock:
+        if cls not in _slotted:
+            _slotted[cls] = _make_slotted(cls)
+
+        return _slotted[cls]
+
+
+def is_identifier_field(name: str) -> bool:
+    return name == 'id' or name.endswith('_id') or name == 'version'
+
+
+def _slotted_type(tp):
+    if isinstance(tp, type) and dataclasses.is_dataclass(tp):
+        return slotted(tp)
+
+    origin = getattr(tp, '__origin__', None)
+    args = getattr(tp, '__args__', None)
+    if origin is None or not args:
+        return tp
+
+    new_args = tuple(_slotted_type(a) for a in args)
+    if new_args == args:
+        return tp
+
+    if origin is Union:
+        return Union[new_args]
+    if origin in (list, List):
+        return List[new_args[0]]
+    if origin in (dict, Dict):
+        return Dict[new_args[0], new_args[1]]
+
+    return tp
+
+
+def _intern_fields(fields, hints) -> FrozenSet[str]:
+    names = set()
+    for f in fields:
+        tp = hints[f.name]
+        if tp in (str, Optional[str]) and is_identifier_field(f.name):
+            names.add(f.name)
+
+    return frozenset(names)
+
+
+def _make_slotted(cls: type) -> type:
+    hints = get_type_hints(cls)
+    fields = dataclasses.fields(cls)
+    field_names = {f.name for f in fields}
+
+    spec = []
+    for f in fields:
+        spec.append((f.name, _slotted_type(hints[f.name]),
+                     dataclasses.field(default=f.default, default_factory=f.default_factory,  # type: ignore
+                                       init=f.init, repr=f.repr, compare=f.compare,
+                                       hash=f.hash, metadata=f.metadata)))
+
+    # Carry over methods and class attributes (get_queue_name, to_input, ...)
+    namespace: Dict[str, Any] = {k: v for k, v in cls.__dict__.items()
+                                 if k not in _DATACLASS_ATTRS and k not in field_names}
+
+    params = cls.__dataclass_params__  # type: ignore
+    dc = dataclasses.make_dataclass(cls.__name__, spec, bases=cls.__bases__, namespace=namespace,
+                                    eq=params.eq, order=params.order, frozen=params.frozen)
+
+    # Same approach as dataclass(slots=True) on Python 3.10+: rebuild the class
+    #  with __slots__ and without the class level field defaults
+    slotted_dict = dict(dc.__dict__)
+    for name in field_names:
+        slotted_dict.pop(name, None)
+    slotted_dict.pop('__dict__', None)
+    slotted_dict.pop('__weakref__', None)
+    slotted_dict['__slots__'] = tuple(f.name for f in fields)
+    slotted_dict['__slotted_from__'] = cls
+    slotted_dict['__intern_fields__'] = _intern_fields(fields, hints)
+
+    new_cls = type(dc)(dc.__name__, dc.__bases__, slotted_dict)
+    new_cls.__qualname__ = cls.__qualname__
+    new_cls.__module__ = cls.__module__
+
+    return new_cls
@@ -0,0 +1,20 @@
+from typing import List, Optional
+
+from sevco_shell.clients.async_client import AsyncSevcoClient
+from sevco_shell.clients.source_audit.client import SourceAuditClient
+from sevco_shell.clients.source_audit.model import SourceExecutionV2
+
+
+class AsyncSourceAuditClient(AsyncSevcoClient):
+    client_class = SourceAuditClient
+    client: SourceAuditClient
+
+    async def list(self, audit_type: str, per_page: int = 100, page: int = 0, source_config_id: Optional[str] = None, execution_id: Optional[str] = None) -> List[SourceExecutionV2]:
+        return await self._run(self.client.list, audit_type, per_page=per_page, page=page,
+                               source_config_id=source_config_id, execution_id=execution_id)
+
+    async def add(self, source_execution: SourceExecutionV2) -> SourceExecutionV2:
+        return await self._run(self.client.add, source_execution)
+
+    async def delete(self, audit_type: str, execution_id: str) -> None:
+        await self._run(self.client.delete, audit_type, execution_id)
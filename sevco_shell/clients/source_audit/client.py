@@ -1,16 +1,135 @@
-import json
 import logging
-from typing import List, Optional
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple
 
+from sevco_shell.clients import codec
 from sevco_shell.clients.client import SevcoClient
+from sevco_shell.clients.source_audit.columnar import ExecutionColumns
 from sevco_shell.clients.source_audit.model import (PageinatedResponseV2,
                                                     SourceExecutionV2)
 
 LOG = logging.getLogger(__name__)
 
+PageResult = Tuple[PageinatedResponseV2, int, float]
+
 
 class SourceAuditClient(SevcoClient):
     def list(self, audit_type: str, per_page: int = 100, page: int = 0, source_config_id: Optional[str] = None, execution_id: Optional[str] = None) -> List[SourceExecutionV2]:
+        return self.page(audit_type, per_page=per_page, page=page,
+                         source_config_id=source_config_id, execution_id=execution_id).items
+
+    def page(self, audit_type: str, per_page: int = 100, page: int = 0, source_config_id: Optional[str] = None, execution_id: Optional[str] = None) -> PageinatedResponseV2:
+        paginated, _, _ = self._fetch_page(audit_type, per_page, page, source_config_id, execution_id)
+
+        return paginated
+
+    def iter_list(self,
+                  audit_type: str,
+                  source_config_id: Optional[str] = None,
+                  execution_id: Optional[str] = None,
+                  limit: Optional[int] = None,
+                  per_page: int = 100,
+                  min_per_page: int = 10,
+                  max_per_page: int = 1000,
+                  target_latency: float = 1.0,
+                  max_page_bytes: int = 4 * 1024 * 1024,
+                  prefetch: bool = True,
+                  compact: bool = False) -> Iterator[SourceExecutionV2]:
+        '''Stream executions across every page.
+
+        The next page is requested in the background while the current one is
+        consumed, and the page size is grown or shrunk to keep each request near
+        target_latency and under max_page_bytes. At most two pages are held in
+        memory at any time. The stream ends at an empty page, or one shorter than
+        the per_page the server reports serving, and the size never grows past
+        a cap the server applies. With compact=True items are the slotted model variants.
+        '''
+        page_size = min(per_page, limit) if limit else per_page
+        offset = 0
+        # Size of the last page the server served in full, it divides offset
+        last_size = page_size
+
+        def fetch(size: int, start: int) -> Tuple[int, PageResult]:
+            # Pages are addressed by index, every size used divides the offset it is used at
+            assert start % size == 0
+            return size, self._fetch_page(audit_type, size, start // size, source_config_id, execution_id, compact)
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            requested, result = fetch(page_size, offset)
+            while True:
+                paginated, nbytes, elapsed = result
+                items = paginated.items
+
+                # The server may cap per_page below what was asked for
+                pagination = getattr(paginated, 'pagination', None)
+                honoured = min(pagination.per_page, requested) if pagination and pagination.per_page else requested
+                if honoured < requested:
+                    max_per_page = honoured
+                    if offset:
+                        # The items are page offset // requested of the capped size, not the ones at offset.
+                        # Refetch with the last size the server honoured, which divides offset.
+                        LOG.debug("audit page size %d capped to %d by the server", requested, honoured)
+                        del paginated, result
+                        page_size = last_size
+                        requested, result = fetch(page_size, offset)
+                        continue
+                    page_size = honoured
+
+                # Only an empty page, or one shorter than the server says it served, is the last
+                done = len(items) < honoured
+
+                if limit is not None and offset + len(items) >= limit:
+                    items = items[:limit - offset]
+                    done = True
+
+                offset += len(items)
+                last_size = honoured
+
+                pending: Optional[Future] = None
+                if not done:
+                    page_size = self._next_page_size(page_size, offset, nbytes, elapsed,
+                                                     min_per_page, max_per_page, target_latency, max_page_bytes)
+                    if executor:
+                        pending = executor.submit(fetch, page_size, offset)
+
+                # Drop our reference to the page wrapper so only the items being yielded stay alive
+                del paginated, result
+                yield from items
+
+                if done:
+                    return
+
+                requested, result = pending.result() if pending else fetch(page_size, offset)
+        finally:
+            if executor:
+                executor.shutdown(wait=False)
+
+    def columns(self, audit_type: str, **kwargs) -> ExecutionColumns:
+        '''Collect executions into a columnar table; takes the same arguments as iter_list'''
+        return ExecutionColumns.from_executions(self.iter_list(audit_type, **kwargs))
+
+    @staticmethod
+    def _next_page_size(page_size: int, offset: int, nbytes: int, elapsed: float,
+                        min_per_page: int, max_per_page: int, target_latency: float, max_page_bytes: int) -> int:
+        if elapsed > target_latency or nbytes > max_page_bytes:
+            new_size = max(page_size // 2, min_per_page)
+        elif elapsed < target_latency / 2 and nbytes * 2 <= max_page_bytes:
+            new_size = min(page_size * 2, max_per_page)
+        else:
+            return page_size
+
+        # Pages are addressed by index, so only switch size on a page boundary of the new size
+        if new_size <= 0 or offset % new_size:
+            return page_size
+
+        LOG.debug("audit page size %d -> %d (%d bytes in %.3fs)", page_size, new_size, nbytes, elapsed)
+
+        return new_size
+
+    def _fetch_page(self, audit_type: str, per_page: int, page: int, source_config_id: Optional[str], execution_id: Optional[str],
+                    compact: bool = False) -> PageResult:
         params = {
             "type": audit_type,
             "per_page": per_page,
@@ -21,18 +140,20 @@ class SourceAuditClient(SevcoClient):
         if source_config_id:
             params['source_config_id'] = source_config_id
 
+        start = time.perf_counter()
         resp = self.api_get("/v2/audit/source", params=params)
+        elapsed = time.perf_counter() - start
 
-        paginated: PageinatedResponseV2 = PageinatedResponseV2.from_dict(
-            json.loads(resp.text))
+        model = PageinatedResponseV2.slotted() if compact else PageinatedResponseV2
+        paginated: PageinatedResponseV2 = model.from_dict(codec.loads(resp.content))
 
-        return paginated.items
+        return paginated, len(resp.content), elapsed
 
     def add(self, source_execution: SourceExecutionV2) -> SourceExecutionV2:
         resp = self.api_post(f"/v2/audit/source",
-                             data=json.dumps(source_execution.as_dict()))
+                             data=source_execution.to_json())
 
-        return SourceExecutionV2.from_dict(json.loads(resp.text))
+        return SourceExecutionV2.from_dict(codec.loads(resp.content))
 
     def delete(self, audit_type: str, execution_id: str) -> None:
         resp = self.api_delete(f"/v2/audit/source",
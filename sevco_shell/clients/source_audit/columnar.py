@@ -0,0 +1,303 @@
+'''Columnar, array backed storage for large numbers of execution audits.
+
+Timestamps are kept as int64 microseconds since the epoch, exit codes and
+counts as int64 arrays and identifiers as dictionary encoded categoricals.
+Filtering, sorting and grouping are vectorized with NumPy when it is installed
+and fall back to plain Python loops otherwise. Rows are turned back into
+SourceExecutionV2 models only when asked for.
+'''
+import operator
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from sevco_shell.clients.source_audit.model import (ExecutionInfo, ResultInfo,
+                                                    RunnerInfo,
+                                                    SourceExecutionV2)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+Mask = Sequence[bool]
+
+_OPS: Dict[str, Callable[[Any, Any], Any]] = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+
+def to_epoch_micros(dt: datetime) -> int:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - EPOCH) // ONE_MICROSECOND
+
+
+def from_epoch_micros(v: int) -> datetime:
+    return EPOCH + timedelta(microseconds=int(v))
+
+
+class Categorical:
+    '''Dictionary encoded string column: each distinct value is stored once'''
+
+    def __init__(self, categories: Optional[List[Any]] = None, codes: Optional[array] = None):
+        self.categories: List[Any] = categories if categories is not None else []
+        self.codes = codes if codes is not None else array('i')
+        self._index = {c: i for i, c in enumerate(self.categories)}
+        # Categories shared with a column from take(), copied before adding one
+        self._shared = False
+
+    def append(self, value: Any) -> None:
+        code = self._index.get(value)
+        if code is None:
+            if self._shared:
+                self.categories, self._index = list(self.categories), dict(self._index)
+                self._shared = False
+            code = self._index[value] = len(self.categories)
+            self.categories.append(value)
+        self.codes.append(code)
+
+    def code_of(self, value: Any) -> Optional[int]:
+        return self._index.get(value)
+
+    def take(self, indices: Iterable[int]) -> 'Categorical':
+        # Categories are shared until either column adds one, only the codes are copied
+        taken = Categorical.__new__(Categorical)
+        taken.categories, taken.codes, taken._index = self.categories, _take(self.codes, indices), self._index
+        taken._shared = self._shared = True
+        return taken
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i: int) -> Any:
+        return self.categories[self.codes[i]]
+
+    def __iter__(self) -> Iterator[Any]:
+        categories = self.categories
+        return (categories[c] for c in self.codes)
+
+
+def _view(col: array):
+    '''Zero copy NumPy view of an array column'''
+    return np.frombuffer(col, dtype=np.int32 if col.typecode == 'i' else np.int64)
+
+
+def _take(col: array, indices) -> array:
+    if np is not None:
+        taken = array(col.typecode)
+        taken.frombytes(_view(col)[np.asarray(indices, dtype=np.int64)].tobytes())
+        return taken
+
+    return array(col.typecode, [col[i] for i in indices])
+
+
+class ExecutionColumns:
+    CATEGORICAL = ('org_id', 'runner_id', 'runner_version', 'execution_id', 'source_config_id',
+                   'plugin_id', 'status_code', 'message')
+    TIMESTAMPS = ('queued_timestamp', 'received_timestamp', 'completed_timestamp')
+    INTEGERS = ('exit_code', 'count')
+    TEXT = ('stderr',)
+
+    def __init__(self):
+        self.columns: Dict[str, Any] = {}
+        for name in self.CATEGORICAL:
+            self.columns[name] = Categorical()
+        for name in self.TIMESTAMPS + self.INTEGERS:
+            self.columns[name] = array('q')
+        for name in self.TEXT:
+            self.columns[name] = []
+
+    @classmethod
+    def from_executions(cls, executions: Iterable[SourceExecutionV2]) -> 'ExecutionColumns':
+        '''Build from any iterable of executions, such as SourceAuditClient.iter_list'''
+        table = cls()
+        for execution in executions:
+            table.append(execution)
+
+        return table
+
+    def append(self, e: SourceExecutionV2) -> None:
+        c = self.columns
+        c['org_id'].append(e.org_id)
+        c['runner_id'].append(e.runner.id)
+        c['runner_version'].append(e.runner.version)
+        c['execution_id'].append(e.execution.id)
+        c['source_config_id'].append(e.execution.source_config_id)
+        c['plugin_id'].append(e.execution.plugin_id)
+        c['status_code'].append(e.result.status_code)
+        c['message'].append(e.result.message)
+        c['queued_timestamp'].append(to_epoch_micros(e.execution.queued_timestamp))
+        c['received_timestamp'].append(to_epoch_micros(e.execution.received_timestamp))
+        c['completed_timestamp'].append(to_epoch_micros(e.execution.completed_timestamp))
+        c['exit_code'].append(e.execution.exit_code)
+        c['count'].append(e.result.count)
+        c['stderr'].append(e.execution.stderr)
+
+    def __len__(self) -> int:
+        return len(self.columns['exit_code'])
+
+    def column(self, name: str):
+        '''Raw column: a NumPy array (when available) for numeric columns, Categorical or list otherwise'''
+        col = self.columns[name]
+        if np is not None and isinstance(col, array):
+            return _view(col)
+        return col
+
+    def values(self, name: str) -> List[Any]:
+        col = self.columns[name]
+        if name in self.TIMESTAMPS:
+            return [from_epoch_micros(v) for v in col]
+        return list(col)
+
+    def where(self, name: str, op: str, value: Any) -> Mask:
+        '''Boolean mask of rows where `column op value` holds'''
+        compare = _OPS[op]
+        col = self.columns[name]
+
+        if isinstance(col, Categorical):
+            if op not in ('==', '!='):
+                raise ValueError(f"{name} only supports == and !=")
+            code = col.code_of(value)
+            if code is None:
+                code = -1
+            if np is not None:
+                return compare(_view(col.codes), code)
+            return [compare(c, code) for c in col.codes]
+
+        if isinstance(value, datetime):
+            value = to_epoch_micros(value)
+
+        if np is not None and isinstance(col, array):
+            return compare(_view(col), value)
+
+        return [compare(v, value) for v in col]
+
+    def filter(self, mask: Mask) -> 'ExecutionColumns':
+        if np is not None:
+            indices = np.flatnonzero(np.asarray(mask, dtype=bool))
+        else:
+            indices = [i for i, keep in enumerate(mask) if keep]
+
+        return self.take(indices)
+
+    def sort(self, name: str, reverse: bool = False) -> 'ExecutionColumns':
+        col = self.columns[name]
+
+        if isinstance(col, Categorical):
+            # Sort by category value, not by code
+            order = sorted(range(len(col.categories)), key=lambda i: (col.categories[i] is None, col.categories[i]))
+            rank = [0] * len(order)
+            for r, code in enumerate(order):
+                rank[code] = r
+            keys: Any = [rank[c] for c in col.codes] if np is None else np.asarray(rank, dtype=np.int64)[_view(col.codes)]
+        else:
+            keys = col
+
+        if np is not None:
+            keys = np.asarray(keys)
+            # Negate rather than reversing so ties keep their order, as sorted(reverse=True) does
+            indices = np.argsort(-keys if reverse else keys, kind='stable')
+        else:
+            indices = sorted(range(len(self)), key=keys.__getitem__, reverse=reverse)
+
+        return self.take(indices)
+
+    def count_by(self, name: str) -> Dict[Any, int]:
+        col = self.columns[name]
+
+        if isinstance(col, Categorical):
+            if np is not None:
+                counts = np.bincount(_view(col.codes), minlength=len(col.categories))
+                return {col.categories[i]: int(n) for i, n in enumerate(counts) if n}
+            result: Dict[Any, int] = {}
+            for value in col:
+                result[value] = result.get(value, 0) + 1
+            return result
+
+        if np is not None and isinstance(col, array):
+            keys, counts = np.unique(_view(col), return_counts=True)
+            return {int(k): int(n) for k, n in zip(keys, counts)}
+
+        result = {}
+        for value in col:
+            result[value] = result.get(value, 0) + 1
+        return result
+
+    def group_by(self, name: str) -> Dict[Any, 'ExecutionColumns']:
+        col = self.columns[name]
+        keys: Any = col.codes if isinstance(col, Categorical) else col
+
+        groups: Dict[Any, Any] = {}
+        if np is not None and isinstance(keys, array):
+            view = _view(keys)
+            order = np.argsort(view, kind='stable')
+            uniques, starts = np.unique(view[order], return_index=True)
+            bounds = list(starts[1:]) + [len(order)]
+            for key, start, end in zip(uniques, starts, bounds):
+                groups[int(key)] = order[start:end]
+        else:
+            for i, key in enumerate(keys):
+                groups.setdefault(key, []).append(i)
+
+        if isinstance(col, Categorical):
+            return {col.categories[code]: self.take(idx) for code, idx in groups.items()}
+
+        return {key: self.take(idx) for key, idx in groups.items()}
+
+    def take(self, indices: Union[Sequence[int], Any]) -> 'ExecutionColumns':
+        table = ExecutionColumns.__new__(ExecutionColumns)
+        table.columns = {}
+
+        for name, col in self.columns.items():
+            if isinstance(col, Categorical):
+                table.columns[name] = col.take(indices)
+            elif isinstance(col, array):
+                table.columns[name] = _take(col, indices)
+            else:
+                table.columns[name] = [col[i] for i in indices]
+
+        return table
+
+    def row(self, i: int, compact: bool = False) -> SourceExecutionV2:
+        c = self.columns
+        models = (SourceExecutionV2, RunnerInfo, ExecutionInfo, ResultInfo)
+        if compact:
+            models = tuple(m.slotted() for m in models)
+        execution_cls, runner_cls, info_cls, result_cls = models
+
+        return execution_cls(
+            org_id=c['org_id'][i],
+            runner=runner_cls(id=c['runner_id'][i], version=c['runner_version'][i]),
+            execution=info_cls(id=c['execution_id'][i],
+                               source_config_id=c['source_config_id'][i],
+                               plugin_id=c['plugin_id'][i],
+                               queued_timestamp=from_epoch_micros(c['queued_timestamp'][i]),
+                               received_timestamp=from_epoch_micros(c['received_timestamp'][i]),
+                               completed_timestamp=from_epoch_micros(c['completed_timestamp'][i]),
+                               exit_code=c['exit_code'][i],
+                               stderr=c['stderr'][i]),
+            result=result_cls(status_code=c['status_code'][i],
+                              message=c['message'][i],
+                              count=c['count'][i]))
+
+    def __getitem__(self, i: int) -> SourceExecutionV2:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.row(i)
+
+    def __iter__(self) -> Iterator[SourceExecutionV2]:
+        return self.to_models()
+
+    def to_models(self, compact: bool = False) -> Iterator[SourceExecutionV2]:
+        return (self.row(i, compact) for i in range(len(self)))
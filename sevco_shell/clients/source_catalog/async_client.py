@@ -0,0 +1,28 @@
+from typing import Dict, List
+
+from sevco_shell.clients.async_client import AsyncSevcoClient
+from sevco_shell.clients.source_catalog.client import SourceCatalogClient
+from sevco_shell.clients.source_catalog.models import Source, SourceInput
+
+
+class AsyncSourceCatalogClient(AsyncSevcoClient):
+    client_class = SourceCatalogClient
+    client: SourceCatalogClient
+
+    async def healthcheck(self) -> Dict:
+        return await self._run(self.client.healthcheck)
+
+    async def create(self, source_input: SourceInput) -> Source:
+        return await self._run(self.client.create, source_input)
+
+    async def update(self, source_id: str, source_input: SourceInput) -> Source:
+        return await self._run(self.client.update, source_id, source_input)
+
+    async def list(self) -> List[Source]:
+        return await self._run(self.client.list)
+
+    async def get(self, source_id: str) -> Source:
+        return await self._run(self.client.get, source_id)
+
+    async def delete(self, source_id: str) -> None:
+        await self._run(self.client.delete, source_id)
@@ -1,6 +1,6 @@
-import json
 from typing import Dict, List
 
+from sevco_shell.clients import codec
 from sevco_shell.clients.client import SevcoClient
 from sevco_shell.clients.source_catalog.models import Source, SourceInput
 
@@ -13,37 +13,37 @@ class SourceCatalogClient(SevcoClient):
             "/v1/healthcheck/source-catalog-service"
         )
 
-        return resp.json()
+        return codec.loads(resp.content)
 
     def create(self, source_input: SourceInput) -> Source:
         resp = self.api_post(
             SOURCE_CATALOG_URL_ROOT,
-            data=json.dumps(source_input.as_dict())
+            data=source_input.to_json()
         )
 
-        return Source.from_dict(json.loads(resp.text))
+        return Source.from_dict(codec.loads(resp.content))
 
     def update(self, source_id: str, source_input: SourceInput) -> Source:
         resp = self.api_put(
             f"{SOURCE_CATALOG_URL_ROOT}/{source_id}",
-            data=json.dumps(source_input.as_dict())
+            data=source_input.to_json()
         )
 
-        return Source.from_dict(json.loads(resp.text))
+        return Source.from_dict(codec.loads(resp.content))
 
     def list(self) -> List[Source]:
         resp = self.api_get(
             SOURCE_CATALOG_URL_ROOT
         )
 
-        return [Source.from_dict(d) for d in json.loads(resp.text)]
+        return [Source.from_dict(d) for d in codec.loads(resp.content)]
 
     def get(self, source_id: str) -> Source:
         resp = self.api_get(
             f"{SOURCE_CATALOG_URL_ROOT}/{source_id}"
         )
 
-        return Source.from_dict(json.loads(resp.text))
+        return Source.from_dict(codec.loads(resp.content))
 
     def delete(self, source_id: str) -> None:
         self.api_delete(
@@ -0,0 +1,26 @@
+from typing import List, Optional
+
+from sevco_shell.clients.async_client import AsyncSevcoClient
+from sevco_shell.clients.source_config.client import SourceConfigClient
+from sevco_shell.clients.source_config.model import SourceConfig
+
+
+class AsyncSourceConfigClient(AsyncSevcoClient):
+    client_class = SourceConfigClient
+    client: SourceConfigClient
+
+    async def get(self, id: str, oauth_refresh=True, **kwargs) -> SourceConfig:
+        return await self._run(self.client.get, id, oauth_refresh=oauth_refresh, **kwargs)
+
+    async def list(self, source_id: Optional[str] = None, is_enabled: Optional[bool] = None, oauth_refresh=True, **kwargs) -> List[SourceConfig]:
+        return await self._run(self.client.list, source_id=source_id, is_enabled=is_enabled,
+                               oauth_refresh=oauth_refresh, **kwargs)
+
+    async def add(self, source_config: SourceConfig, **kwargs) -> SourceConfig:
+        return await self._run(self.client.add, source_config, **kwargs)
+
+    async def delete(self, id: str, **kwargs) -> None:
+        await self._run(self.client.delete, id, **kwargs)
+
+    async def update(self, source_config: SourceConfig, **kwargs) -> SourceConfig:
+        return await self._run(self.client.update, source_config, **kwargs)
@@ -1,7 +1,7 @@
-import json
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
+from sevco_shell.clients import codec
 from sevco_shell.clients.client import SevcoClient
 from sevco_shell.clients.source_config.model import SourceConfig
 
@@ -13,35 +13,42 @@ class SourceConfigClient(SevcoClient):
         resp = self.api_get(f"/v1/integration/source/config/{id}", params={
                             "oauth_refresh": "true" if oauth_refresh else "false"}, **kwargs)
 
-        return SourceConfig.from_dict(json.loads(resp.text))
+        return SourceConfig.from_dict(codec.loads(resp.content))
 
     def list(self, source_id: Optional[str] = None, is_enabled: Optional[bool] = None, oauth_refresh=True, **kwargs) -> List[SourceConfig]:
+        return [SourceConfig.from_dict(d) for d in self.list_raw(source_id, is_enabled, oauth_refresh, **kwargs)]
+
+    def list_raw(self, source_id: Optional[str] = None, is_enabled: Optional[bool] = None, oauth_refresh=True,
+                 updated_since: Optional[str] = None, **kwargs) -> List[Dict[str, Any]]:
+        '''Undecoded configs, so callers can skip decoding records they already have'''
         params = {"oauth_refresh": "true" if oauth_refresh else "false"}
 
         if source_id:
             params['source_id'] = source_id
         if is_enabled is not None:
             params['enabled'] = "true" if is_enabled else "false"
+        if updated_since:
+            params['updated_since'] = updated_since
 
         resp = self.api_get("/v1/integration/source/config",
                             params=params,
                             **kwargs)
 
-        return [SourceConfig.from_dict(d) for d in json.loads(resp.text)]
+        return codec.loads(resp.content)
 
     def add(self, source_config: SourceConfig, **kwargs) -> SourceConfig:
         resp = self.api_post("/v1/integration/source/config",
-                             data=json.dumps(source_config.as_dict()),
+                             data=source_config.to_json(),
                              **kwargs)
 
-        return SourceConfig.from_dict(json.loads(resp.text))
+        return SourceConfig.from_dict(codec.loads(resp.content))
 
     def delete(self, id: str, **kwargs) -> None:
         self.api_delete(f"/v1/integration/source/config/{id}", **kwargs)
 
     def update(self, source_config: SourceConfig, **kwargs) -> SourceConfig:
         resp = self.api_put(f"/v1/integration/source/config/{source_config.id}",
-                            data=json.dumps(source_config.as_dict()),
+                            data=source_config.to_json(),
                             **kwargs)
 
-        return SourceConfig.from_dict(json.loads(resp.text))
+        return SourceConfig.from_dict(codec.loads(resp.content))
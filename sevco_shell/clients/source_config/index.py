@@ -0,0 +1,138 @@
+'''Incrementally synced local copy of an org's source configs.
+
+Each sync fetches the raw config list and compares every record's
+last_updated_timestamp with the copy already held. Only new or changed records
+are decoded, and they are moved to their place in the newest-first order with
+bisect instead of re-sorting the whole list. Records the server no longer
+returns are dropped.
+
+When the API accepts an updated_since filter (server_filter=True) only records
+changed since the last sync are requested, with a full sync every
+full_sync_every syncs to pick up deletions.
+'''
+import bisect
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from sevco_shell.clients.source_config.client import SourceConfigClient
+from sevco_shell.clients.source_config.model import SourceConfig
+
+LOG = logging.getLogger(__name__)
+
+SortKey = Tuple[float, str]
+
+
+@dataclass
+class SyncStats:
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    unchanged: int = 0
+
+
+def sort_key(config: SourceConfig) -> SortKey:
+    '''Newest first, ties broken by id so the order is stable across syncs'''
+    ts = config.last_updated_timestamp
+    return (-ts.timestamp() if ts else float('inf'), config.id or '')
+
+
+class SourceConfigIndex:
+    def __init__(self, client: SourceConfigClient, source_id: Optional[str] = None, oauth_refresh: bool = True,
+                 server_filter: bool = False, full_sync_every: int = 10):
+        self.client = client
+        self.source_id = source_id
+        self.oauth_refresh = oauth_refresh
+        self.server_filter = server_filter
+        self.full_sync_every = full_sync_every
+
+        self.by_id: Dict[str, SourceConfig] = {}
+        self._stamps: Dict[str, Any] = {}
+        self._keys: List[SortKey] = []
+        self._order: List[SourceConfig] = []
+        self._latest: Optional[str] = None
+        self._syncs = 0
+        self._lock = threading.Lock()
+
+    def configs(self) -> List[SourceConfig]:
+        with self._lock:
+            return list(self._order)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def sync(self) -> SyncStats:
+        full = not (self.server_filter and self._latest) or self._syncs % self.full_sync_every == 0
+
+        raw = self.client.list_raw(source_id=self.source_id, oauth_refresh=self.oauth_refresh,
+                                   updated_since=None if full else self._latest)
+
+        with self._lock:
+            stats = self._merge(raw, full)
+            self._syncs += 1
+
+        LOG.debug("synced source configs (%s): %s", "full" if full else "delta", stats)
+
+        return stats
+
+    def remove(self, config_id: str) -> None:
+        with self._lock:
+            self._remove(config_id)
+
+    def replace(self, config: SourceConfig) -> None:
+        '''Hold config, fetched outside a sync, in place of the copy with its id'''
+        with self._lock:
+            self._remove(config.id)  # type: ignore
+            # Its raw stamp is not known, the next sync decodes the record again
+            self._insert(config, None)
+
+    def _merge(self, raw: List[Dict[str, Any]], full: bool) -> SyncStats:
+        stats = SyncStats()
+        seen = set()
+
+        for d in raw:
+            config_id = d.get('id')
+            stamp = d.get('last_updated_timestamp')
+            seen.add(config_id)
+
+            if config_id in self._stamps and self._stamps[config_id] == stamp:
+                stats.unchanged += 1
+                continue
+
+            config = SourceConfig.from_dict(d)
+            if config_id in self.by_id:
+                self._remove(config_id)
+                stats.updated += 1
+            else:
+                stats.added += 1
+            self._insert(config, stamp)
+
+            if stamp and (self._latest is None or stamp > self._latest):
+                self._latest = stamp
+
+        if full:
+            for config_id in [i for i in self.by_id if i not in seen]:
+                self._remove(config_id)
+                stats.removed += 1
+
+        return stats
+
+    def _insert(self, config: SourceConfig, stamp: Any) -> None:
+        key = sort_key(config)
+        idx = bisect.bisect_left(self._keys, key)
+        self._keys.insert(idx, key)
+        self._order.insert(idx, config)
+
+        self.by_id[config.id] = config  # type: ignore
+        self._stamps[config.id] = stamp  # type: ignore
+
+    def _remove(self, config_id: str) -> None:
+        config = self.by_id.pop(config_id, None)
+        self._stamps.pop(config_id, None)
+        if config is None:
+            return
+
+        idx = bisect.bisect_left(self._keys, sort_key(config))
+        del self._keys[idx]
+        del self._order[idx]
@@ -1,7 +1,7 @@
-import json
 import logging
 from typing import Dict
 
+from sevco_shell.clients import codec
 from sevco_shell.clients.client import SevcoClient
 from sevco_shell.clients.source_config.model import SourceConfig
 from sevco_shell.clients.source_oauth.model import SourceOAuthSettings
@@ -14,21 +14,21 @@ class SourceOAuthClient(SevcoClient):
         resp = self.api_get(
             f"/v1/integration/source/{source_id}/oauth", **kwargs)
 
-        return SourceOAuthSettings.from_dict(json.loads(resp.text))
+        return SourceOAuthSettings.from_dict(codec.loads(resp.content))
 
     def add(self, source_oauth_settings: SourceOAuthSettings, **kwargs) -> SourceOAuthSettings:
         resp = self.api_post(f"/v1/integration/source/{source_oauth_settings.source_id}/oauth",
-                             data=json.dumps(source_oauth_settings.as_dict()),
+                             data=source_oauth_settings.to_json(),
                              **kwargs)
 
-        return SourceOAuthSettings.from_dict(json.loads(resp.text))
+        return SourceOAuthSettings.from_dict(codec.loads(resp.content))
 
     def update(self, source_oauth_settings: SourceOAuthSettings, **kwargs) -> SourceOAuthSettings:
         resp = self.api_put(f"/v1/integration/source/{source_oauth_settings.source_id}/oauth",
-                            data=json.dumps(source_oauth_settings.as_dict()),
+                            data=source_oauth_settings.to_json(),
                             **kwargs)
 
-        return SourceOAuthSettings.from_dict(json.loads(resp.text))
+        return SourceOAuthSettings.from_dict(codec.loads(resp.content))
 
     def delete(self, source_id: str, **kwargs) -> None:
         resp = self.api_delete(
@@ -38,16 +38,16 @@ class SourceOAuthClient(SevcoClient):
         resp = self.api_get(
             f"/v1/integration/source/config/{source_config_id}/oauth/initiate", **kwargs)
 
-        return resp.json()['url']
+        return codec.loads(resp.content)['url']
 
     def refresh(self, source_config_id: str, **kwargs) -> SourceConfig:
         resp = self.api_put(
             f"/v1/integration/source/config/{source_config_id}/oauth/refresh", **kwargs)
 
-        return SourceConfig.from_dict(json.loads(resp.text))
+        return SourceConfig.from_dict(codec.loads(resp.content))
 
     def revoke(self, source_config_id: str, **kwargs) -> Dict:
         resp = self.api_delete(
             f"/v1/integration/source/config/{source_config_id}/oauth/revoke", **kwargs)
 
-        return resp.json()
+        return codec.loads(resp.content)
@@ -0,0 +1,114 @@
+'''Lazy, batched OAuth token refresh for source configs.
+
+Listing or fetching configs with oauth_refresh=true makes the backend refresh
+the OAuth tokens of every config it returns. Instead configs are listed without
+refreshing, and only the configs about to be used are refreshed, and only when
+their token expires within the refresh margin (or its expiry is unknown).
+Several configs are refreshed concurrently through SourceOAuthClient.refresh.
+
+Set SVSH_OAUTH_REFRESH=always to go back to refreshing on every list and get.
+'''
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+
+from sevco_shell.clients.source_config.model import SourceConfig
+from sevco_shell.clients.source_oauth.client import SourceOAuthClient
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_MARGIN = 5 * 60
+
+
+def refresh_on_list() -> bool:
+    return os.environ.get("SVSH_OAUTH_REFRESH", "lazy").lower() == "always"
+
+
+@dataclass
+class RefreshStats:
+    avoided: int = 0
+    performed: int = 0
+    still_valid: int = 0
+    unknown_expiry: int = 0
+    failed: int = 0
+
+
+_stats = RefreshStats()
+_stats_lock = threading.Lock()
+
+
+def refresh_stats() -> RefreshStats:
+    with _stats_lock:
+        return RefreshStats(**_stats.__dict__)
+
+
+def _count(**kwargs) -> None:
+    with _stats_lock:
+        for name, n in kwargs.items():
+            setattr(_stats, name, getattr(_stats, name) + n)
+
+
+def is_oauth(config: SourceConfig) -> bool:
+    return config.auth is not None and config.auth.schema == 'oauth2'
+
+
+def token_expires(config: SourceConfig) -> Optional[float]:
+    '''Token expiry as epoch seconds, None when the config does not say'''
+    if config.auth is None or not isinstance(config.auth.instance, dict):
+        return None
+
+    expires = config.auth.instance.get('expires')
+    if not isinstance(expires, (int, float)) or isinstance(expires, bool):
+        return None
+
+    # Some providers report milliseconds
+    return expires / 1000 if expires > 1e12 else float(expires)
+
+
+class OAuthRefresher:
+    def __init__(self, client: SourceOAuthClient, margin: float = DEFAULT_MARGIN, max_workers: int = 4):
+        self.client = client
+        self.margin = margin
+        self.max_workers = max_workers
+
+    def needs_refresh(self, config: SourceConfig) -> bool:
+        if not is_oauth(config):
+            return False
+
+        expires = token_expires(config)
+        return expires is None or expires - time.time() < self.margin
+
+    def listed(self, configs: List[SourceConfig]) -> None:
+        '''Record a listing made without oauth_refresh'''
+        _count(avoided=sum(1 for c in configs if is_oauth(c)))
+
+    def ensure_fresh(self, configs: List[SourceConfig]) -> List[SourceConfig]:
+        '''Refresh the configs whose tokens are near expiry, returning the up to date configs in order'''
+        due = [i for i, c in enumerate(configs) if self.needs_refresh(c)]
+        _count(still_valid=sum(1 for c in configs if is_oauth(c)) - len(due),
+               unknown_expiry=sum(1 for i in due if token_expires(configs[i]) is None))
+
+        if not due:
+            return list(configs)
+
+        result = list(configs)
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(due))) as executor:
+            futures = {i: executor.submit(self.client.refresh, configs[i].id) for i in due}
+
+            for i, future in futures.items():
+                try:
+                    result[i] = future.result()
+                    _count(performed=1)
+                except Exception as e:
+                    # Use the config as is, the runner reports an unusable token
+                    LOG.warning("OAuth refresh failed for %s: %s", configs[i].id, e)
+                    _count(failed=1)
+
+        return result
+
+    def ensure_fresh_one(self, config: SourceConfig) -> SourceConfig:
+        return self.ensure_fresh([config])[0]
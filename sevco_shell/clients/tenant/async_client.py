@@ -0,0 +1,46 @@
+from typing import List
+
+from sevco_shell.clients.async_client import AsyncSevcoClient
+from sevco_shell.clients.tenant.client import TenantClient
+from sevco_shell.clients.tenant.models import CreateOrganizationResponse, Organization, Role, User
+
+
+class AsyncTenantClient(AsyncSevcoClient):
+    client_class = TenantClient
+    client: TenantClient
+
+    async def org_list(self) -> List[Organization]:
+        return await self._run(self.client.org_list)
+
+    async def org_create(self, org_name: str) -> CreateOrganizationResponse:
+        return await self._run(self.client.org_create, org_name)
+
+    async def org_delete(self, org_id: str) -> None:
+        await self._run(self.client.org_delete, org_id)
+
+    async def list_users(self) -> List[User]:
+        return await self._run(self.client.list_users)
+
+    async def get_user(self, email: str) -> User:
+        return await self._run(self.client.get_user, email)
+
+    async def add_user(self, email: str) -> str:
+        return await self._run(self.client.add_user, email)
+
+    async def delete_user(self, email: str):
+        await self._run(self.client.delete_user, email)
+
+    async def roles(self) -> List[Role]:
+        return await self._run(self.client.roles)
+
+    async def user_add_role(self, email: str, role_name: str):
+        await self._run(self.client.user_add_role, email, role_name)
+
+    async def user_delete_role(self, email: str, role_name: str):
+        await self._run(self.client.user_delete_role, email, role_name)
+
+    async def service_account_jwt(self, org_id: str) -> str:
+        return await self._run(self.client.service_account_jwt, org_id)
+
+    async def svc_token(self, org_id: str) -> str:
+        return await self._run(self.client.svc_token, org_id)
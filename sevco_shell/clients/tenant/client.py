@@ -1,8 +1,6 @@
-import json
 from typing import List
 
-from dacite.core import from_dict
-
+from sevco_shell.clients import codec
 from sevco_shell.clients.client import SevcoClient
 from sevco_shell.clients.tenant.models import CreateOrganizationResponse, Organization, Role, User, UserInvite
 
@@ -13,32 +11,32 @@ class TenantClient(SevcoClient):
     def org_list(self) -> List[Organization]:
         resp = self.api_get("/v1/admin/org", headers={'X-Sevco-Target-Org': '*'})
 
-        return [Organization.from_dict(o) for o in json.loads(resp.text)['orgs']]
+        return [Organization.from_dict(o) for o in codec.loads(resp.content)['orgs']]
 
     def org_create(self, org_name: str) -> CreateOrganizationResponse:
         resp = self.api_post(
-            "/v1/admin/org", data=json.dumps({"org_name": org_name}))
+            "/v1/admin/org", data=codec.dumps({"org_name": org_name}))
 
-        return CreateOrganizationResponse.from_dict(json.loads(resp.text)['org'])
+        return CreateOrganizationResponse.from_dict(codec.loads(resp.content)['org'])
 
     def org_delete(self, org_id: str) -> None:
         resp = self.api_delete(
-            "/v1/admin/org", data=json.dumps({"id": org_id}), headers={"X-Sevco-Target-Org": org_id})
+            "/v1/admin/org", data=codec.dumps({"id": org_id}), headers={"X-Sevco-Target-Org": org_id})
 
     def list_users(self) -> List[User]:
         resp = self.api_get("/v1/admin/user")
 
-        return [User.from_dict(o) for o in json.loads(resp.text)['items']]
+        return [User.from_dict(o) for o in codec.loads(resp.content)['items']]
 
     def get_user(self, email: str) -> User:
         resp = self.api_get(f"/v1/admin/user/{email}")
 
-        return User.from_dict(json.loads(resp.text))
+        return User.from_dict(codec.loads(resp.content))
 
     def add_user(self, email: str) -> str:
         resp = self.api_post(f"/v1/admin/user/{email}")
 
-        return json.loads(resp.text)['user']['email']
+        return codec.loads(resp.content)['user']['email']
 
     def delete_user(self, email: str):
         self.api_delete(f"/v1/admin/user/{email}")
@@ -46,7 +44,7 @@ class TenantClient(SevcoClient):
     def roles(self) -> List[Role]:
         resp = self.api_get("/v1/admin/role")
 
-        return [Role.from_dict(r) for r in json.loads(resp.text)]
+        return [Role.from_dict(r) for r in codec.loads(resp.content)]
 
     def user_add_role(self, email: str, role_name: str):
         self.api_put(f"/v1/admin/user/{email}/role/{role_name}")
@@ -57,11 +55,11 @@ class TenantClient(SevcoClient):
     def service_account_jwt(self, org_id: str) -> str:
         resp = self.api_get(f"/v1/admin/org/{org_id}/account")
 
-        d = json.loads(resp.text)
+        d = codec.loads(resp.content)
 
         return f"{d['token_type']} {d['access_token']}"
 
     def svc_token(self, org_id: str) -> str:
         resp = self.api_get(f"/v1/admin/org/{org_id}/apikey")
 
-        return json.loads(resp.text)['apiKey']
+        return codec.loads(resp.content)['apiKey']
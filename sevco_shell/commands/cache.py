@@ -0,0 +1,60 @@
+from sevco_shell.clients.artifacts import ArtifactStore
+from sevco_shell.clients.cache import response_cache
+from sevco_shell.clients.schema.cache import schema_cache
+from sevco_shell.clients.session import default_pool
+from sevco_shell.commands.command import Command, CommandBuilder
+
+
+def CacheCmd():
+    builder = CommandBuilder('cache')
+
+    @builder.from_cls()
+    class _CacheCmd(Command):
+        '''Cache - inspect and clear the local API response cache'''
+
+        def emptyline(self):
+            return self.do_stats('')
+
+        @builder.cmd(permissions=[])
+        def do_stats(self, _arg):
+            '''show response cache and connection pool statistics'''
+            cache = response_cache()
+            if cache is None:
+                print("Response cache disabled")
+            else:
+                stats = cache.stats()
+                print(f"Cache:       {cache.root}")
+                print(f"Entries:     {stats.entries} ({stats.bytes / 1024:.1f} KiB of {cache.max_bytes / 1024 / 1024:.0f} MiB)")
+                print(f"Hits:        {stats.hits}")
+                print(f"Misses:      {stats.misses}")
+                print(f"Revalidated: {stats.revalidated}")
+                print(f"Stored:      {stats.stored}")
+                print(f"Invalidated: {stats.invalidated}")
+                print(f"Evicted:     {stats.evicted}")
+
+            schemas = schema_cache()
+            if schemas is not None:
+                print(f"Schemas:     {schemas.entries()} cached in {schemas.path}")
+
+            store = ArtifactStore.from_env()
+            artifacts = store.stats()
+            print(f"Artifacts:   {artifacts.refs} refs to {artifacts.blobs} binaries ({artifacts.bytes / 1024 / 1024:.1f} MiB of {store.max_bytes / 1024 / 1024:.0f} MiB) in {store.root}")
+
+            pool = default_pool().stats()
+            print(f"Connections: {pool.requests} requests over {pool.misses} connections to {pool.hosts} host(s), {pool.hits} reused")
+
+        @builder.cmd(permissions=[])
+        def do_clear(self, _arg):
+            '''remove all cached responses and schemas'''
+            cache = response_cache()
+            if cache is None:
+                print("Response cache disabled")
+                return
+
+            print(f"Removed {cache.clear()} cached responses")
+
+            schemas = schema_cache()
+            if schemas is not None:
+                print(f"Removed {schemas.clear()} cached schemas")
+
+    return builder.build()()
@@ -1,40 +1,172 @@
 import colorama
 import cmd
 import inspect
-from typing import Any, List, Optional, Tuple, Type
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future
+from typing import (TYPE_CHECKING, Any, Callable, Dict, Iterable, List,
+                    Optional, Tuple, Type)
+
+if TYPE_CHECKING:
+    from sevco_shell.config.credentials import ApiCredentials
+
+MIB = 1024 * 1024
+
+
+def parse_options(arg: str) -> Tuple[List[str], Dict[str, str]]:
+    '''Split "a b key=value" into positional args and options'''
+    positional, options = [], {}
+    for token in arg.split():
+        key, sep, value = token.partition('=')
+        if sep:
+            options[key.lower()] = value
+        else:
+            positional.append(token)
+
+    return positional, options
+
+
+def progress_printer() -> Callable[[int, Optional[int]], None]:
+    '''Progress callback printing transferred size and rate on one line.
 
-from sevco_shell.config.credentials import ApiCredentials
+    The rate only counts bytes after the first call, so the size of a resumed
+    download reported up front does not inflate it.
+    '''
+    start = time.monotonic()
+    first: List[int] = []
+
+    def progress(done: int, total: Optional[int]):
+        if not first:
+            first.append(done)
+        rate = (done - first[0]) / max(time.monotonic() - start, 1e-6)
+        size = f"{done / MIB:.1f}/{total / MIB:.1f} MiB" if total else f"{done / MIB:.1f} MiB"
+        print(f"\r{size} {rate / MIB:.1f} MiB/s ", end="", flush=True)
+
+    return progress
 
 
 class Command(cmd.Cmd):
     def __init__(self):
         super().__init__()
 
+    def default(self, line):
+        from sevco_shell.builders.builder import Builder
+
+        if not Builder.interactive():
+            # A mistyped subcommand must fail the batch run, not print and carry on
+            raise Exception(f"unknown command: {line}")
+
+        return super().default(line)
+
 
 class CommandWithList(Command):
+    # Seconds a fetched list is shown without checking for changes. Once stale,
+    #  the cached rows are still shown straight away while they are refetched in
+    #  the background, and the next listing shows any changes. With
+    #  SVSH_LIST_REDRAW set a changed list is redrawn as soon as it arrives.
+    list_ttl = float(os.environ.get("SVSH_LIST_TTL", 30))
+    list_redraw = os.environ.get("SVSH_LIST_REDRAW", "").lower() in ("1", "true", "yes", "on")
+
     def __init__(self):
         super().__init__()
         self._things = None
+        self._fetched = 0.0
+        self._generation = 0
+        self._pending: Optional[Future] = None
+        self._revalidating: Optional[threading.Thread] = None
 
     @property
     def things(self) -> List[Any]:
         if self._things is None:
-            self._things = self.get_things()
+            pending, self._pending = self._pending, None
+            # A failed prefetch raises here, when the list is first used
+            self._things = pending.result() if pending is not None else self.get_things()
+            self._fetched = time.monotonic()
 
         return self._things
 
+    def prefetch(self, executor: Executor):
+        '''Start loading the list in the background, the first use waits for it'''
+        if self._things is None and self._pending is None:
+            self._pending = executor.submit(self.get_things)
+
     def _clear_list(self):
+        self._generation += 1
         self._things = None
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+
+    def _discard(self, thing: Any):
+        '''Drop a deleted item from the cached list without refetching it'''
+        if self._things is not None:
+            self._generation += 1
+            self._things = [t for t in self._things if t is not thing]
+
+    def _is_stale(self) -> bool:
+        return time.monotonic() - self._fetched >= self.list_ttl
+
+    def _revalidate(self):
+        if self._revalidating is not None and self._revalidating.is_alive():
+            return
+
+        generation = self._generation
+
+        def revalidate():
+            from sevco_shell.clients.cache import bypass
+
+            try:
+                # Past the response cache too, its entries can outlive list_ttl
+                with bypass():
+                    things = self.get_things()
+            except Exception:
+                # Keep showing the cached rows, the next refresh reports the error
+                return
+
+            # Mutations made meanwhile invalidate this result
+            if generation != self._generation or self._things is None:
+                return
+
+            self._fetched = time.monotonic()
+            if things != self._things:
+                self._things = things
+                if self.list_redraw:
+                    print("\n(list updated)")
+                    self._print_list()
+
+        self._revalidating = threading.Thread(target=revalidate, daemon=True)
+        self._revalidating.start()
+
+    def default(self, line):
+        if line.strip() == 'list':
+            return self._do_list()
+
+        return super().default(line)
 
     def emptyline(self):
         self._do_list()
 
-    def _list(self):
+    def do_refresh(self, _arg):
+        '''refetch the list now'''
+        from sevco_shell.clients.cache import bypass
+
         self._clear_list()
+        with bypass():
+            return self._do_list()
+
+    def _list(self):
+        if self._things is not None and self._is_stale():
+            self._revalidate()
+
+        self._print_list()
+
+    def _print_list(self):
+        things = self.things
 
         print()
 
-        idx_width = len(f"[{len(self.things)}]")
+        idx_width = len(f"[{len(things)}]")
 
         header = ''.rjust(idx_width)
         for label, width in self.things_header():
@@ -46,7 +178,7 @@ class CommandWithList(Command):
 
         print(header)
 
-        for x, thing in enumerate(self.things, start=1):
+        for x, thing in enumerate(things, start=1):
             idx = f"{colorama.Style.DIM}[{colorama.Style.NORMAL}{str(x).rjust(idx_width-2)}{colorama.Style.DIM}]{colorama.Style.NORMAL}"
             print(f"{idx} {self.format_thing(thing)}")
 
@@ -75,11 +207,57 @@ class CommandWithList(Command):
             raise Exception("Requires integer index")
 
 
+# One bit per permission name, assigned as commands declare them
+_permission_bits: Dict[str, int] = {}
+_permission_lock = threading.Lock()
+_last_credentials_mask: Tuple[Optional[List[str]], int] = (None, 0)
+
+# Built command classes by (module, class, basecmd, granted permission bits)
+_built_cmds: Dict[Tuple[str, str, str, int], Type] = {}
+
+
+def permission_mask(permissions: Iterable[str]) -> int:
+    mask = 0
+    for permission in permissions:
+        bit = _permission_bits.get(permission)
+        if bit is None:
+            with _permission_lock:
+                bit = _permission_bits.setdefault(permission, 1 << len(_permission_bits))
+        mask |= bit
+
+    return mask
+
+
+def credentials_mask(credentials: Optional['ApiCredentials']) -> int:
+    global _last_credentials_mask
+
+    if credentials is None:
+        return 0
+
+    # permissions() hands back the same cached list until the token changes
+    permissions = credentials.permissions()
+    last_permissions, mask = _last_credentials_mask
+    if permissions is not last_permissions:
+        mask = permission_mask(permissions)
+        _last_credentials_mask = (permissions, mask)
+
+    return mask
+
+
 class CommandBuilder:
-    def __init__(self, basecmd: str, credentials: ApiCredentials = None):
+    '''Filters a command class's do_* methods by the caller's permissions.
+
+    Command factories define their class on every call. Only the first build
+    for each (class, granted permissions) does any work; later builds return
+    that class, so command methods must reach factory arguments through self
+    rather than closing over them.
+    '''
+
+    def __init__(self, basecmd: str, credentials: 'ApiCredentials' = None):
         self.basecmd = basecmd
         self.credentials = credentials
-        self.perms = {}
+        self.perms: Dict[str, int] = {}
+        self.empty_cmds: List[str] = []
         self.cmd_class: Optional[Type[Command]] = None
 
     def from_cls(self):
@@ -90,50 +268,84 @@ class CommandBuilder:
 
     def cmd(self, permissions: List[str]):
         def decorator(f):
-            self.perms[f.__name__] = set(permissions)
-            f.__doc__ = self.build_docstring(f)
+            self.perms[f.__name__] = permission_mask(permissions)
             return f
         return decorator
 
     def empty_cmd(self):
         def decorator(f):
-            arg = self.get_func_arg(f)
-            if not arg or arg.startswith('_'):
-                cmd = f"{self.basecmd}"
-            else:
-                cmd = f"{self.basecmd} [{arg}]"
-            f.__doc__ = f"{cmd.ljust(30)}{inspect.getdoc(f)}"
-
+            self.empty_cmds.append(f.__name__)
             return f
         return decorator
 
     def build(self) -> Type:
         assert self.cmd_class
 
-        jwt_permissions = set(self.credentials.permissions()
-                              ) if self.credentials else set()
+        required = 0
+        for mask in self.perms.values():
+            required |= mask
+        granted = credentials_mask(self.credentials) & required
+
+        key = (self.cmd_class.__module__, self.cmd_class.__qualname__, self.basecmd, granted)
+        built = _built_cmds.get(key)
+        if built is None:
+            built = _built_cmds.setdefault(key, self._build(granted))
+
+        return built
+
+    def _build(self, granted: int) -> Type:
+        for name in self.empty_cmds:
+            f = getattr(self.cmd_class, name)
+            arg = self.get_func_arg(f)
+            if not arg or arg.startswith('_'):
+                usage = f"{self.basecmd}"
+            else:
+                usage = f"{self.basecmd} [{arg}]"
+            f.__doc__ = f"{usage.ljust(30)}{inspect.getdoc(f)}"
 
         for f in [f for f in dir(self.cmd_class) if f.startswith("do_")]:
             permissions = self.perms.get(f)
-            if permissions and not permissions & jwt_permissions:
+            if permissions and not permissions & granted:
                 delattr(self.cmd_class, f)
+            elif f in self.perms:
+                func = getattr(self.cmd_class, f)
+                func.__doc__ = self.build_docstring(func)
+            elif f != 'do_help' and f not in vars(self.cmd_class):
+                self.inherit_cmd(f)
 
-        help_text = f"{inspect.getdoc(self.cmd_class)}\n\n"
-        for f in [f for f in dir(self.cmd_class) if (f.startswith("do_") or f.startswith('_do_')) and f != 'do_help']:
-            func = getattr(self.cmd_class, f)
-            help_text += f"{inspect.getdoc(func)}\n"
+        help_text: List[str] = []
+        cmd_class = self.cmd_class
 
         def do_help(self, arg):
             if arg:
                 return cmd.Cmd.do_help(self, arg)
 
-            print(help_text)
+            if not help_text:
+                text = f"{inspect.getdoc(cmd_class)}\n\n"
+                for f in [f for f in dir(cmd_class) if (f.startswith("do_") or f.startswith('_do_')) and f != 'do_help']:
+                    text += f"{inspect.getdoc(getattr(cmd_class, f))}\n"
+                help_text.append(text)
+
+            print(help_text[0])
             return False
 
         setattr(self.cmd_class, 'do_help', do_help)
 
         return self.cmd_class
 
+    def inherit_cmd(self, name: str):
+        '''Give an inherited do_* command (e.g. do_refresh) help text for this command'''
+        func = getattr(self.cmd_class, name)
+
+        def inherited(self, _arg):
+            return func(self, _arg)
+
+        inherited.__name__ = name
+        inherited.__doc__ = func.__doc__
+        inherited.__doc__ = self.build_docstring(inherited)
+
+        setattr(self.cmd_class, name, inherited)
+
     def build_docstring(self, func) -> str:
         arg = self.get_func_arg(func)
         if arg.startswith('_'):
@@ -0,0 +1,142 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, List
+
+from sevco_shell.clients.fanout import Query, fan_out
+from sevco_shell.clients.runner.async_client import AsyncRunnerServiceClient
+from sevco_shell.clients.source_audit.async_client import AsyncSourceAuditClient
+from sevco_shell.clients.source_catalog.client import SourceCatalogClient
+from sevco_shell.clients.source_config.async_client import AsyncSourceConfigClient
+from sevco_shell.clients.tenant.async_client import AsyncTenantClient
+from sevco_shell.clients.tenant.client import TenantClient
+from sevco_shell.clients.tenant.models import Organization
+from sevco_shell.commands.command import Command, CommandBuilder, parse_options
+from sevco_shell.config.credentials import ApiCredentials
+
+DEFAULT_CONCURRENCY = 8
+
+
+def FanoutCmd(credentials: ApiCredentials):
+    builder = CommandBuilder('fanout', credentials=credentials)
+
+    @builder.from_cls()
+    class _FanoutCmd(Command):
+        '''Fanout - run a read query in every org [org=NAME] [concurrency=8]'''
+
+        def __init__(self, credentials: ApiCredentials):
+            super().__init__()
+            self.credentials = credentials
+            self.tenant_client = TenantClient(
+                credentials.api_host, credentials.auth_token)
+
+        def emptyline(self):
+            return self.do_help('')
+
+        def _orgs(self, options: Dict[str, str]) -> List[Organization]:
+            orgs = self.tenant_client.org_list()
+            name = options.get('org')
+            if name:
+                orgs = [o for o in orgs if name.lower() in o.org_name.lower()]
+
+            return sorted(orgs, key=lambda o: o.org_name)
+
+        def _run(self, options: Dict[str, str], query: Query, format_item: Callable[[Any], str]):
+            orgs = self._orgs(options)
+            concurrency = int(options.get('concurrency', DEFAULT_CONCURRENCY))
+            width = max([len(o.org_name) for o in orgs] + [3])
+
+            matches, failed = 0, 0
+            start = time.monotonic()
+
+            async def stream():
+                nonlocal matches, failed
+                async for result in fan_out(orgs, query, concurrency=concurrency):
+                    if not result.ok:
+                        failed += 1
+                        print(f"{result.org.org_name.rjust(width)} error: {result.error}")
+                        continue
+
+                    matches += len(result.items)
+                    for item in result.items:
+                        print(f"{result.org.org_name.rjust(width)} {format_item(item)}")
+
+            asyncio.run(stream())
+
+            print(f"\n{matches} results from {len(orgs) - failed} orgs ({failed} failed) in {time.monotonic() - start:.1f}s")
+
+        def _client(self, client_cls, org: Organization):
+            return client_cls(self.credentials.api_host, self.credentials.auth_token, target_org=org.id)
+
+        @builder.cmd(permissions=['admin:source:config:read', 'source:config:read'])
+        def do_configs(self, arg):
+            '''list configs in every org [source=NAME] [enabled=true|false]'''
+            _, options = parse_options(arg)
+
+            try:
+                sources = {s.id: s.display_name for s in SourceCatalogClient(
+                    self.credentials.api_host, self.credentials.auth_token).list()}
+            except Exception:
+                sources = {}
+
+            source = options.get('source', '').lower()
+            enabled = options['enabled'].lower() in ('true', 'yes', '1') if 'enabled' in options else None
+
+            async def query(org: Organization):
+                configs = await self._client(AsyncSourceConfigClient, org).list(is_enabled=enabled, oauth_refresh=False)
+                if enabled is not None:
+                    configs = [c for c in configs if c.enabled == enabled]
+                if source:
+                    configs = [c for c in configs if source in (c.source_id.lower(), sources.get(c.source_id, '').lower())]
+                return configs
+
+            def format_config(c) -> str:
+                state = "enabled" if c.enabled else "disabled"
+                return f"{c.id.rjust(36)} {sources.get(c.source_id, c.source_id).rjust(30)} {state}"
+
+            self._run(options, query, format_config)
+
+        @builder.cmd(permissions=['admin:runner:get', 'runner:get'])
+        def do_runners(self, arg):
+            '''list runners in every org'''
+            _, options = parse_options(arg)
+
+            async def query(org: Organization):
+                return await self._client(AsyncRunnerServiceClient, org).list()
+
+            def format_runner(r) -> str:
+                return f"{(r.display_name or r.hostname or r.runner_id).rjust(26)} {str(r.version).rjust(12)} {str(r.last_checkin_time).rjust(32)}"
+
+            self._run(options, query, format_runner)
+
+        @builder.cmd(permissions=['org:user:read'])
+        def do_users(self, arg):
+            '''list users in every org'''
+            _, options = parse_options(arg)
+
+            async def query(org: Organization):
+                return await self._client(AsyncTenantClient, org).list_users()
+
+            def format_user(u) -> str:
+                return f"{u.nickname.rjust(20)} {u.email.rjust(30)}"
+
+            self._run(options, query, format_user)
+
+        @builder.cmd(permissions=['admin:source:audit:read', 'source:audit:read'])
+        def do_executions(self, arg):
+            '''latest N (default 5) executions in every org [failed]'''
+            positional, options = parse_options(arg)
+            n = int(positional[0]) if positional and positional[0].isdigit() else 5
+            only_failed = 'failed' in positional
+
+            async def query(org: Organization):
+                executions = await self._client(AsyncSourceAuditClient, org).list("execution", per_page=n)
+                if only_failed:
+                    executions = [e for e in executions if e.execution.exit_code != 0]
+                return executions
+
+            def format_execution(e) -> str:
+                return f"{str(e.execution.completed_timestamp).rjust(32)} {e.execution.source_config_id.rjust(36)} exit {str(e.execution.exit_code).rjust(3)} {e.result.status_code}"
+
+            self._run(options, query, format_execution)
+
+    return builder.build()(credentials)
@@ -65,6 +65,8 @@ def OrgsCmd(credentials: ApiCredentials):
         def do_add(self, _arg):
             '''add new org'''
             org = OrgBuilder(credentials=self.credentials).from_user().build()
+            if org:
+                self._clear_list()
 
         @builder.cmd(permissions=['admin:orgs:delete', 'tenant:orgs:delete'])
         def do_del(self, idx):
@@ -75,6 +77,7 @@ def OrgsCmd(credentials: ApiCredentials):
 
             if Builder.get_yes_no(f"Really delete {selected.org_name}?", default_yes=False):
                 self.client.org_delete(selected.id)
+                self._discard(selected)
                 print(f"Deleted {selected.org_name}")
 
         @builder.cmd(permissions=['admin:orgs:account', 'orgs:account'])
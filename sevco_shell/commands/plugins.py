@@ -1,8 +1,14 @@
+import os
+
 import colorama
+from sevco_shell.builders.builder import Builder
 from sevco_shell.builders.plugin import PluginBuilder
+from sevco_shell.clients.artifacts import (ArtifactStore, download_url,
+                                           plugin_key)
 from sevco_shell.clients.plugin_repository.client import PluginClient
 from sevco_shell.clients.plugin_repository.models import Plugin
-from sevco_shell.commands.command import CommandBuilder, CommandWithList
+from sevco_shell.commands.command import (CommandBuilder, CommandWithList,
+                                          progress_printer)
 from sevco_shell.config import Config
 
 
@@ -46,7 +52,8 @@ def PluginsCmd(config: Config, source_id: str):
         @builder.cmd(permissions=['admin:source:plugins:create'])
         def do_add(self, arg):
             '''add new source plugin'''
-            PluginBuilder(self.config, self.source_id).from_user().build()
+            if PluginBuilder(self.config, self.source_id).from_user().build():
+                self._clear_list()
 
         @builder.cmd(permissions=['admin:source:plugins:update'])
         def do_default(self, idx):
@@ -54,6 +61,39 @@ def PluginsCmd(config: Config, source_id: str):
             selected: Plugin = self.get_thing_by_index(self.arg_as_idx(idx))
 
             self.client.set_default(selected.id)
+            # Only the default marker moves, the plugin list itself is unchanged
+            self.defaults[selected.os] = selected.id
             print("Default updated")
 
+        @builder.cmd(permissions=['admin:source:plugins:download', 'source:plugins:download'])
+        def do_download(self, idx):
+            '''download plugin [idx] binary'''
+            selected: Plugin = self.get_thing_by_index(self.arg_as_idx(idx))
+
+            default_target = f"~/Downloads/{self.source_id}-{selected.version}-{selected.os.value}"
+            target = None
+            while target is None:
+                target = Builder.get_input(
+                    f"Save binary to [{default_target}]", required=False) or os.path.expanduser(default_target)
+
+                if os.path.exists(target):
+                    if not Builder.get_yes_no(f"{target} exists. Overwrite?", default_yes=False):
+                        target = None
+
+            def download(path: str):
+                # Pre-signed URLs are short lived, only ask for one on a miss
+                url = self.client.download(selected.id)
+                download_url(url, path, self.client.pool.session, progress=progress_printer())
+                print()
+
+            store = ArtifactStore.from_env()
+            artifact = store.fetch(plugin_key(selected.os.value, selected.version, selected.signature), download,
+                                   meta={'plugin_id': selected.id, 'source_id': self.source_id})
+            store.export(artifact, target)
+
+            if artifact.hit:
+                print("Using cached binary from the local artifact store")
+            print(f"Plugin {selected.version} ({selected.os.value}) saved to: {target}")
+            print(f"sha256: {artifact.sha256}")
+
     return builder.build()(config, source_id)
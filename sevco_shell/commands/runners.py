@@ -1,16 +1,32 @@
+import asyncio
 import datetime
 import os
 import platform
 import stat
+import time
 from pathlib import Path
 from pprint import pprint
 
 from sevco_shell.builders.builder import Builder
+from sevco_shell.clients.artifacts import ArtifactStore, runner_key
+from sevco_shell.clients.fanout import fan_out
+from sevco_shell.clients.runner.async_client import AsyncRunnerServiceClient
 from sevco_shell.clients.runner.client import RunnerServiceClient
+from sevco_shell.clients.runner.health import (DEFAULT_STALE_AFTER,
+                                               DEFAULT_TIMEOUT, HealthReport,
+                                               probe_runners)
 from sevco_shell.clients.runner.models import Runner
-from sevco_shell.commands.command import CommandBuilder, CommandWithList
+from sevco_shell.clients.tenant.client import TenantClient
+from sevco_shell.commands.command import (MIB, CommandBuilder,
+                                          CommandWithList, parse_options,
+                                          progress_printer)
 from sevco_shell.config import Config
 
+# The download endpoint only serves the latest build, so cached copies expire
+RUNNER_LATEST_TTL = 60 * 60
+DEFAULT_WATCH_INTERVAL = 30.0
+HEALTH_USAGE = "health [all] [watch [N]] [timeout=5] [stale=10]"
+
 
 def RunnersCmd(config: Config):
     builder = CommandBuilder('runners', config.credentials)
@@ -59,6 +75,85 @@ def RunnersCmd(config: Config):
             selected = self.get_thing_by_index(self.arg_as_idx(idx))
             if Builder.get_yes_no(f"Really delete runner {selected.display_name}?", default_yes=False):
                 self.client.delete(selected.runner_id)
+                self._discard(selected)
+
+        @builder.cmd(permissions=['admin:runner:get', 'runner:get'])
+        def do_health(self, arg):
+            '''ping runners and report latency, stale and unreachable runners [all] [watch [N]] [timeout=5] [stale=10]'''
+            positional, options = parse_options(arg)
+            across_orgs = 'all' in positional
+            try:
+                interval = None
+                if 'watch' in positional:
+                    following = positional[positional.index('watch') + 1:]
+                    # watch on its own, or followed by 'all', uses the default interval
+                    interval = float(following[0]) if following and following[0] != 'all' else DEFAULT_WATCH_INTERVAL
+                    if interval <= 0:
+                        raise ValueError(interval)
+                timeout = float(options.get('timeout', DEFAULT_TIMEOUT))
+                stale_after = datetime.timedelta(minutes=float(options['stale'])) if 'stale' in options else DEFAULT_STALE_AFTER
+            except ValueError:
+                print(f"usage: {HEALTH_USAGE}")
+                return
+
+            try:
+                while True:
+                    report = self._probe(across_orgs, timeout, stale_after)
+                    self._print_health(report, across_orgs)
+
+                    if interval is None:
+                        return
+                    time.sleep(interval)
+            except KeyboardInterrupt:
+                print()
+
+        def _probe(self, across_orgs: bool, timeout: float, stale_after: datetime.timedelta) -> HealthReport:
+            credentials = self.config.credentials
+            start = time.monotonic()
+
+            async def probe_org() -> HealthReport:
+                client = AsyncRunnerServiceClient(credentials.api_host, credentials.auth_token, target_org=self.config.org.id)
+                return HealthReport(probes=await probe_runners(client, timeout=timeout, stale_after=stale_after))
+
+            async def probe_all() -> HealthReport:
+                async def query(org):
+                    client = AsyncRunnerServiceClient(credentials.api_host, credentials.auth_token, target_org=org.id)
+                    return await probe_runners(client, timeout=timeout, stale_after=stale_after, org_name=org.org_name)
+
+                report = HealthReport()
+                orgs = TenantClient(credentials.api_host, credentials.auth_token).org_list()
+                async for result in fan_out(orgs, query):
+                    if result.ok:
+                        report.probes.extend(result.items)
+                    else:
+                        print(f"{result.org.org_name}: unable to list runners: {result.error}")
+                return report
+
+            report = asyncio.run(probe_all() if across_orgs else probe_org())
+            report.elapsed = time.monotonic() - start
+
+            return report
+
+        def _print_health(self, report: HealthReport, across_orgs: bool):
+            def name(probe) -> str:
+                runner_name = probe.runner.display_name or probe.runner.hostname or probe.runner.runner_id
+                return f"{probe.org_name}/{runner_name}" if across_orgs else runner_name
+
+            def ms(v) -> str:
+                return f"{v * 1000:.0f}ms" if v is not None else "-"
+
+            print(f"\n{datetime.datetime.now():%H:%M:%S} probed {len(report.probes)} runners in {report.elapsed:.1f}s")
+            print(f"latency p50 {ms(report.percentile(50))}  p95 {ms(report.percentile(95))}  p99 {ms(report.percentile(99))}")
+
+            if report.unreachable:
+                print(f"unreachable ({len(report.unreachable)}):")
+                for probe in report.unreachable:
+                    print(f"  {name(probe).rjust(40)} {probe.error}")
+
+            if report.stale:
+                print(f"stale check-in ({len(report.stale)}):")
+                for probe in report.stale:
+                    print(f"  {name(probe).rjust(40)} {probe.runner.last_checkin_time or 'never'}")
 
         @builder.cmd(permissions=['admin:runner:download', 'runner:download'])
         def do_download(self, _arg):
@@ -78,15 +173,26 @@ def RunnersCmd(config: Config):
                     if not Builder.get_yes_no(f"{target} exists. Overwrite?", default_yes=False):
                         target = None
 
-            runner_binary_bytes = self.client.download(runner_os)
+            downloads = []
+
+            def download(path: str):
+                downloads.append(self.client.download_to(runner_os, path, progress=progress_printer()))
+                print()
 
-            os.makedirs(os.path.basename(target), exist_ok=True)
-            with open(target, "wb") as f:
-                f.write(runner_binary_bytes)
+            store = ArtifactStore.from_env()
+            artifact = store.fetch(runner_key(runner_os), download, max_age=RUNNER_LATEST_TTL, meta={'os': runner_os})
+            store.export(artifact, target)
 
             p = Path(target)
             p.chmod(p.stat().st_mode | stat.S_IXUSR)
 
+            if artifact.hit:
+                print("Using cached binary from the local artifact store")
+            for result in downloads:
+                if result.resumed_from:
+                    print(f"Resumed from {result.resumed_from / MIB:.1f} MiB")
+                print(f"Downloaded {result.size / MIB:.1f} MiB at {result.rate / MIB:.1f} MiB/s")
             print(f"Runner {runner_os} binary saved to: {target}")
+            print(f"sha256: {artifact.sha256}")
 
     return builder.build()(config)
@@ -38,7 +38,7 @@ def ScheduleCmd(config: Config, source: Source):
             '''delete source schedule - disables automatic data collection'''
             if Builder.get_yes_no("Really delete schedule?"):
                 self.client.delete(self.source.id)
-                print(f"{source.display_name} schedule removed")
+                print(f"{self.source.display_name} schedule removed")
 
         @builder.cmd(permissions=['admin:source:schedule:create', 'source:schedule:create', 'admin:source:schedule:update', 'source:schedule:update'])
         def do_set(self, _arg):
@@ -1,6 +1,9 @@
 from pprint import pprint
 
 from sevco_shell.builders.source import SourceSchemaBuilder
+from sevco_shell.clients.cache import bypass
+from sevco_shell.clients.schema.cache import (invalidate_source_schemas,
+                                              load_source_schemas)
 from sevco_shell.clients.schema.client import SourceSchemaClient
 from sevco_shell.clients.schema.models import (SourceSchemaByName,
                                                SourceSchemaByNameArray,
@@ -26,7 +29,11 @@ def SchemasCmd(config: Config, source: Source):
                 api_host=config.credentials.api_host, auth_token=config.credentials.auth_token, target_org=config.org.id)
 
         def get_things(self):
-            return self.schema_client.get(self.source.id)
+            return load_source_schemas(self.schema_client, self.source.id)
+
+        def _clear_list(self):
+            invalidate_source_schemas(self.schema_client, self.source.id)
+            super()._clear_list()
 
         def things_header(self):
             return [("Schema", 20)]
@@ -50,18 +57,22 @@ def SchemasCmd(config: Config, source: Source):
             '''delete source schema'''
             selected: SourceSchemas = self.get_thing_by_index(self.arg_as_idx(idx))
 
-            all_schemas = self.schema_client.get(self.source.id)
+            # The whole list is rewritten, read it from the server rather than the schema cache
+            with bypass():
+                all_schemas = self.schema_client.get(self.source.id)
             updated = [SourceSchemaByName(info=schema.info,
                                           auth=schema.auth['title'],
                                           connect=schema.connect['title'],
                                           settings=schema.settings['title']) for schema in all_schemas if schema.info.description != selected.info.description]
             self.schema_client.update(
                 self.source.id, SourceSchemaByNameArray(types=updated))
+            self._discard(selected)
 
         @builder.cmd(permissions=['admin:source:update'])
         def do_add(self, arg):
             '''add source schemas'''
-            SourceSchemaBuilder(config=self.config,
-                                source_id=self.source.id).from_user().build()
+            if SourceSchemaBuilder(config=self.config,
+                                   source_id=self.source.id).from_user().build():
+                self._clear_list()
 
     return builder.build()(config, source)
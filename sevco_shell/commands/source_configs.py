@@ -1,15 +1,20 @@
-from datetime import datetime
 from pprint import pprint
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from sevco_shell.builders.builder import Builder
+from sevco_shell.clients.scheduler.bulk import (BulkExecutor, BulkResult,
+                                                last_failed, parse_indexes)
 from sevco_shell.clients.scheduler.client import SchedulerServiceClient
 from sevco_shell.clients.source_audit.client import SourceAuditClient
 from sevco_shell.clients.source_catalog.client import SourceCatalogClient
 from sevco_shell.clients.source_catalog.models import Source
 from sevco_shell.clients.source_config.client import SourceConfigClient
+from sevco_shell.clients.source_config.index import SourceConfigIndex
 from sevco_shell.clients.source_config.model import SourceConfig
 from sevco_shell.clients.source_oauth.client import SourceOAuthClient
+from sevco_shell.clients.source_oauth.refresher import (OAuthRefresher,
+                                                        refresh_on_list,
+                                                        refresh_stats)
 from sevco_shell.commands.command import CommandBuilder, CommandWithList
 from sevco_shell.config import Config
 
@@ -33,15 +38,44 @@ def SourceConfigsCmd(config: Config, source: Optional[Source] = None):
 
             catalog_client = SourceCatalogClient(
                 api_host=config.credentials.api_host, auth_token=config.credentials.auth_token, target_org=config.org.id)
+            self.oauth_refresh = refresh_on_list()
+            self.refresher = OAuthRefresher(SourceOAuthClient(
+                api_host=config.credentials.api_host, auth_token=config.credentials.auth_token, target_org=config.org.id))
+            self.index = SourceConfigIndex(self.client, source_id=self.source.id if self.source else None,
+                                           oauth_refresh=self.oauth_refresh)
             self.sources_by_id = {self.source.id: self.source} if self.source else {
                 source.id: source for source in catalog_client.list()}
 
         def get_things(self):
-            def get_timestamp(x: SourceConfig) -> datetime:
-                assert x.last_updated_timestamp
-                return x.last_updated_timestamp
+            self.index.sync()
+            configs = self.index.configs()
+            if not self.oauth_refresh:
+                self.refresher.listed(configs)
 
-            return sorted(self.client.list(source_id=self.source.id if self.source else None), key=get_timestamp, reverse=True)
+            return configs
+
+        def get_fresh_config(self, idx) -> SourceConfig:
+            '''Config [idx], with its OAuth token refreshed if it is about to expire'''
+            selected: SourceConfig = self.get_thing_by_index(self.arg_as_idx(idx))
+            if self.oauth_refresh:
+                return selected
+
+            fresh = self.refresher.ensure_fresh_one(selected)
+            self._keep_refreshed([selected], [fresh])
+
+            return fresh
+
+        def _keep_refreshed(self, configs: List[SourceConfig], fresh: List[SourceConfig]):
+            '''Hold refreshed configs in the index and the listed rows, so their tokens are not refreshed again'''
+            refreshed = {f.id: f for c, f in zip(configs, fresh) if f is not c}
+            if not refreshed:
+                return
+
+            for config in refreshed.values():
+                self.index.replace(config)
+            if self._things is not None:
+                self._generation += 1
+                self._things = [refreshed.get(t.id, t) for t in self._things]
 
         def things_header(self):
             return [("ID", 36), ("Source", 40)]
@@ -59,18 +93,17 @@ def SourceConfigsCmd(config: Config, source: Optional[Source] = None):
         def do_info(self, idx):
             '''retrieve details for config [idx]'''
 
-            selected: SourceConfig = self.get_thing_by_index(
-                self.arg_as_idx(idx))
+            selected = self.get_fresh_config(idx)
 
             pprint(selected.as_dict())
 
         @builder.cmd(permissions=['admin:source:audit:read', 'source:audit:read'])
         def do_audit(self, idx_n):
-            '''retrieve last N execution audit logs for config [idx]'''
+            '''retrieve last N (default 10, or 'all') execution audit logs for config [idx]'''
 
             idx, _, n = idx_n.partition(' ')
 
-            n = int(n) if n else 10
+            limit = None if n.strip() == 'all' else (int(n) if n else 10)
 
             selected: SourceConfig = self.get_thing_by_index(
                 self.arg_as_idx(idx))
@@ -78,7 +111,7 @@ def SourceConfigsCmd(config: Config, source: Optional[Source] = None):
             client = SourceAuditClient(
                 api_host=self.config.credentials.api_host, auth_token=self.config.credentials.auth_token, target_org=self.config.org.id)
 
-            for audit in client.list("execution", source_config_id=selected.id, per_page=n):
+            for audit in client.iter_list("execution", source_config_id=selected.id, limit=limit):
                 pprint(audit.as_dict(), width=240)
 
         @builder.cmd(permissions=['admin:source:config:write', 'source:config:write'])
@@ -108,15 +141,89 @@ def SourceConfigsCmd(config: Config, source: Optional[Source] = None):
 
             if Builder.get_yes_no(f"Really delete {selected.id}?", default_yes=False):
                 self.client.delete(selected.id)
+                self.index.remove(selected.id)
+                self._discard(selected)
                 print(f"Deleted {selected.id}")
 
         @builder.cmd(permissions=['admin:source:schedule:execute'])
         def do_exec(self, idx):
             '''execute config [idx]'''
-            selected: SourceConfig = self.get_thing_by_index(
-                self.arg_as_idx(idx))
+            selected = self.get_fresh_config(idx)
             assert selected.id
 
             print(self.scheduler_client.execute(source_config_id=selected.id))
 
+        @builder.cmd(permissions=['admin:source:schedule:execute'])
+        def do_bulkexec(self, selectors):
+            '''execute matching configs: [1-10,15] [source=NAME] [enabled=true|false] [failed] [all] [workers=4] [stagger=0]'''
+            configs = list(self.things)
+            workers, stagger, selected_any = 4, 0.0, False
+
+            for token in selectors.split():
+                key, _, value = token.partition('=')
+                if token == 'all':
+                    selected_any = True
+                elif token == 'failed':
+                    client = SourceAuditClient(
+                        api_host=self.config.credentials.api_host, auth_token=self.config.credentials.auth_token, target_org=self.config.org.id)
+                    failed = last_failed(client, configs, workers=workers)
+                    configs = [c for c in configs if c.id in failed]
+                    selected_any = True
+                elif key == 'source':
+                    configs = [c for c in configs if c.source_id == value or (
+                        c.source_id in self.sources_by_id and self.sources_by_id[c.source_id].display_name.lower() == value.lower())]
+                    selected_any = True
+                elif key == 'enabled':
+                    enabled = value.lower() in ('true', 'yes', '1')
+                    configs = [c for c in configs if c.enabled == enabled]
+                    selected_any = True
+                elif key == 'workers':
+                    workers = int(value)
+                elif key == 'stagger':
+                    stagger = float(value)
+                else:
+                    ids = {self.things[i].id for i in parse_indexes(token, len(self.things))}
+                    configs = [c for c in configs if c.id in ids]
+                    selected_any = True
+
+            if not selected_any:
+                raise Exception("Select configs by index range, source=, enabled=, failed or all")
+            if not configs:
+                print("No matching configs")
+                return
+
+            if not Builder.get_yes_no(f"Execute {len(configs)} configs with {workers} workers?", default_yes=False):
+                return
+
+            if not self.oauth_refresh:
+                fresh = self.refresher.ensure_fresh(configs)
+                self._keep_refreshed(configs, fresh)
+                configs = fresh
+
+            def report(result: BulkResult):
+                source = self.sources_by_id.get(result.config.source_id)
+                name = source.display_name if source else result.config.source_id
+                if result.ok:
+                    assert result.wrapper
+                    print(f"[ok]     {result.config.id} {name} execution {result.wrapper.execution_context.execution_id} ({result.elapsed:.2f}s)")
+                else:
+                    print(f"[failed] {result.config.id} {name}: {result.error}")
+
+            bulk = BulkExecutor(self.scheduler_client, workers=workers, stagger=stagger)
+            summary = bulk.run(configs, on_result=report)
+
+            print(f"{summary.succeeded} succeeded, {summary.failed} failed in {summary.elapsed:.1f}s ({summary.throughput:.1f} configs/s)")
+
+        @builder.cmd(permissions=['admin:source:config:read', 'source:config:read'])
+        def do_oauth_stats(self, _arg):
+            '''show OAuth token refreshes avoided and performed'''
+            stats = refresh_stats()
+            mode = "always (on every list)" if self.oauth_refresh else "lazy (before info/exec, when near expiry)"
+            print(f"Refresh mode:                {mode}")
+            print(f"Avoided while listing:       {stats.avoided}")
+            print(f"Skipped, token still valid:  {stats.still_valid}")
+            print(f"Due, token expiry unknown:   {stats.unknown_expiry}")
+            print(f"Performed:                   {stats.performed}")
+            print(f"Failed:                      {stats.failed}")
+
     return builder.build()(config, source)
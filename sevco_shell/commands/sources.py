@@ -91,6 +91,7 @@ def SourcesCmd(config: Config) -> CommandWithList:
             print("Source Configuration")
             source = SourceBuilder(config=self.config).from_user().build()
             if source:
+                self._clear_list()
                 print("Source Schema Configuration")
                 schema = SourceSchemaBuilder(config=self.config,
                                              source_id=source.id).from_user().build()
@@ -68,7 +68,8 @@ def UsersCmd(config: Config):
         @builder.cmd(permissions=['org:user:write'])
         def do_add(self, _arg):
             '''add user to org'''
-            AddUserBuilder(self.config).from_user().build()
+            if AddUserBuilder(self.config).from_user().build():
+                self._clear_list()
 
         @builder.cmd(permissions=['org:user:delete'])
         def do_del(self, idx):
@@ -76,5 +77,6 @@ def UsersCmd(config: Config):
             selected: User = self.get_thing_by_index(self.arg_as_idx(idx))
             if Builder.get_yes_no(f"Really remove user from {self.config.org.org_name}?", default_yes=False):
                 self.client.delete_user(selected.email)
+                self._discard(selected)
 
     return builder.build()(config)
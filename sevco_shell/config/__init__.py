@@ -1,2 +1,15 @@
-from .config import Config
-from .credentials import CredentialsProviderChain
\ No newline at end of file
+from typing import Any
+
+__all__ = ['Config', 'CredentialsProviderChain']
+
+
+def __getattr__(name: str) -> Any:
+    # Resolved on first use so importing sevco_shell.config.* stays cheap
+    if name == 'Config':
+        from .config import Config
+        return Config
+    if name == 'CredentialsProviderChain':
+        from .credentials import CredentialsProviderChain
+        return CredentialsProviderChain
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
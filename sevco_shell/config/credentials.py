@@ -1,13 +1,18 @@
-import argparse
 import os
+import sys
 import time
 from pathlib import Path
-from typing import List, Optional
+from typing import (TYPE_CHECKING, Any, Callable, Dict, List, Optional,
+                    Sequence, Union)
 
-import jwt
-import requests
-import toml
 from sevco_shell.builders.builder import Builder
+from sevco_shell.config.tokens import TokenManager, TokenUnavailableError
+
+# jwt, toml, argparse and requests are imported where they are used, so that
+#  starting svsh only loads what the credentials in use need
+if TYPE_CHECKING:
+    import requests
+    from sevco_shell.clients.session import SessionPool
 
 
 class CredentialsProvider:
@@ -17,6 +22,10 @@ class CredentialsProvider:
     def auth_token(self) -> Optional[str]:
         raise NotImplementedError
 
+    def reload(self) -> None:
+        '''Pick up credentials that changed since the provider was created'''
+        pass
+
 
 class EnvironmentCredentialsProvider(CredentialsProvider):
     def api_host(self) -> Optional[str]:
@@ -27,33 +36,60 @@ class EnvironmentCredentialsProvider(CredentialsProvider):
 
 
 class ArgumentCredentialsProvider(CredentialsProvider):
-    def __init__(self):
+    # argparse accepts unambiguous prefixes such as --api or --auth
+    OPTION_PREFIX = '--a'
+
+    def __init__(self, argv: Optional[List[str]] = None):
+        argv = sys.argv[1:] if argv is None else argv
+        self.api_host_arg: Optional[str] = None
+        self.auth_token_arg: Optional[str] = None
+
+        # Skip building a parser when neither option was given
+        if not any(arg.startswith(self.OPTION_PREFIX) for arg in argv):
+            return
+
+        import argparse
+
         parser = argparse.ArgumentParser()
         parser.add_argument('--api-host', help='API Host',
                             default=None, required=False)
         parser.add_argument('--auth-token', help='Bearer Token: Bearer JWT',
                             default=None, required=False)
-        self.args, _ = parser.parse_known_args()
+        args, _ = parser.parse_known_args(argv)
+        self.api_host_arg, self.auth_token_arg = args.api_host, args.auth_token
 
     def api_host(self) -> Optional[str]:
-        return self.args.api_host
+        return self.api_host_arg
 
     def auth_token(self) -> Optional[str]:
-        return self.args.auth_token
+        return self.auth_token_arg
 
 
 class FileCredentialsProvider(CredentialsProvider):
     def __init__(self):
-        cred_path = f"{Path.home()}/.sevco/credentials"
         self.profile = os.environ.get("SEVCO_PROFILE", "default")
+        self._profiles: Optional[Dict[str, Any]] = None
 
-        self.profiles = {}
-        try:
-            if os.path.exists(cred_path):
-                with open(cred_path) as f:
-                    self.profiles = toml.loads(f.read())
-        except:
-            pass
+    @property
+    def profiles(self) -> Dict[str, Any]:
+        # Read on first use, only when the providers before this one had nothing
+        if self._profiles is None:
+            cred_path = f"{Path.home()}/.sevco/credentials"
+
+            self._profiles = {}
+            try:
+                if os.path.exists(cred_path):
+                    import toml
+
+                    with open(cred_path) as f:
+                        self._profiles = toml.loads(f.read())
+            except:
+                pass
+
+        return self._profiles
+
+    def reload(self) -> None:
+        self._profiles = None
 
     def api_host(self) -> Optional[str]:
         return self.profiles.get(self.profile, {}).get("api_host")
@@ -63,6 +99,8 @@ class FileCredentialsProvider(CredentialsProvider):
 
     @staticmethod
     def persist(api_host: Optional[str] = None, auth_token: Optional[str] = None):
+        import toml
+
         cred_dir = f"{Path.home()}/.sevco"
         try:
             os.makedirs(cred_dir)
@@ -89,74 +127,116 @@ class FileCredentialsProvider(CredentialsProvider):
             f.write(toml.dumps(profiles))
 
 
+ProviderFactory = Callable[[], CredentialsProvider]
+
+
 class CredentialsProviderChain(CredentialsProvider):
-    def __init__(self, chain: List[CredentialsProvider] = None):
-        self.chain = chain or [
-            ArgumentCredentialsProvider(), EnvironmentCredentialsProvider(), FileCredentialsProvider()]
+    def __init__(self, chain: Sequence[Union[CredentialsProvider, ProviderFactory]] = None):
+        '''Providers, or factories for them, in order. Factories are only called
+        when every provider before them came up empty'''
+        self.chain: List[Union[CredentialsProvider, ProviderFactory]] = list(chain or [
+            ArgumentCredentialsProvider, EnvironmentCredentialsProvider, FileCredentialsProvider])
+
+    def providers(self):
+        for i, provider in enumerate(self.chain):
+            if not isinstance(provider, CredentialsProvider):
+                provider = self.chain[i] = provider()
+            yield provider
 
     def api_host(self) -> Optional[str]:
-        for provider in self.chain:
+        for provider in self.providers():
             api_host = provider.api_host()
             if api_host:
                 return api_host
         return None
 
     def auth_token(self) -> Optional[str]:
-        for provider in self.chain:
+        for provider in self.providers():
             auth_token = provider.auth_token()
             if auth_token:
                 return auth_token
         return None
 
+    def reload(self) -> None:
+        for provider in self.chain:
+            if isinstance(provider, CredentialsProvider):
+                provider.reload()
+
 
 class AuthToken:
     def __init__(self, token: str):
         self.token = token
         self._permissions = []
 
-    def permissions(self, api_host: str) -> List[str]:
+    def permissions(self, api_host: str, session: Optional['requests.Session'] = None) -> List[str]:
         if not self._permissions:
-            resp = requests.get(f"{api_host}/v1/admin/user/token?includePermsByRole=true",
-                                headers={"Authorization": self.token, "X-Sevco-Target-Org": "*"})
+            if session is None:
+                from sevco_shell.clients.session import default_pool
+
+                session = default_pool().session
+            resp = session.get(f"{api_host}/v1/admin/user/token?includePermsByRole=true",
+                               headers={"Authorization": self.token, "X-Sevco-Target-Org": "*"})
             resp.raise_for_status()
             for role in resp.json()["https://sevco/props/permsByRole"]:
                 self._permissions.extend(role["permissions"])
         return self._permissions
 
+    def expires(self) -> Optional[float]:
+        return None
+
     def expired(self) -> bool:
         raise NotImplementedError
 
     def validate(self) -> bool:
         raise NotImplementedError
 
+    def usable(self) -> bool:
+        '''validate() and not expired(), without printing why not'''
+        raise NotImplementedError
+
 
 class BearerToken(AuthToken):
     def __init__(self, token: str):
         super().__init__(token)
+        self._claims: Optional[Dict[str, Any]] = None
+
+    def _jwt(self) -> Dict[str, Any]:
+        # The token never changes, so decode it once. Slice out the 'Bearer ' prefix
+        if self._claims is None:
+            import jwt
 
-    def _jwt(self):
-        # Slice out the 'Bearer ' prefix
-        return jwt.decode(self.token[7:], verify=False)
+            self._claims = jwt.decode(self.token[7:], verify=False)
+        return self._claims
+
+    def expires(self) -> Optional[float]:
+        return self._jwt()['exp']
 
     def expired(self) -> bool:
         return time.time() > self._jwt()['exp'] + (5 * 60)
 
-    def validate(self) -> bool:
+    def _problem(self) -> Optional[str]:
         if not self.token.startswith('Bearer '):
-            print("Invalid format.  Expected 'Bearer abcd1234'")
-            return False
+            return "Invalid format.  Expected 'Bearer abcd1234'"
 
         try:
-            decoded = jwt.decode(self.token[7:], verify=False)
-            if time.time() > decoded['exp']:
-                print("Token is expired")
-                return False
+            if time.time() > self._jwt()['exp']:
+                return "Token is expired"
         except Exception as e:
-            print(f"Unable to decode API Token: {e}")
+            return f"Unable to decode API Token: {e}"
+
+        return None
+
+    def validate(self) -> bool:
+        problem = self._problem()
+        if problem:
+            print(problem)
             return False
 
         return True
 
+    def usable(self) -> bool:
+        return self._problem() is None
+
 
 class ApiToken(AuthToken):
     def __init__(self, token: str):
@@ -168,6 +248,9 @@ class ApiToken(AuthToken):
     def validate(self) -> bool:
         return True
 
+    def usable(self) -> bool:
+        return True
+
 
 def auth_token(token: str) -> AuthToken:
     if token.startswith("Bearer "):
@@ -179,16 +262,32 @@ def auth_token(token: str) -> AuthToken:
 
 
 class ApiCredentials:
-    def __init__(self, provider: CredentialsProvider):
+    def __init__(self, provider: CredentialsProvider, pool: Optional['SessionPool'] = None,
+                 interactive: Optional[bool] = None):
         self.provider = provider
+        self._pool = pool
+        self.interactive = sys.stdin.isatty() if interactive is None else interactive
+        self.tokens = TokenManager(self._resolve_token)
         self._api_host: Optional[str] = None
-        self._auth_token: Optional[AuthToken] = None
+
+    @property
+    def pool(self) -> 'SessionPool':
+        if self._pool is None:
+            from sevco_shell.clients.session import default_pool
+
+            self._pool = default_pool()
+
+        return self._pool
 
     @property
     def api_host(self) -> str:
         if not self._api_host:
             self._api_host = self.provider.api_host()
             if not self._api_host:
+                if not self.interactive:
+                    raise Exception(
+                        "No API host. Set SVSH_API_HOST, --api-host or update ~/.sevco/credentials")
+
                 self._api_host = Builder.get_input(
                     "Please provide the Sevco API host")
                 while not self._api_host:
@@ -204,39 +303,39 @@ class ApiCredentials:
     def auth_token(self) -> str:
         return self._get_auth_token().token
 
-    def _get_auth_token(self) -> AuthToken:
-        # If we don't have a token yet try to get one from the credentials provider
-        if not self._auth_token:
-            token = self.provider.auth_token()
-            if token:
-                self._auth_token = auth_token(token)
+    def _resolve_token(self) -> Optional[AuthToken]:
+        self.provider.reload()
+        token = self.provider.auth_token()
 
-        # If we still don't have a token yet ask the user to provide one
-        if not self._auth_token:
-            self._auth_token = self.auth_token_from_user()
+        return auth_token(token) if token else None
 
-            if Builder.get_yes_no("Save API Token to ~/.sevco/credentials?", default_yes=True):
-                self.persist(auth_token=self._auth_token.token)
+    def _get_auth_token(self) -> AuthToken:
+        # Cached, and replaced in the background when the providers get a newer token
+        token = self.tokens.current()
+        if token:
+            return token
 
-        # Make sure any existing tokens are still valid
-        if not self._auth_token.validate():
-            self._auth_token = self.auth_token_from_user()
+        if not self.interactive:
+            raise TokenUnavailableError(
+                "No valid API token. Set SVSH_AUTH_TOKEN or update ~/.sevco/credentials")
 
-            if Builder.get_yes_no("Save API Token to ~/.sevco/credentials?", default_yes=True):
-                self.persist(auth_token=self._auth_token.token)
+        # Say why the token from the providers can't be used, then ask the user for one
+        provided = self.provider.auth_token()
+        if provided:
+            auth_token(provided).validate()
 
-        # Make sure the token we are using has not expired
-        if self._auth_token.expired():
-            print("API Token has expired")
-            self._auth_token = self.auth_token_from_user()
+        token = self.auth_token_from_user()
+        self.tokens.set(token)
 
-            if Builder.get_yes_no("Save API Token to ~/.sevco/credentials?", default_yes=True):
-                self.persist(auth_token=self._auth_token.token)
+        if Builder.get_yes_no("Save API Token to ~/.sevco/credentials?", default_yes=True):
+            self.persist(auth_token=token.token)
 
-        return self._auth_token
+        return token
 
     def permissions(self) -> List[str]:
-        return self._get_auth_token().permissions(self.api_host)
+        self._get_auth_token()
+
+        return self.tokens.permissions(self.api_host, session=self.pool.session)
 
     def auth_token_from_user(self) -> AuthToken:
         import readline  # fix for truncated input on osx
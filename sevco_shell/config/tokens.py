@@ -0,0 +1,211 @@
+'''Cached auth token and permission management.
+
+TokenManager resolves the token from the credentials providers once and keeps
+it, so reading ApiCredentials.auth_token no longer re-validates and re-decodes
+the JWT on every access. Permissions are persisted per token hash with a TTL
+in ~/.sevco/permissions.json, so a new process does not need to ask the API
+for them again.
+
+Shortly before a JWT's exp a background timer re-reads the credentials
+providers (environment, ~/.sevco/credentials) and swaps in a newer token if
+one has been put there. Clients created with the old token pick up the new one
+through the client module's token replacement table, so long scripted runs
+keep going without an interactive prompt.
+'''
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import requests
+    from sevco_shell.config.credentials import AuthToken
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_PERMISSIONS_TTL = 60 * 60
+DEFAULT_REFRESH_MARGIN = 5 * 60
+RETRY_INTERVAL = 60
+
+
+class TokenUnavailableError(Exception):
+    pass
+
+
+def token_hash(api_host: str, token: str) -> str:
+    return hashlib.sha256(f"{api_host} {token}".encode('utf-8')).hexdigest()
+
+
+class PermissionCache:
+    def __init__(self, path: str, ttl: float = DEFAULT_PERMISSIONS_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'PermissionCache':
+        ttl = float(os.environ.get("SVSH_PERMISSIONS_TTL", DEFAULT_PERMISSIONS_TTL))
+        return cls(f"{Path.home()}/.sevco/permissions.json", ttl=ttl)
+
+    def get(self, key: str) -> Optional[List[str]]:
+        entry = self._load().get(key)
+        if entry is None or time.time() > entry['expires']:
+            return None
+
+        return entry['permissions']
+
+    def put(self, key: str, permissions: List[str], token_expires: Optional[float] = None) -> None:
+        expires = time.time() + self.ttl
+        if token_expires is not None:
+            expires = min(expires, token_expires)
+
+        with self._lock:
+            now = time.time()
+            entries = {k: v for k, v in self._load().items() if v['expires'] > now}
+            entries[key] = {'expires': expires, 'permissions': permissions}
+            self._write(entries)
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'rb') as f:
+                entries = json.loads(f.read())
+        except (OSError, ValueError):
+            return {}
+
+        return entries if isinstance(entries, dict) else {}
+
+    def _write(self, entries: Dict[str, Dict]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # mkstemp creates the file 0600, the permission sets are not for other users
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entries, f)
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+
+class TokenManager:
+    def __init__(self, resolve: Callable[[], Optional['AuthToken']],
+                 margin: float = DEFAULT_REFRESH_MARGIN,
+                 permission_cache: Optional[PermissionCache] = None):
+        '''resolve re-reads the credentials providers and returns their token, if any'''
+        self.resolve = resolve
+        self.margin = margin
+        self.permission_cache = permission_cache or PermissionCache.from_env()
+
+        self._token: Optional['AuthToken'] = None
+        self._resolved = False
+        self._permissions: Dict[str, List[str]] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+
+    def current(self) -> Optional['AuthToken']:
+        '''The cached token, or None when there is no usable token'''
+        with self._lock:
+            if not self._resolved:
+                self._resolved = True
+                self._swap(self.resolve(), require_usable=False)
+
+            if self._token is not None and not self._token.usable():
+                # The providers may already have a newer token
+                self._swap(self.resolve())
+
+            if self._token is not None and self._token.usable():
+                return self._token
+
+            return None
+
+    def set(self, token: 'AuthToken') -> None:
+        with self._lock:
+            self._resolved = True
+            self._swap(token, require_usable=False)
+
+    def permissions(self, api_host: str, session: Optional['requests.Session'] = None) -> List[str]:
+        token = self.current()
+        if token is None:
+            raise TokenUnavailableError("No valid API token")
+
+        key = token_hash(api_host, token.token)
+        permissions = self._permissions.get(key)
+        if permissions is None:
+            permissions = self.permission_cache.get(key)
+            if permissions is None:
+                permissions = token.permissions(api_host, session=session)
+                self.permission_cache.put(key, permissions, token_expires=token.expires())
+            self._permissions[key] = permissions
+
+        return permissions
+
+    def close(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _swap(self, token: Optional['AuthToken'], require_usable: bool = True) -> None:
+        if token is None:
+            return
+
+        previous = self._token
+        if previous is not None and previous.token == token.token:
+            return
+
+        if require_usable and not token.usable():
+            return
+
+        self._token = token
+        if previous is not None:
+            from sevco_shell.clients.client import replace_token
+
+            replace_token(previous.token, token.token)
+            LOG.debug("auth token replaced")
+
+        self._schedule()
+
+    def _schedule(self, delay: Optional[float] = None) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        expires = self._expires()
+        if delay is None:
+            if expires is None:
+                return
+            delay = max(expires - self.margin - time.time(), 0)
+
+        self._timer = threading.Timer(delay, self._refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _expires(self) -> Optional[float]:
+        try:
+            return self._token.expires() if self._token is not None else None
+        except Exception:
+            return None
+
+    def _refresh(self) -> None:
+        with self._lock:
+            current = self._token
+            try:
+                self._swap(self.resolve())
+            except Exception as e:
+                LOG.debug("token refresh failed: %s", e)
+
+            if self._token is current and current is not None:
+                expires = self._expires()
+                if expires is not None and time.time() < expires:
+                    # Nothing newer yet, look again until the token runs out
+                    self._schedule(delay=min(RETRY_INTERVAL, expires - time.time()))
+                else:
+                    LOG.warning("API token expired and no replacement was found")
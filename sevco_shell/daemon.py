@@ -0,0 +1,314 @@
+'''Long lived svsh daemon and its thin client.
+
+    svsh --daemon
+    svsh --connect [--org ORG] -c "configs list"
+
+The daemon keeps ApiCredentials, the HTTP connection pool, the top level and
+per org scopes with their commands and lists, and the decoded caches warm
+between invocations. It listens on a Unix socket, ~/.sevco/svsh-<profile>.sock
+by default, created 0600 so only its owner can connect, and exits after
+SVSH_DAEMON_IDLE seconds without a connection.
+
+Each connection sends one JSON line:
+
+    {"commands": [...], "org": "...", "answers": [...], "yes": false}
+
+and receives its output as {"out": text} and {"err": text} lines followed by
+{"exit": status}. Connections are handled one at a time, in a fresh scope
+stack starting at the top level scope, or at org's scope when it is given.
+Only the standard library is imported by the client side.
+'''
+import json
+import logging
+import os
+import socket
+import sys
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    from sevco_shell.config.credentials import ApiCredentials
+    from sevco_shell.scopes.org import OrgScope
+
+LOG = logging.getLogger(__name__)
+
+PROTOCOL_VERSION = 1
+DEFAULT_IDLE_TIMEOUT = 15 * 60
+MAX_REQUEST_BYTES = 1024 * 1024
+
+
+def socket_path() -> str:
+    path = os.environ.get("SVSH_SOCKET")
+    if path:
+        return path
+
+    profile = os.environ.get("SEVCO_PROFILE", "default")
+    return f"{Path.home()}/.sevco/svsh-{profile}.sock"
+
+
+def idle_timeout() -> Optional[float]:
+    timeout = float(os.environ.get("SVSH_DAEMON_IDLE", DEFAULT_IDLE_TIMEOUT))
+    return timeout if timeout > 0 else None
+
+
+class _Writer:
+    '''Sends a connection's output as JSON lines, joining consecutive writes to the same stream'''
+
+    def __init__(self, wfile: BinaryIO):
+        self.wfile = wfile
+        self._key: Optional[str] = None
+        self._parts: List[str] = []
+
+    def write(self, key: str, text: str) -> None:
+        if key != self._key:
+            self._send_pending()
+            self._key = key
+        self._parts.append(text)
+
+    def flush(self) -> None:
+        self._send_pending()
+        self.wfile.flush()
+
+    def send(self, message: Dict[str, Any]) -> None:
+        self._send_pending()
+        self.wfile.write(json.dumps(message).encode('utf-8') + b'\n')
+        self.wfile.flush()
+
+    def _send_pending(self) -> None:
+        if self._parts:
+            text, self._parts = ''.join(self._parts), []
+            self.wfile.write(json.dumps({self._key: text}).encode('utf-8') + b'\n')
+
+
+_local = threading.local()
+
+
+class _Output:
+    '''Stand-in for sys.stdout / sys.stderr that writes to the connection of the current thread.
+
+    Threads without a connection, such as background list refreshes that
+    outlive their command, write to the daemon's own stream.
+    '''
+
+    def __init__(self, stream, key: str):
+        self.stream = stream
+        self.key = key
+
+    def write(self, text: str) -> int:
+        writer = getattr(_local, 'writer', None)
+        if writer is None:
+            return self.stream.write(text)
+
+        writer.write(self.key, text)
+        return len(text)
+
+    def flush(self) -> None:
+        writer = getattr(_local, 'writer', None)
+        if writer is None:
+            self.stream.flush()
+        else:
+            writer.flush()
+
+    def isatty(self) -> bool:
+        return getattr(_local, 'writer', None) is None and self.stream.isatty()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class Daemon:
+    def __init__(self, credentials: 'ApiCredentials', path: str, idle: Optional[float] = None):
+        from sevco_shell.scopes.sv import SvScope
+
+        self.credentials = credentials
+        self.path = path
+        self.idle = idle
+        self.sv = SvScope(credentials)
+        self.org_scopes: Dict[str, 'OrgScope'] = {}
+        self.stopping = False
+
+    def serve(self) -> int:
+        import socketserver
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                daemon.handle(self.rfile, self.wfile)
+
+        class Server(socketserver.UnixStreamServer):
+            def handle_timeout(self):
+                LOG.info("no connection for %ss, exiting", daemon.idle)
+                daemon.stopping = True
+
+        claim_socket(self.path)
+        previous_umask = os.umask(0o177)
+        try:
+            server = Server(self.path, Handler)
+        finally:
+            os.umask(previous_umask)
+        os.chmod(self.path, 0o600)
+        server.timeout = self.idle
+
+        LOG.info("svsh daemon listening on %s", self.path)
+        try:
+            # One connection at a time, the scopes and Builder.answers are process wide
+            while not self.stopping:
+                server.handle_request()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+            self.credentials.tokens.close()
+
+        return 0
+
+    def handle(self, rfile: BinaryIO, wfile: BinaryIO) -> None:
+        try:
+            self._handle(rfile, wfile)
+        except OSError as e:
+            # The client went away, its run has already been stopped by the failed write
+            LOG.debug("connection lost: %s", e)
+
+    def _handle(self, rfile: BinaryIO, wfile: BinaryIO) -> None:
+        line = rfile.readline(MAX_REQUEST_BYTES)
+        if not line:
+            # A connection check, see claim_socket
+            return
+
+        writer = _Writer(wfile)
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict) or request.get('version', PROTOCOL_VERSION) != PROTOCOL_VERSION:
+                raise ValueError("unsupported request")
+        except ValueError as e:
+            writer.send({'err': f"Error: bad request: {e}\n"})
+            writer.send({'exit': 2})
+            return
+
+        if request.get('op') == 'stop':
+            self.stopping = True
+            writer.send({'exit': 0})
+            return
+
+        _local.writer = writer
+        try:
+            status = self.run(request)
+        except Exception as e:
+            print(f"Error: {str(e)}", file=sys.stderr)
+            status = 1
+        finally:
+            _local.writer = None
+
+        writer.send({'exit': status})
+
+    def run(self, request: Dict[str, Any]) -> int:
+        from sevco_shell import batch
+        from sevco_shell.builders.builder import Answers, Builder
+
+        stack = [self.sv]
+        if request.get('org'):
+            stack.append(self.org_scope(request['org']))
+
+        for scope in stack:
+            # An index must follow a list command from the same connection
+            scope.last_listed = None
+
+        Builder.answers = Answers(request.get('answers', []), yes=bool(request.get('yes')))
+        try:
+            return batch.run_in_stack(request.get('commands', []), stack)
+        finally:
+            Builder.answers = None
+
+    def org_scope(self, org: str) -> 'OrgScope':
+        from sevco_shell import batch
+        from sevco_shell.config import Config
+        from sevco_shell.scopes.org import OrgScope
+
+        selected = batch.find_org(self.sv, org)
+        if selected.id not in self.org_scopes:
+            scope = OrgScope(Config(credentials=self.credentials, org=selected))
+            scope.on_enter()
+            self.org_scopes[selected.id] = scope
+
+        return self.org_scopes[selected.id]
+
+
+def claim_socket(path: str) -> None:
+    '''Remove a socket left behind by a daemon that is no longer running'''
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except FileNotFoundError:
+        return
+    except ConnectionRefusedError:
+        os.unlink(path)
+        return
+    finally:
+        sock.close()
+
+    raise Exception(f"An svsh daemon is already listening on {path}")
+
+
+def serve(credentials: 'ApiCredentials', path: Optional[str] = None) -> int:
+    if not hasattr(socket, 'AF_UNIX'):
+        print("Error: the svsh daemon needs Unix domain sockets", file=sys.stderr)
+        return 1
+
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    # Before any scope is built, cmd.Cmd keeps the sys.stdout it was created with
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.stdout, sys.stderr = _Output(stdout, 'out'), _Output(stderr, 'err')
+    try:
+        return Daemon(credentials, path or socket_path(), idle=idle_timeout()).serve()
+    except Exception as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+    finally:
+        sys.stdout, sys.stderr = stdout, stderr
+
+
+def _request(message: Dict[str, Any], path: Optional[str] = None) -> int:
+    path = path or socket_path()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        sock.close()
+        print(f"Error: no svsh daemon on {path}, start one with svsh --daemon", file=sys.stderr)
+        return 1
+
+    message['version'] = PROTOCOL_VERSION
+    with sock, sock.makefile('rb') as responses:
+        sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+        for line in responses:
+            response = json.loads(line)
+            if 'out' in response:
+                sys.stdout.write(response['out'])
+            elif 'err' in response:
+                sys.stdout.flush()
+                sys.stderr.write(response['err'])
+            elif 'exit' in response:
+                sys.stdout.flush()
+                return int(response['exit'])
+
+    print("Error: the svsh daemon closed the connection", file=sys.stderr)
+    return 1
+
+
+def connect(commands: Iterable[str], org: Optional[str] = None, answers: Iterable[str] = (),
+            yes: bool = False, path: Optional[str] = None) -> int:
+    '''Run commands in the daemon, returns the exit status of the run'''
+    return _request({'commands': list(commands), 'org': org, 'answers': list(answers), 'yes': yes}, path)
+
+
+def stop(path: Optional[str] = None) -> int:
+    return _request({'op': 'stop'}, path)
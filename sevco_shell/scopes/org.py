@@ -1,16 +1,53 @@
-from sevco_shell.commands.source_configs import SourceConfigsCmd
-from sevco_shell.commands.runners import RunnersCmd
+import logging
+import os
+from typing import Optional
+
 from sevco_shell.config import Config
-from sevco_shell.commands.sources import SourcesCmd
-from sevco_shell.commands.users import UsersCmd
-from sevco_shell.scopes.scope import Scope
+from sevco_shell.scopes.scope import Scope, command_factory
+
+LOG = logging.getLogger(__name__)
+
+PREFETCH_CMDS = ['sources', 'configs', 'runners']
+
+
+def prefetch_enabled() -> bool:
+    return os.environ.get("SVSH_PREFETCH", "").lower() in ("1", "true", "yes", "on")
 
 
 class OrgScope(Scope):
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, prefetch: Optional[bool] = None):
         self.config = config
+        self.prefetch = prefetch_enabled() if prefetch is None else prefetch
         super().__init__(config.org.org_name)
-        self.register_cmd('sources', SourcesCmd(config))
-        self.register_cmd('runners', RunnersCmd(config))
-        self.register_cmd('configs', SourceConfigsCmd(config))
-        self.register_cmd('users', UsersCmd(config))
+        self.register_lazy_cmd('sources', lambda: command_factory(
+            'sevco_shell.commands.sources', 'SourcesCmd')(config))
+        self.register_lazy_cmd('runners', lambda: command_factory(
+            'sevco_shell.commands.runners', 'RunnersCmd')(config))
+        self.register_lazy_cmd('configs', lambda: command_factory(
+            'sevco_shell.commands.source_configs', 'SourceConfigsCmd')(config))
+        self.register_lazy_cmd('users', lambda: command_factory(
+            'sevco_shell.commands.users', 'UsersCmd')(config))
+
+    def on_enter(self):
+        if not self.prefetch:
+            return
+
+        from sevco_shell.clients.async_client import request_executor
+
+        executor = request_executor()
+        for cmd_name in PREFETCH_CMDS:
+            executor.submit(self._prefetch_cmd, cmd_name)
+
+    def _prefetch_cmd(self, cmd_name: str):
+        try:
+            command = self.get_cmd(cmd_name)
+        except Exception as e:
+            # The factory is kept, so building again on first use reports the error
+            LOG.debug("prefetch of %s failed: %s", cmd_name, e)
+            return
+
+        prefetch = getattr(command, 'prefetch', None)
+        if prefetch is not None:
+            from sevco_shell.clients.async_client import request_executor
+
+            prefetch(request_executor())
@@ -1,12 +1,24 @@
 import cmd
+import importlib
+import logging
+import os
+import threading
+import time
 from types import BuiltinMethodType
-from typing import Dict, List, Union
+from typing import Callable, Dict, List, Optional, Union
 
 import colorama
 
 from sevco_shell.commands.command import Command
 from sevco_shell.builders.builder import Builder
 
+LOG = logging.getLogger(__name__)
+
+
+def command_factory(module: str, name: str) -> Callable[..., Command]:
+    '''Import a command factory when its command is first used, not at startup'''
+    return getattr(importlib.import_module(module), name)
+
 
 class PromptBuilder:
     def __init__(self, tokens: List[str], sep: str):
@@ -44,6 +56,13 @@ class NewScopeResponse(CmdResponse):
 
     def process(self) -> bool:
         Scope.cmd_stack.append(self.scope)
+        self.scope.on_enter()
+
+        elapsed = time.perf_counter() - self.scope.created
+        LOG.debug("entered %s in %.3fs", self.scope.prompt_token, elapsed)
+        if os.environ.get("SVSH_TIMING"):
+            print(f"({self.scope.prompt_token} ready in {elapsed:.3f}s)")
+
         return True
 
 
@@ -60,25 +79,58 @@ class Scope(cmd.Cmd):
     def __init__(self, prompt_token: str):
         super().__init__()
 
+        self.created = time.perf_counter()
         self.prompt_token = prompt_token
         self.commands: Dict[str, Command] = {}
+        self.factories: Dict[str, Callable[[], Command]] = {}
+        self.last_listed: Optional[str] = None
+        self._build_lock = threading.Lock()
 
     def register_cmd(self, cmd_name: str, command: Command):
+        self.commands[cmd_name] = command
+        self._bind_cmd(cmd_name)
+
+    def register_lazy_cmd(self, cmd_name: str, factory: Callable[[], Command]):
+        '''Register a command that is only built the first time it is run, helped or completed'''
+        self.factories[cmd_name] = factory
+        self._bind_cmd(cmd_name)
+
+    def get_cmd(self, cmd_name: str) -> Command:
+        command = self.commands.get(cmd_name)
+        if command is not None:
+            return command
+
+        with self._build_lock:
+            if cmd_name not in self.commands:
+                start = time.perf_counter()
+                # Keep the factory until it succeeds so a failed build can be retried
+                self.commands[cmd_name] = self.factories[cmd_name]()
+                del self.factories[cmd_name]
+                LOG.debug("built %s command in %.3fs", cmd_name, time.perf_counter() - start)
+
+            return self.commands[cmd_name]
+
+    def on_enter(self):
+        '''Called once the scope has been pushed onto the stack'''
+        pass
+
+    def _bind_cmd(self, cmd_name: str):
         def _do_cmd(arg):
-            return command.onecmd(arg)
+            if arg.strip() in ('', 'list'):
+                # A bare index after this selects from this command's list
+                self.last_listed = cmd_name
+            return self.get_cmd(cmd_name).onecmd(arg)
 
         def _help_cmd():
-            return command.onecmd('help')
+            return self.get_cmd(cmd_name).onecmd('help')
 
         def _complete_cmd(text, *ignored):
-            return command.completenames(text)
+            return self.get_cmd(cmd_name).completenames(text)
 
         setattr(self, f'do_{cmd_name}', _do_cmd)
         setattr(self, f'help_{cmd_name}', _help_cmd)
         setattr(self, f'complete_{cmd_name}', _complete_cmd)
 
-        self.commands[cmd_name] = command
-
     @property
     def prompt(self):
         return PromptBuilder.from_cmd_stack(self.cmd_stack).build()
@@ -89,12 +141,16 @@ class Scope(cmd.Cmd):
 
     def do_quit(self, arg):
         '''Exit the shell'''
-        if Builder.get_yes_no("Are you sure you want to exit?", default_yes=True):
-            print("Goodbye")
-            return ExitResponse()
+        return self._exit()
 
     def do_exit(self, arg):
         '''Exit the shell'''
+        return self._exit()
+
+    def _exit(self):
+        if not Builder.interactive():
+            return ExitResponse()
+
         if Builder.get_yes_no("Are you sure you want to exit?", default_yes=True):
             print("Goodbye")
             return ExitResponse()
@@ -102,11 +158,14 @@ class Scope(cmd.Cmd):
     def default(self, line):
         if line == 'EOF':
             if len(self.cmd_stack) == 1:
-                if Builder.get_yes_no("Are you sure you want to exit?", default_yes=True):
-                    print("Goodbye")
-                    return ExitResponse()
+                resp = self._exit()
+                if resp is not None:
+                    return resp
             print()
             return PopScopeResponse()
+        if line.strip().isdigit() and self.last_listed is not None:
+            # "orgs" then "3" selects the third org, as typing "3" at the orgs list does
+            return self.get_cmd(self.last_listed).onecmd(line.strip())
         super().default(line)
 
     def emptyline(self):
@@ -121,4 +180,5 @@ class Scope(cmd.Cmd):
         return resp
 
     def get_names(self):
-        return [f'do_{c}' for c in self.commands] + [f'help_{c}' for c in self.commands] + ['do_help', 'do_back', 'do_quit', 'do_exit']
+        names = list(self.commands) + list(self.factories)
+        return [f'do_{c}' for c in names] + [f'help_{c}' for c in names] + ['do_help', 'do_back', 'do_quit', 'do_exit']
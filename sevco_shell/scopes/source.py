@@ -1,10 +1,6 @@
 from sevco_shell.clients.source_catalog.models import Source
-from sevco_shell.commands.plugins import PluginsCmd
-from sevco_shell.commands.schedule import ScheduleCmd
-from sevco_shell.commands.schemas import SchemasCmd
-from sevco_shell.commands.source_configs import SourceConfigsCmd
 from sevco_shell.config import Config
-from sevco_shell.scopes.scope import Scope
+from sevco_shell.scopes.scope import Scope, command_factory
 
 
 class SourceScope(Scope):
@@ -14,7 +10,11 @@ class SourceScope(Scope):
 
         self.configs = []
         self.source = source
-        self.register_cmd('plugins', PluginsCmd(self.config, self.source.id))
-        self.register_cmd('configs', SourceConfigsCmd(self.config, self.source))
-        self.register_cmd('schemas', SchemasCmd(self.config, self.source))
-        self.register_cmd('schedule', ScheduleCmd(self.config, self.source))
+        self.register_lazy_cmd('plugins', lambda: command_factory(
+            'sevco_shell.commands.plugins', 'PluginsCmd')(self.config, self.source.id))
+        self.register_lazy_cmd('configs', lambda: command_factory(
+            'sevco_shell.commands.source_configs', 'SourceConfigsCmd')(self.config, self.source))
+        self.register_lazy_cmd('schemas', lambda: command_factory(
+            'sevco_shell.commands.schemas', 'SchemasCmd')(self.config, self.source))
+        self.register_lazy_cmd('schedule', lambda: command_factory(
+            'sevco_shell.commands.schedule', 'ScheduleCmd')(self.config, self.source))
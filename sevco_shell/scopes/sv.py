@@ -1,11 +1,19 @@
-from sevco_shell.config.credentials import ApiCredentials
-from sevco_shell.commands.orgs import OrgsCmd
-from sevco_shell.scopes.scope import Scope
+from typing import TYPE_CHECKING
+
+from sevco_shell.scopes.scope import Scope, command_factory
+
+if TYPE_CHECKING:
+    from sevco_shell.config.credentials import ApiCredentials
 
 
 class SvScope(Scope):
-    def __init__(self, credentials: ApiCredentials):
+    def __init__(self, credentials: 'ApiCredentials'):
         super().__init__('svsh')
         self.credentials = credentials
 
-        self.register_cmd('orgs', OrgsCmd(credentials=credentials))
+        self.register_lazy_cmd('orgs', lambda: command_factory(
+            'sevco_shell.commands.orgs', 'OrgsCmd')(credentials=credentials))
+        self.register_lazy_cmd('fanout', lambda: command_factory(
+            'sevco_shell.commands.fanout', 'FanoutCmd')(credentials=credentials))
+        self.register_lazy_cmd('cache', lambda: command_factory(
+            'sevco_shell.commands.cache', 'CacheCmd')())
@@ -1,7 +1,6 @@
 from sevco_shell.clients.tenant.models import User
 from sevco_shell.config import Config
-from sevco_shell.commands.roles import RolesCmd
-from sevco_shell.scopes.scope import Scope
+from sevco_shell.scopes.scope import Scope, command_factory
 
 
 class UserScope(Scope):
@@ -10,4 +9,5 @@ class UserScope(Scope):
         self.user = user
         super().__init__(self.user.name)
 
-        self.register_cmd('roles', RolesCmd(config, user))
+        self.register_lazy_cmd('roles', lambda: command_factory(
+            'sevco_shell.commands.roles', 'RolesCmd')(config, user))
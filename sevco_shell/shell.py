@@ -1,13 +1,14 @@
 import cmd
+import os
+import sys
+from typing import TYPE_CHECKING, List
 from . import __version__ as version
 
 import colorama
-import requests
 
-from sevco_shell.config import CredentialsProviderChain
-from sevco_shell.config.credentials import ApiCredentials
-from sevco_shell.scopes.scope import Scope
-from sevco_shell.scopes.sv import SvScope
+# Everything else is imported as it is needed, see benchmarks/import_time.py
+if TYPE_CHECKING:
+    from sevco_shell.config.credentials import ApiCredentials
 
 
 deep_v_banner = """
@@ -33,7 +34,7 @@ Type 'help' for available commands.
 class Shell(cmd.Cmd):
     banner = f"{colorama.Fore.RED}{deep_v_banner}{colorama.Style.RESET_ALL}"
 
-    def __init__(self, credentials: ApiCredentials):
+    def __init__(self, credentials: 'ApiCredentials'):
         super().__init__()
         self.credentials = credentials
         self.intro = gen_welcome_text(version, credentials.api_host)
@@ -49,6 +50,11 @@ class Shell(cmd.Cmd):
         print(self.intro)
 
     def cmdloop(self, intro=None):
+        import requests
+
+        from sevco_shell.scopes.scope import Scope
+        from sevco_shell.scopes.sv import SvScope
+
         self.print_banner()
 
         Scope.cmd_stack.append(SvScope(self.credentials))
@@ -66,8 +72,75 @@ class Shell(cmd.Cmd):
                 print(f"Error: {str(e)}")
 
 
+def parse_batch_args(argv: List[str]):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='svsh')
+    parser.add_argument('-c', dest='commands', default=None,
+                        help='run commands separated by ";" and exit')
+    parser.add_argument('-f', dest='script', default=None,
+                        help='run the commands in a script file ("-" for stdin) and exit')
+    parser.add_argument('--answer', action='append', default=[],
+                        help='answer to the next prompt, may be repeated')
+    parser.add_argument('--answers-file', default=None,
+                        help='answers to prompts, one per line')
+    parser.add_argument('--yes', action='store_true',
+                        help='answer yes to every yes/no prompt')
+    parser.add_argument('--org', default=None,
+                        help='run the commands in the scope of this org id or name')
+    parser.add_argument('--daemon', action='store_true',
+                        help='keep credentials, connections and caches warm for --connect')
+    parser.add_argument('--connect', action='store_true',
+                        help='run the commands in the running svsh daemon')
+    parser.add_argument('--stop-daemon', action='store_true',
+                        help='stop the running svsh daemon')
+    # --api-host and --auth-token are read by ArgumentCredentialsProvider
+    args, _ = parser.parse_known_args(argv)
+
+    return args
+
+
 def main():
+    argv = sys.argv[1:]
+    args = parse_batch_args(argv) if argv else None
+    batch = args is not None and (args.commands is not None or args.script is not None)
+
+    if args is not None and (args.connect or args.stop_daemon):
+        # The thin client, credentials and caches live in the daemon
+        from sevco_shell import batch as batch_mode
+        from sevco_shell import daemon
+
+        if args.stop_daemon:
+            sys.exit(daemon.stop())
+
+        sys.exit(daemon.connect(batch_mode.commands_from_args(args), org=args.org,
+                                answers=batch_mode.answers_from_args(args), yes=args.yes))
+
+    from sevco_shell.config.credentials import (ApiCredentials,
+                                                CredentialsProviderChain)
+
+    if os.environ.get("SVSH_CACHE", "1").lower() not in ("0", "false", "no", "off"):
+        from sevco_shell.clients.cache import ResponseCache, set_response_cache
+        from sevco_shell.clients.schema.cache import SchemaCache, set_schema_cache
+
+        set_response_cache(ResponseCache.from_env())
+        set_schema_cache(SchemaCache.from_env())
+
     cred_provider = CredentialsProviderChain()
+
+    if args is not None and args.daemon:
+        from sevco_shell import daemon
+
+        sys.exit(daemon.serve(ApiCredentials(cred_provider, interactive=False)))
+
+    if batch:
+        from sevco_shell import batch as batch_mode
+        from sevco_shell.builders.builder import Answers
+
+        answers = Answers(batch_mode.answers_from_args(args), yes=args.yes)
+        credentials = ApiCredentials(cred_provider, interactive=False)
+        sys.exit(batch_mode.main(batch_mode.commands_from_args(args), credentials, answers, org=args.org))
+
     credentials = ApiCredentials(cred_provider)
 
     shell = Shell(credentials)